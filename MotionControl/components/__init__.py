@@ -1,4 +1,6 @@
 from .router import Router
+from .task_executor import TaskExecutor, TaskHandle
+from .blit_manager import BlitManager
 from .home_page import HomePage
 from .kalman.kalman_page import KalmanPage
 from .kalman.main_view import MainView
@@ -12,6 +14,9 @@ from .step_response_tuning.step_response_tuning_page import StepTuningPage
 
 __all__ = [
     "Router",
+    "TaskExecutor",
+    "TaskHandle",
+    "BlitManager",
     "HomePage",
     "KalmanPage",
     "MainView",
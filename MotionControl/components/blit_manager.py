@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from matplotlib.artist import Artist
+from matplotlib.lines import Line2D
+from matplotlib.patches import Rectangle
+
+
+class BlitManager:
+    """
+    Redraws a few fast-changing artists (span patches, point markers) on top
+    of a cached background instead of re-rendering the whole figure.
+
+    Registered artists are marked animated, so a normal canvas draw skips
+    them; every full draw re-captures the background and paints them on top.
+    update() restores that background and re-blits only the animated artists.
+    """
+
+    def __init__(self, canvas, artists: Iterable[Artist] = ()):
+        self.canvas = canvas
+        self._background = None
+        self._artists: list[Artist] = []
+        for artist in artists:
+            self.add_artist(artist)
+        self._cid = canvas.mpl_connect("draw_event", self._on_draw)
+
+    def add_artist(self, artist: Artist) -> None:
+        artist.set_animated(True)
+        self._artists.append(artist)
+
+    def _on_draw(self, _event) -> None:
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self) -> None:
+        figure = self.canvas.figure
+        for artist in self._artists:
+            if artist.get_visible():
+                figure.draw_artist(artist)
+
+    def update(self) -> None:
+        if self._background is None:
+            # nothing rendered yet: the next full draw paints everything
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+
+def vspan_artist(ax, **kwargs) -> Rectangle:
+    """
+    Hidden axvspan-style patch (data x, axes-fraction y) that can be moved in
+    place with move_vspan. Added with add_artist, so it never changes the
+    data limits on its own.
+    """
+    rect = Rectangle((0.0, 0.0), 0.0, 1.0, transform=ax.get_xaxis_transform(), visible=False, **kwargs)
+    ax.add_artist(rect)
+    return rect
+
+
+def move_vspan(rect: Rectangle, x0: Optional[float], x1: Optional[float]) -> None:
+    if x0 is None or x1 is None:
+        rect.set_visible(False)
+        return
+    rect.set_x(x0)
+    rect.set_width(x1 - x0)
+    rect.set_visible(True)
+
+
+def vline_artist(ax, **kwargs) -> Line2D:
+    """Hidden axvline-style marker that can be moved in place with move_vline."""
+    line = Line2D([0.0, 0.0], [0.0, 1.0], transform=ax.get_xaxis_transform(), visible=False, **kwargs)
+    ax.add_artist(line)
+    return line
+
+
+def move_vline(line: Line2D, x: Optional[float]) -> None:
+    if x is None:
+        line.set_visible(False)
+        return
+    line.set_xdata([x, x])
+    line.set_visible(True)
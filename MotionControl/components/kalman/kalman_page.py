@@ -4,6 +4,7 @@ from tkinter import ttk
 from typing import Callable
 
 from .main_view import MainView
+from ..task_executor import TaskExecutor
 
 
 class KalmanPage(ttk.Frame):
@@ -14,9 +15,11 @@ class KalmanPage(ttk.Frame):
         on_back: Callable[[], None],
         on_load_csv: Callable[[], None],
         on_export_json: Callable[[], None],
+        on_autotune: Callable[[], None],
         on_time_unit_changed: Callable[[], None],
         on_span_selected: Callable[[str, int, int], None],
         on_tuning_changed: Callable[[], None],
+        executor: TaskExecutor,
     ):
         super().__init__(parent, padding=0)
 
@@ -31,8 +34,10 @@ class KalmanPage(ttk.Frame):
             self,
             on_load_csv=on_load_csv,
             on_export_json=on_export_json,
+            on_autotune=on_autotune,
             on_time_unit_changed=on_time_unit_changed,
             on_span_selected=on_span_selected,
             on_tuning_changed=on_tuning_changed,
+            executor=executor,
         )
         self.view.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
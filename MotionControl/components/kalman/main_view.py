@@ -9,6 +9,7 @@ from .toolbar_panel import ToolbarPanel
 from .plot_panel import PlotPanel
 from .results_panel import ResultsPanel
 from .tuning_controls_panel import TuningControlsPanel
+from ..task_executor import TaskExecutor
 
 
 class MainView(ttk.Frame):
@@ -18,23 +19,32 @@ class MainView(ttk.Frame):
         *,
         on_load_csv: Callable[[], None],
         on_export_json: Callable[[], None],
+        on_autotune: Callable[[], None],
         on_time_unit_changed: Callable[[], None],
         on_span_selected: Callable[[str, int, int], None],
         on_tuning_changed: Callable[[], None],
+        executor: TaskExecutor,
     ):
         super().__init__(parent, padding=0)
 
         self.time_unit_var = tk.StringVar(value="s")
         self.active_span_var = tk.StringVar(value="steady")
+        self.show_smoothed_var = tk.BooleanVar(value=False)
+        self.show_diagnostics_var = tk.BooleanVar(value=False)
 
         # ---- toolbar at top ----
         self.toolbar = ToolbarPanel(
             self,
             on_load_csv=on_load_csv,
             on_export_json=on_export_json,
+            on_autotune=on_autotune,
             on_time_unit_changed=on_time_unit_changed,
             time_unit_var=self.time_unit_var,
             active_span_var=self.active_span_var,
+            show_smoothed_var=self.show_smoothed_var,
+            on_show_smoothed_changed=lambda: self.plot.set_show_smoothed(self.show_smoothed_var.get()),
+            show_diagnostics_var=self.show_diagnostics_var,
+            on_show_diagnostics_changed=on_tuning_changed,
         )
         self.toolbar.pack(side=tk.TOP, fill=tk.X)
 
@@ -61,6 +71,7 @@ class MainView(ttk.Frame):
             self.plot_container,
             on_span_selected=on_span_selected,
             active_span_var=self.active_span_var,
+            executor=executor,
         )
         self.plot.pack(fill=tk.BOTH, expand=True)
 
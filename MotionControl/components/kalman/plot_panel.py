@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import itertools
 import tkinter as tk
 from tkinter import ttk
 from typing import Callable, Optional, Tuple
@@ -9,15 +10,40 @@ matplotlib.use("TkAgg")
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.widgets import SpanSelector
+from matplotlib.lines import Line2D
 import numpy as np
 
-from services.kalman_service import run_procedural_kalman, KalmanRunConfig
+from services.kalman_service import run_procedural_kalman, run_rts_smoother, KalmanRunConfig
+from services.helpers import LruCache, MinMaxPyramid
+from ..task_executor import TaskExecutor
+from ..blit_manager import BlitManager, vspan_artist, move_vspan
+
+# (series token, cfg, smoothed) -> overlay arrays
+OverlayKey = Tuple[int, KalmanRunConfig, bool]
+
+
+def _overlay_arrays(t: np.ndarray, x: np.ndarray, cfg: KalmanRunConfig, smoothed: bool) -> tuple[MinMaxPyramid, ...]:
+    # runs in a worker process (module-level so it pickles); the LOD pyramids
+    # are built there too
+    if smoothed:
+        y, _, y_s, _ = run_rts_smoother(t, x, cfg)
+        return (MinMaxPyramid(y), MinMaxPyramid(y_s))
+    y, _ = run_procedural_kalman(t, x, cfg)
+    return (MinMaxPyramid(y),)
 
 
 class PlotPanel(ttk.Frame):
-    def __init__(self, parent, *, on_span_selected: Callable[[str, int, int], None], active_span_var: tk.StringVar):
+    def __init__(
+        self,
+        parent,
+        *,
+        on_span_selected: Callable[[str, int, int], None],
+        active_span_var: tk.StringVar,
+        executor: TaskExecutor,
+    ):
         super().__init__(parent, padding=8)
 
+        self._executor = executor
         self._on_span_selected = on_span_selected
         self._active_span_var = active_span_var
 
@@ -28,13 +54,46 @@ class PlotPanel(ttk.Frame):
 
         self._kalman_cfg: Optional[KalmanRunConfig] = None
         self._show_kalman: bool = True
+        self._show_smoothed: bool = False
+
+        # Kalman overlay results are cached per (series, cfg, smoothed) and
+        # computed in a worker process; only the newest request is delivered.
+        self._series_tokens = itertools.count()
+        self._series_token = next(self._series_tokens)
+        self._overlay_cache: LruCache[tuple[MinMaxPyramid, ...]] = LruCache(maxsize=6)
+        self._overlay_requested: Optional[OverlayKey] = None
+        self._overlay_failed: Optional[OverlayKey] = None
+
+        # Lines are drawn from min/max pyramids and re-sliced to the visible
+        # x-range on zoom/pan; span picking still uses the full-res self._t.
+        self._x_lod: Optional[MinMaxPyramid] = None
+        self._lod_pending = False
+        self._autoscale_pending = False
 
         self.fig = Figure(figsize=(11.5, 7.5), dpi=100)
         self.ax_full = self.fig.add_subplot(1, 1, 1)
+        self.ax_full.grid(True)
+        self.ax_full.set_xlabel("time (s)")
+        self.ax_full.set_ylabel("x")
 
         self.canvas = FigureCanvasTkAgg(self.fig, master=self)
         self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
+        # Persistent artists: lines get new data via set_data, spans move in
+        # place and are blitted over a cached background.
+        (self._line_x,) = self.ax_full.plot([], [], label="x (measured)")
+        (self._line_y,) = self.ax_full.plot([], [], label="kalman y (x̂)")
+        (self._line_s,) = self.ax_full.plot([], [], label="RTS smoothed (x̂|N)")
+        self._lod_sources: dict[Line2D, Optional[MinMaxPyramid]] = {
+            self._line_x: None,
+            self._line_y: None,
+            self._line_s: None,
+        }
+        self._span_steady = vspan_artist(self.ax_full, alpha=0.20, label="STEADY span", color="C0")
+        self._span_ramp = vspan_artist(self.ax_full, alpha=0.20, label="RAMP span", color="C1")
+        self._blit = BlitManager(self.canvas, [self._span_steady, self._span_ramp])
+        self.ax_full.callbacks.connect("xlim_changed", self._on_xlim_changed)
+
         self.toolbar = NavigationToolbar2Tk(self.canvas, self)
         self.toolbar.update()
 
@@ -52,18 +111,35 @@ class PlotPanel(ttk.Frame):
     def set_series(self, t: np.ndarray, x: np.ndarray) -> None:
         self._t = t
         self._x = x
+        self._x_lod = MinMaxPyramid(x)
+        self._series_token = next(self._series_tokens)
+        self._autoscale_pending = True
         self.redraw()
 
     def set_spans(self, steady_span: Optional[Tuple[int, int]], ramp_span: Optional[Tuple[int, int]]) -> None:
         self._steady_span = steady_span
         self._ramp_span = ramp_span
-        self.redraw()
+        if self._move_spans():
+            # a span appeared/disappeared: the legend changes, full draw
+            self._update_legend()
+            self.canvas.draw_idle()
+        else:
+            self._blit.update()
 
     def set_kalman(self, cfg: Optional[KalmanRunConfig], *, show: bool = True) -> None:
+        if cfg == self._kalman_cfg and show == self._show_kalman:
+            # recompute() re-sends the config after every span change
+            return
         self._kalman_cfg = cfg
         self._show_kalman = show
         self.redraw()
 
+    def set_show_smoothed(self, show: bool) -> None:
+        if bool(show) == self._show_smoothed:
+            return
+        self._show_smoothed = bool(show)
+        self.redraw()
+
     def _on_span_select(self, xmin: float, xmax: float) -> None:
         if self._t is None or self._x is None:
             return
@@ -79,37 +155,131 @@ class PlotPanel(ttk.Frame):
         span_type = self._active_span_var.get().strip().lower()
         self._on_span_selected(span_type, a, b)
 
+    def _overlay_key(self) -> Optional[OverlayKey]:
+        if self._t is None or self._x is None:
+            return None
+        if not self._show_kalman or self._kalman_cfg is None:
+            return None
+        return (self._series_token, self._kalman_cfg, self._show_smoothed)
+
+    def _request_overlay(self, key: OverlayKey) -> None:
+        if key == self._overlay_requested or key == self._overlay_failed:
+            return
+        self._overlay_requested = key
+        _, cfg, smoothed = key
+        self._executor.submit(
+            _overlay_arrays, self._t, self._x, cfg, smoothed,
+            kind="process",
+            key=("kalman_overlay", id(self)),
+            on_done=lambda result: self._on_overlay_done(key, result),
+            on_error=lambda _exc: self._on_overlay_failed(key),
+        )
+
+    def _on_overlay_done(self, key: OverlayKey, result: tuple[MinMaxPyramid, ...]) -> None:
+        self._overlay_requested = None
+        self._overlay_cache.put(key, result)
+        if key == self._overlay_key():
+            self.redraw()
+
+    def _on_overlay_failed(self, key: OverlayKey) -> None:
+        # remember the failure so redraws don't resubmit the same request
+        self._overlay_requested = None
+        self._overlay_failed = key
+        if key == self._overlay_key():
+            self.redraw()
+
+    def _pixels(self) -> int:
+        return max(int(self.ax_full.bbox.width), 100)
+
+    def _on_xlim_changed(self, _ax) -> None:
+        # coalesce the burst of xlim events from one pan/zoom into one re-slice
+        if not self._lod_pending and self._t is not None:
+            self._lod_pending = True
+            self.after_idle(self._reslice_lod)
+
+    def _reslice_lod(self) -> None:
+        self._lod_pending = False
+        if self._t is None:
+            return
+        self._set_line_data()
+        self.canvas.draw_idle()
+
+    def _set_line_data(self) -> None:
+        x0, x1 = sorted(self.ax_full.get_xlim())
+        px = self._pixels()
+        for line, pyramid in self._lod_sources.items():
+            if pyramid is None:
+                line.set_data([], [])
+                line.set_visible(False)
+            else:
+                line.set_data(*pyramid.view(self._t, x0, x1, px))
+                line.set_visible(True)
+
+    def _move_spans(self) -> bool:
+        """Move the span patches in place; True if a span's visibility changed."""
+        before = (self._span_steady.get_visible(), self._span_ramp.get_visible())
+        for rect, span in ((self._span_steady, self._steady_span), (self._span_ramp, self._ramp_span)):
+            if span is None or self._t is None:
+                move_vspan(rect, None, None)
+            else:
+                a, b = span
+                move_vspan(rect, self._t[a], self._t[b - 1])
+        return before != (self._span_steady.get_visible(), self._span_ramp.get_visible())
+
+    def _update_legend(self) -> None:
+        handles = [a for a in (self._line_x, self._line_y, self._line_s, self._span_steady, self._span_ramp) if a.get_visible()]
+        legend = self.ax_full.get_legend()
+        if legend is not None:
+            legend.remove()
+        if handles:
+            self.ax_full.legend(handles=handles, loc="upper right")
+
     def redraw(self) -> None:
         self._draw_full()
         self.canvas.draw_idle()
 
     def _draw_full(self) -> None:
-        self.ax_full.clear()
-        self.ax_full.grid(True)
-
+        """Refresh every persistent artist from the current state (no ax.clear())."""
         if self._t is None or self._x is None:
+            for line in self._lod_sources:
+                self._lod_sources[line] = None
+                line.set_data([], [])
+                line.set_visible(False)
+            self._move_spans()
+            self._update_legend()
             self.ax_full.set_title("Full signal (drag to select span)")
-            self.ax_full.set_xlabel("time")
-            self.ax_full.set_ylabel("x")
             return
 
-        self.ax_full.plot(self._t, self._x, label="x (measured)")
+        # procedural kalman overlay (cached; computed off the Tk loop on a miss)
+        title = "Signal + spans + procedural Kalman overlay"
+        overlay: tuple[MinMaxPyramid, ...] = ()
+        key = self._overlay_key()
+        if key is not None:
+            cached = self._overlay_cache.get(key)
+            if cached is None and key == self._overlay_failed:
+                title += " (Kalman overlay failed)"
+            elif cached is None:
+                self._request_overlay(key)
+                title += " (computing…)"
+            else:
+                overlay = cached
+            # optional: velocity on 2nd axis if you want later
 
-        # spans
-        if self._steady_span is not None:
-            a, b = self._steady_span
-            self.ax_full.axvspan(self._t[a], self._t[b - 1], alpha=0.20, label="STEADY span")
-        if self._ramp_span is not None:
-            a, b = self._ramp_span
-            self.ax_full.axvspan(self._t[a], self._t[b - 1], alpha=0.20, label="RAMP span")
+        self._lod_sources[self._line_x] = self._x_lod
+        self._lod_sources[self._line_y] = overlay[0] if len(overlay) > 0 else None
+        self._lod_sources[self._line_s] = overlay[1] if self._show_smoothed and len(overlay) > 1 else None
 
-        # procedural kalman overlay
-        if self._show_kalman and self._kalman_cfg is not None:
-            y, y_dot = run_procedural_kalman(self._t, self._x, self._kalman_cfg)
-            self.ax_full.plot(self._t, y, label="kalman y (x̂)")
-            # optional: velocity on 2nd axis if you want later
+        if self._autoscale_pending:
+            # new series: reset the view to the full signal
+            self._autoscale_pending = False
+            self.ax_full.set_xlim(float(self._t[0]), float(self._t[-1]))
+            self._set_line_data()
+            self.ax_full.relim(visible_only=True)
+            self.ax_full.autoscale_view(scalex=False)
+            self.toolbar.update()
+        else:
+            self._set_line_data()
 
-        self.ax_full.set_title("Signal + spans + procedural Kalman overlay")
-        self.ax_full.set_xlabel("time (s)")
-        self.ax_full.set_ylabel("x")
-        self.ax_full.legend(loc="upper right")
+        self._move_spans()
+        self._update_legend()
+        self.ax_full.set_title(title)
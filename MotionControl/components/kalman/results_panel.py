@@ -5,7 +5,7 @@ import tkinter as tk
 from tkinter import ttk
 import numpy as np
 
-from models.kalman import TimeSeriesData, SpanSelections, TuningResult
+from models.kalman import TimeSeriesData, SpanSelections, TuningResult, KalmanDiagnostics
 
 
 class ResultsPanel(ttk.LabelFrame):
@@ -27,7 +27,13 @@ class ResultsPanel(ttk.LabelFrame):
         self._text.insert("1.0", text)
         self._text.configure(state="disabled")
 
-    def render(self, ts: TimeSeriesData | None, spans: SpanSelections, result: TuningResult | None) -> None:
+    def render(
+        self,
+        ts: TimeSeriesData | None,
+        spans: SpanSelections,
+        result: TuningResult | None,
+        diagnostics: KalmanDiagnostics | None = None,
+    ) -> None:
         if ts is None:
             self.set_text("Load a CSV to begin.")
             return
@@ -67,4 +73,21 @@ class ResultsPanel(ttk.LabelFrame):
             lines.append("")
             lines.append("RAMP span (for q_x_dot): not selected")
 
+        # DIAGNOSTICS (active tuning)
+        if diagnostics is not None:
+            d = diagnostics
+            w = d.window
+            lines.append("")
+            lines.append(f"INNOVATION diagnostics (active tuning, window={w}):")
+            lines.append(f"  updates used:       {d.n_valid}")
+            lines.append(f"  mean NIS:           {d.nis_mean:.6g}   (consistent ≈ 1)")
+            lines.append(f"  lag-1 whiteness:    {d.whiteness:.6g}   (white ≈ 0)")
+            lines.append(f"  windows in NIS band   (1 ± {1.96 * np.sqrt(2.0 / w):.3g}): {100.0 * d.nis_in_band:.1f}%")
+            lines.append(f"  windows in white band (± {1.96 / np.sqrt(w):.3g}): {100.0 * d.whiteness_in_band:.1f}%")
+            updated = np.flatnonzero(np.isfinite(d.k0))
+            if len(updated):
+                k = updated[-1]
+                lines.append(f"  last gains:         K0={d.k0[k]:.6g}  K1={d.k1[k]:.6g}")
+                lines.append(f"  last trace(P):      {d.p_trace[k]:.6g}")
+
         self.set_text("\n".join(lines))
@@ -11,9 +11,14 @@ class ToolbarPanel(ttk.Frame):
         *,
         on_load_csv,
         on_export_json,
+        on_autotune,
         on_time_unit_changed,
         time_unit_var: tk.StringVar,
         active_span_var: tk.StringVar,
+        show_smoothed_var: tk.BooleanVar,
+        on_show_smoothed_changed,
+        show_diagnostics_var: tk.BooleanVar,
+        on_show_diagnostics_changed,
     ):
         super().__init__(parent, padding=8)
 
@@ -31,4 +36,22 @@ class ToolbarPanel(ttk.Frame):
 
         ttk.Separator(self, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y, padx=10)
 
+        ttk.Checkbutton(
+            self,
+            text="RTS smoothed overlay",
+            variable=show_smoothed_var,
+            command=on_show_smoothed_changed,
+        ).pack(side=tk.LEFT)
+
+        ttk.Checkbutton(
+            self,
+            text="Innovation diagnostics",
+            variable=show_diagnostics_var,
+            command=on_show_diagnostics_changed,
+        ).pack(side=tk.LEFT, padx=(8, 0))
+
+        ttk.Separator(self, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y, padx=10)
+
+        ttk.Button(self, text="Auto-tune", command=on_autotune).pack(side=tk.LEFT)
+
         ttk.Button(self, text="Export spans JSON…", command=on_export_json).pack(side=tk.LEFT, padx=(10, 0))
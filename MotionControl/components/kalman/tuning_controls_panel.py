@@ -66,6 +66,15 @@ class TuningControlsPanel(ttk.LabelFrame):
             "manual_q_x_dot": self.q_x_dot.get(),
         }
 
+    def set_manual(self, *, r_x: float, q_x: float, q_x_dot: float) -> None:
+        # switch all three fields to manual with the given values (e.g. from auto-tune)
+        self.r_x.set(f"{r_x:.9g}")
+        self.q_x.set(f"{q_x:.9g}")
+        self.q_x_dot.set(f"{q_x_dot:.9g}")
+        self.use_r.set(True)
+        self.use_qx.set(True)
+        self.use_qxd.set(True)
+
     def set_suggested(self, *, r_x: float | None, q_x: float | None, q_x_dot: float | None):
         # only update text boxes if that field is NOT manual (so we don't overwrite user input)
         if not self.use_r.get() and r_x is not None:
@@ -11,14 +11,17 @@ matplotlib.use("TkAgg")
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-from services import generate_signal_csv
+from services import generate_signal_csv, generate_signal_series
 from models.signal_generator import RampHoldProfile
+from ..task_executor import TaskExecutor
 
 
 class SignalGeneratorPage(ttk.Frame):
-    def __init__(self, parent, *, on_back: Callable[[], None]):
+    def __init__(self, parent, *, on_back: Callable[[], None], executor: TaskExecutor):
         super().__init__(parent, padding=0)
 
+        self._executor = executor
+
         # Debounce handle for auto-preview
         self._preview_job = None
         self._suppress_preview = False
@@ -178,7 +181,7 @@ class SignalGeneratorPage(ttk.Frame):
     def _safe_preview(self) -> None:
         self._preview_job = None
         try:
-            self._on_preview()
+            self._on_preview(quiet=True)
         except Exception:
             # Ignore invalid partial input while typing (e.g., empty string)
             pass
@@ -196,84 +199,92 @@ class SignalGeneratorPage(ttk.Frame):
             T_HOLD_LO_MS=int(self.t_hold_lo.get()),
         )
 
-    @staticmethod
-    def _ramp_hold_value(profile: RampHoldProfile, t_ms: int) -> float:
-        period = profile.T_UP_MS + profile.T_HOLD_HI_MS + profile.T_DOWN_MS + profile.T_HOLD_LO_MS
-        u = t_ms % period
-
-        if u < profile.T_UP_MS:
-            frac = u / max(profile.T_UP_MS, 1)
-            return profile.X_LO + frac * (profile.X_HI - profile.X_LO)
-
-        u -= profile.T_UP_MS
-        if u < profile.T_HOLD_HI_MS:
-            return profile.X_HI
-
-        u -= profile.T_HOLD_HI_MS
-        if u < profile.T_DOWN_MS:
-            frac = u / max(profile.T_DOWN_MS, 1)
-            return profile.X_HI - frac * (profile.X_HI - profile.X_LO)
-
-        return profile.X_LO
-
-    def _preview_series(self) -> tuple[np.ndarray, np.ndarray]:
-        dt_ms = int(self.dt_ms.get())
-        seconds = int(self.seconds.get())
-        noise_amp = float(self.noise_amp.get())
-        rng_seed = int(self.rng_seed.get())
-
-        profile = self._build_profile()
+    def _preview_inputs(self) -> tuple[int, float, float, int, RampHoldProfile, bool]:
+        # Tk variables are read here, on the Tk thread
+        return (
+            int(self.dt_ms.get()),
+            float(self.seconds.get()),
+            float(self.noise_amp.get()),
+            int(self.rng_seed.get()),
+            self._build_profile(),
+            bool(self.time_unit_seconds.get()),
+        )
 
-        n = int((seconds * 1000) / dt_ms)
-        if n <= 1:
+    @staticmethod
+    def _preview_series(
+        dt_ms: int,
+        seconds: float,
+        noise_amp: float,
+        rng_seed: int,
+        profile: RampHoldProfile,
+        time_unit_seconds: bool,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        t, x = generate_signal_series(
+            dt_ms=dt_ms,
+            seconds=seconds,
+            profile=profile,
+            noise_amp=noise_amp,
+            rng_seed=rng_seed,
+            time_unit_seconds=time_unit_seconds,
+        )
+        if len(t) <= 1:
             raise ValueError("SECONDS must be long enough for at least 2 samples.")
-
-        t_ms = np.arange(n) * dt_ms
-        t = (t_ms / 1000.0) if self.time_unit_seconds.get() else t_ms.astype(float)
-
-        sigma = noise_amp / 3.0
-        rng = np.random.default_rng(rng_seed)
-
-        x_true = np.array([self._ramp_hold_value(profile, int(tm)) for tm in t_ms], dtype=float)
-        x = x_true + rng.normal(0.0, sigma, size=n)
         return t, x
 
     # -------------------------
     # UI actions
     # -------------------------
-    def _on_preview(self) -> None:
-        t, x = self._preview_series()
+    def _on_preview(self, *, quiet: bool = False) -> None:
+        inputs = self._preview_inputs()
+        # latest request wins: a newer preview drops this one's result
+        self._executor.submit(
+            self._preview_series, *inputs,
+            key=("signal_preview", id(self)),
+            on_done=lambda tx: self._draw_preview(*tx, time_unit_seconds=inputs[-1]),
+            # debounced previews ignore invalid partial input, like _safe_preview
+            on_error=(lambda e: None) if quiet else (lambda e: messagebox.showerror("Preview error", str(e))),
+        )
 
+    def _draw_preview(self, t: np.ndarray, x: np.ndarray, *, time_unit_seconds: bool) -> None:
         self._ax.clear()
         self._ax.grid(True)
         self._ax.plot(t, x)
 
         self._ax.set_title("Generated signal preview")
-        self._ax.set_xlabel("time (s)" if self.time_unit_seconds.get() else "time (ms)")
+        self._ax.set_xlabel("time (s)" if time_unit_seconds else "time (ms)")
         self._ax.set_ylabel("x")
 
         self._canvas.draw_idle()
 
     def _on_generate(self) -> None:
         try:
-            profile = self._build_profile()
-
-            out_path = generate_signal_csv(
+            kwargs = dict(
                 out_filename=self.out_filename.get().strip() or "signal.csv",
                 dt_ms=int(self.dt_ms.get()),
-                seconds=int(self.seconds.get()),
-                profile=profile,
+                seconds=float(self.seconds.get()),
+                profile=self._build_profile(),
                 noise_amp=float(self.noise_amp.get()),
                 rng_seed=int(self.rng_seed.get()),
                 time_unit_seconds=bool(self.time_unit_seconds.get()),
             )
+        except Exception as e:
+            messagebox.showerror("Generate error", str(e))
+            return
 
-            self.status.configure(text=f"Wrote: {out_path}")
+        # streamed to disk on a worker: long signals never block the UI
+        self.status.configure(text="Writing...")
+        self._executor.submit(
+            generate_signal_csv,
+            key=("signal_generate", id(self)),
+            on_done=self._on_generated,
+            on_error=lambda e: messagebox.showerror("Generate error", str(e)),
+            **kwargs,
+        )
 
-            # Auto-refresh preview after generate
-            self._schedule_preview(0)
+    def _on_generated(self, out_path: str) -> None:
+        self.status.configure(text=f"Wrote: {out_path}")
 
-            messagebox.showinfo("Signal Generator", f"Wrote CSV:\n{out_path}")
+        # Auto-refresh preview after generate
+        self._schedule_preview(0)
 
-        except Exception as e:
-            messagebox.showerror("Generate error", str(e))
+        messagebox.showinfo("Signal Generator", f"Wrote CSV:\n{out_path}")
@@ -23,11 +23,13 @@ from services import (
     simulate_step_response,
     export_step_csv,
 )
+from ..task_executor import TaskExecutor
 
 
 class StepResponsePage(ttk.Frame):
-    def __init__(self, parent, *, on_back: Callable[[], None]):
+    def __init__(self, parent, *, on_back: Callable[[], None], executor: TaskExecutor):
         super().__init__(parent, padding=0)
+        self._executor = executor
         self._preview_job = None
 
         header = ttk.Frame(self, padding=8)
@@ -219,7 +221,7 @@ class StepResponsePage(ttk.Frame):
     def _safe_preview(self) -> None:
         self._preview_job = None
         try:
-            self._on_preview()
+            self._on_preview(quiet=True)
         except Exception:
             pass
 
@@ -241,7 +243,9 @@ class StepResponsePage(ttk.Frame):
             tau_s=float(self.act_tau.get()),
         )
 
-    def _simulate(self):
+    def _simulation_kwargs(self) -> dict:
+        # Tk variables are read here, on the Tk thread; the simulation itself
+        # runs in a worker process.
         spec = self._build_spec()
         actuator = self._build_actuator()
         m = self.model.get()
@@ -252,14 +256,14 @@ class StepResponsePage(ttk.Frame):
                 tau_s=float(self.f_tau.get()),
                 theta_s=float(self.f_theta.get()),
             )
-            return simulate_step_response(spec=spec, actuator=actuator, model="FOPDT", fopdt=p)
+            return dict(spec=spec, actuator=actuator, model="FOPDT", fopdt=p)
         elif m == "IPDT":
             i = IPDTParams(
                 K=float(self.i_k.get()),
                 theta_s=float(self.i_theta.get()),
                 leak_tau_s=float(self.i_leak_tau.get()),
             )
-            return simulate_step_response(spec=spec, actuator=actuator, model="IPDT", ipdt=i)
+            return dict(spec=spec, actuator=actuator, model="IPDT", ipdt=i)
         elif m == "SOPDT_UNDERDAMPED":
             p = SOPDTUnderdampedParams(
                 K=float(self.s_k.get()),
@@ -267,11 +271,23 @@ class StepResponsePage(ttk.Frame):
                 wn=float(self.s_wn.get()),
                 theta_s=float(self.s_theta.get()),
             )
-            return simulate_step_response(spec=spec, actuator=actuator, model="SOPDT_UNDERDAMPED", sopdt=p)
-
-    def _on_preview(self) -> None:
-        t, cv_cmd, pv, cv_eff = self._simulate()
+            return dict(spec=spec, actuator=actuator, model="SOPDT_UNDERDAMPED", sopdt=p)
+        raise ValueError(f"Unknown model: {m}")
+
+    def _on_preview(self, *, quiet: bool = False) -> None:
+        kwargs = self._simulation_kwargs()
+        # latest request wins: a newer preview drops this one's result
+        self._executor.submit(
+            simulate_step_response,
+            kind="process",
+            key=("step_preview", id(self)),
+            on_done=lambda out: self._draw_preview(*out, model=kwargs["model"]),
+            # debounced previews ignore invalid partial input, like _safe_preview
+            on_error=(lambda e: None) if quiet else (lambda e: messagebox.showerror("Preview error", str(e))),
+            **kwargs,
+        )
 
+    def _draw_preview(self, t, cv_cmd, pv, cv_eff, *, model: str) -> None:
         self._ax.clear()
         self._ax.grid(True)
 
@@ -279,7 +295,7 @@ class StepResponsePage(ttk.Frame):
         self._ax.plot(t, pv, label="PV")
         self._ax.plot(t, cv_cmd, "--", label="CV_cmd")
 
-        self._ax.set_title(f"Step Response Preview — {self.model.get()}")
+        self._ax.set_title(f"Step Response Preview — {model}")
         self._ax.set_xlabel("time (s)")
         self._ax.set_ylabel("Value")
         self._ax.legend(loc="best")
@@ -288,16 +304,31 @@ class StepResponsePage(ttk.Frame):
 
     def _on_export(self) -> None:
         try:
-            t, cv_cmd, pv, _cv_eff = self._simulate()
-            out_name = (self.out_filename.get().strip() or "step_response.csv")
-            out_path = export_step_csv(
+            kwargs = self._simulation_kwargs()
+        except Exception as e:
+            messagebox.showerror("Export error", str(e))
+            return
+        out_name = (self.out_filename.get().strip() or "step_response.csv")
+        time_unit_seconds = bool(self.time_unit_seconds.get())
+
+        def simulate_and_export() -> str:
+            t, cv_cmd, pv, _cv_eff = simulate_step_response(**kwargs)
+            return export_step_csv(
                 out_filename=out_name,
                 t=t,
                 cv_cmd=cv_cmd,
                 pv=pv,
-                time_unit_seconds=bool(self.time_unit_seconds.get()),
+                time_unit_seconds=time_unit_seconds,
             )
-            self.status.configure(text=f"Wrote: {out_path}")
-            messagebox.showinfo("Export", f"Wrote CSV:\n{out_path}")
-        except Exception as e:
-            messagebox.showerror("Export error", str(e))
\ No newline at end of file
+
+        self.status.configure(text="Exporting…")
+        self._executor.submit(
+            simulate_and_export,
+            key=("step_export", id(self)),
+            on_done=self._on_exported,
+            on_error=lambda e: messagebox.showerror("Export error", str(e)),
+        )
+
+    def _on_exported(self, out_path: str) -> None:
+        self.status.configure(text=f"Wrote: {out_path}")
+        messagebox.showinfo("Export", f"Wrote CSV:\n{out_path}")
\ No newline at end of file
@@ -9,7 +9,7 @@ class StepTuningControls(ttk.Frame):
     """
     Left-side controls:
       - mode selector (Baseline/Final/Fit spans, Step/Deadtime/Peak points)
-      - model dropdown
+      - model and fit-method dropdowns, bootstrap toggle
       - buttons: Load, Auto step, Auto deadtime, Fit
       - results text
     """
@@ -20,6 +20,8 @@ class StepTuningControls(ttk.Frame):
         *,
         active_mode_var: tk.StringVar,
         model_var: tk.StringVar,
+        fit_method_var: tk.StringVar,
+        bootstrap_var: tk.BooleanVar,
         on_load: Callable[[], None],
         on_auto_step: Callable[[], None],
         on_auto_deadtime: Callable[[], None],
@@ -30,6 +32,8 @@ class StepTuningControls(ttk.Frame):
 
         self.active_mode_var = active_mode_var
         self.model_var = model_var
+        self.fit_method_var = fit_method_var
+        self.bootstrap_var = bootstrap_var
 
         # File actions
         file_box = ttk.LabelFrame(self, text="Data", padding=10)
@@ -71,6 +75,25 @@ class StepTuningControls(ttk.Frame):
         )
         cmb.grid(row=0, column=1, sticky="w")
 
+        ttk.Label(model_box, text="Fit method:").grid(row=1, column=0, sticky="w", padx=(0, 8), pady=(6, 0))
+        ttk.Combobox(
+            model_box,
+            textvariable=self.fit_method_var,
+            state="readonly",
+            values=["heuristic", "least_squares"],
+            width=18,
+        ).grid(row=1, column=1, sticky="w", pady=(6, 0))
+
+        self._chk_bootstrap = ttk.Checkbutton(
+            model_box,
+            text="Bootstrap 95 % intervals (least_squares)",
+            variable=self.bootstrap_var,
+        )
+        self._chk_bootstrap.grid(row=2, column=0, columnspan=2, sticky="w", pady=(6, 0))
+        # intervals need the least-squares fit: greyed out for the heuristic
+        self.fit_method_var.trace_add("write", lambda *_: self._refresh_bootstrap_state())
+        self._refresh_bootstrap_state()
+
         # Actions
         act = ttk.LabelFrame(self, text="Actions", padding=10)
         act.pack(fill="x", pady=(10, 0))
@@ -88,6 +111,10 @@ class StepTuningControls(ttk.Frame):
 
         self.set_results_text("Load a CSV, then select baseline/final spans and fit.\n")
 
+    def _refresh_bootstrap_state(self) -> None:
+        ls = self.fit_method_var.get() == "least_squares"
+        self._chk_bootstrap.configure(state="normal" if ls else "disabled")
+
     def set_results_text(self, text: str) -> None:
         self._txt.configure(state="normal")
         self._txt.delete("1.0", "end")
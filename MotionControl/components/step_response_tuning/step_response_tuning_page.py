@@ -21,12 +21,15 @@ from services import (
     identify,
     StepSeries,
 )
+from ..task_executor import TaskExecutor
 
 
 class StepTuningPage(ttk.Frame):
-    def __init__(self, parent, *, on_back: Callable[[], None]):
+    def __init__(self, parent, *, on_back: Callable[[], None], executor: TaskExecutor):
         super().__init__(parent, padding=0)
 
+        self._executor = executor
+
         self.ts: Optional[StepSeries] = None
         self.selections = StepTuneSelections()
         self.result: Optional[StepIdResult] = None
@@ -51,12 +54,16 @@ class StepTuningPage(ttk.Frame):
         # Vars
         self.active_mode = tk.StringVar(value="baseline")
         self.model = tk.StringVar(value="FOPDT")
+        self.fit_method = tk.StringVar(value="heuristic")
+        self.bootstrap = tk.BooleanVar(value=False)
 
         # Controls
         self.controls = StepTuningControls(
             left,
             active_mode_var=self.active_mode,
             model_var=self.model,
+            fit_method_var=self.fit_method,
+            bootstrap_var=self.bootstrap,
             on_load=self._on_load,
             on_auto_step=self._on_auto_step,
             on_auto_deadtime=self._on_auto_deadtime,
@@ -87,13 +94,18 @@ class StepTuningPage(ttk.Frame):
         if not path:
             return
 
-        try:
-            # assumes time in seconds; change to "ms" if needed
-            self.ts = load_step_csv(path, time_unit="s")
-        except Exception as e:
-            messagebox.showerror("Load error", str(e))
-            return
+        # assumes time in seconds; change to "ms" if needed
+        self._executor.submit(
+            load_step_csv, path, time_unit="s",
+            key=("step_load", id(self)),
+            on_done=self._on_loaded,
+            on_error=lambda e: messagebox.showerror("Load error", str(e)),
+        )
 
+    def _on_loaded(self, ts: StepSeries) -> None:
+        # a fit still running belongs to the previous file
+        self._executor.cancel(("step_fit", id(self)))
+        self.ts = ts
         self.selections.clear_all()
         self.result = None
         self.pv_hat = None
@@ -143,7 +155,7 @@ class StepTuningPage(ttk.Frame):
     def _on_auto_deadtime(self) -> None:
         if self.ts is None:
             return
-        i = auto_detect_deadtime_index(self.ts, self.selections)
+        i = auto_detect_deadtime_index(self.ts, self.selections, detector="cusum")
         if i is None:
             messagebox.showwarning("Deadtime", "Could not auto-detect deadtime. Ensure baseline span is selected.")
             return
@@ -156,12 +168,18 @@ class StepTuningPage(ttk.Frame):
     def _on_fit(self) -> None:
         if self.ts is None:
             return
-        try:
-            res, pv_hat = identify(self.ts, self.selections, self.model.get())
-        except Exception as e:
-            messagebox.showerror("Fit error", str(e))
-            return
+        method = self.fit_method.get()
+        self._executor.submit(
+            identify, self.ts, self.selections, self.model.get(),
+            method=method,
+            n_boot=1000 if self.bootstrap.get() and method == "least_squares" else 0,
+            kind="process",
+            key=("step_fit", id(self)),
+            on_done=lambda out: self._on_fitted(*out),
+            on_error=lambda e: messagebox.showerror("Fit error", str(e)),
+        )
 
+    def _on_fitted(self, res: StepIdResult, pv_hat: np.ndarray) -> None:
         self.result = res
         self.pv_hat = pv_hat
         self.plot.set_overlay(self.pv_hat)
@@ -227,6 +245,11 @@ class StepTuningPage(ttk.Frame):
             for k, v in r.params.items():
                 lines.append(f"  {k} = {v:.9g}")
             lines.append(f"  RMSE = {r.rmse:.6g}   (N_fit={r.n_fit})")
+            lines.append(f"  method = {r.method}" + (f"  ({r.n_iter} iterations)" if r.n_iter else ""))
+            if r.intervals:
+                lines.append(f"  {r.ci_level * 100:.0f} % intervals ({r.n_boot} bootstrap refits):")
+                for k, (lo, hi) in r.intervals.items():
+                    lines.append(f"    {k}: [{lo:.6g}, {hi:.6g}]")
             if r.note:
                 lines.append("")
                 lines.append(f"Note: {r.note}")
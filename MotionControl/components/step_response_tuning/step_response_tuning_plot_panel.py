@@ -9,9 +9,15 @@ matplotlib.use("TkAgg")
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.widgets import SpanSelector
+from matplotlib.lines import Line2D
 
 import numpy as np
 
+from services.helpers import MinMaxPyramid
+from ..blit_manager import BlitManager, vspan_artist, move_vspan, vline_artist, move_vline
+
+_IDLE_TITLE = "Step Tuner — load CSV then select spans/points"
+
 
 class StepTuningPlotPanel(ttk.Frame):
     """
@@ -48,16 +54,41 @@ class StepTuningPlotPanel(ttk.Frame):
         self._i_dead: Optional[int] = None
         self._i_peak: Optional[int] = None
 
+        # Lines are drawn from min/max pyramids and re-sliced to the visible
+        # x-range on zoom/pan; picking still uses the full-res self._t.
+        self._lod: dict[str, MinMaxPyramid] = {}
+        self._lod_pending = False
+        self._autoscale_pending = False
+
         self.fig = Figure(figsize=(10.5, 6.5), dpi=100)
         self.ax = self.fig.add_subplot(1, 1, 1)
         self.ax.grid(True)
-        self.ax.set_title("Step Tuner — load CSV then select spans/points")
+        self.ax.set_title(_IDLE_TITLE)
         self.ax.set_xlabel("time (s)")
         self.ax.set_ylabel("Value")
 
         self.canvas = FigureCanvasTkAgg(self.fig, master=self)
         self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
+        # Persistent artists: lines get new data via set_data, spans and point
+        # markers move in place and are blitted over a cached background.
+        (line_pv,) = self.ax.plot([], [], label="PV")
+        (line_cv,) = self.ax.plot([], [], linestyle="--", label="CV")
+        (line_hat,) = self.ax.plot([], [], label="PV_hat")
+        self._lines: dict[str, Line2D] = {"pv": line_pv, "cv": line_cv, "pv_hat": line_hat}
+        self._spans = {
+            "baseline": vspan_artist(self.ax, alpha=0.15, label="baseline", color="C0"),
+            "final": vspan_artist(self.ax, alpha=0.15, label="final", color="C1"),
+            "fit": vspan_artist(self.ax, alpha=0.10, label="fit", color="C2"),
+        }
+        self._points = {
+            "t_step": vline_artist(self.ax, linestyle=":", linewidth=1.2, label="t_step", color="C3"),
+            "t_dead": vline_artist(self.ax, linestyle=":", linewidth=1.2, label="t_dead", color="C4"),
+            "peak": vline_artist(self.ax, linestyle=":", linewidth=1.2, label="peak", color="C5"),
+        }
+        self._blit = BlitManager(self.canvas, [*self._spans.values(), *self._points.values()])
+        self.ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
+
         self.toolbar = NavigationToolbar2Tk(self.canvas, self)
         self.toolbar.update()
 
@@ -78,10 +109,19 @@ class StepTuningPlotPanel(ttk.Frame):
         self._t = t
         self._cv = cv
         self._pv = pv
+        self._lod = {"cv": MinMaxPyramid(cv), "pv": MinMaxPyramid(pv)}
+        self._autoscale_pending = True
         self.redraw()
 
     def set_overlay(self, pv_hat: Optional[np.ndarray]) -> None:
+        if pv_hat is self._pv_hat:
+            # the page re-sends the overlay with every annotation refresh
+            return
         self._pv_hat = pv_hat
+        if pv_hat is None:
+            self._lod.pop("pv_hat", None)
+        else:
+            self._lod["pv_hat"] = MinMaxPyramid(pv_hat)
         self.redraw()
 
     def set_spans(
@@ -93,7 +133,7 @@ class StepTuningPlotPanel(ttk.Frame):
         self._baseline_span = baseline
         self._final_span = final
         self._fit_span = fit
-        self.redraw()
+        self._refresh_markers()
 
     def set_points(
         self,
@@ -104,7 +144,7 @@ class StepTuningPlotPanel(ttk.Frame):
         self._i_step = i_step
         self._i_dead = i_dead
         self._i_peak = i_peak
-        self.redraw()
+        self._refresh_markers()
 
     # ----------------------------
     # events
@@ -142,59 +182,105 @@ class StepTuningPlotPanel(ttk.Frame):
             name = {"step": "t_step", "deadtime": "t_dead", "peak": "peak"}[mode]
             self._on_point_selected(name, i)
 
+    # ----------------------------
+    # level of detail
+    # ----------------------------
+    def _pixels(self) -> int:
+        return max(int(self.ax.bbox.width), 100)
+
+    def _on_xlim_changed(self, _ax) -> None:
+        # coalesce the burst of xlim events from one pan/zoom into one re-slice
+        if not self._lod_pending and self._t is not None:
+            self._lod_pending = True
+            self.after_idle(self._reslice_lod)
+
+    def _reslice_lod(self) -> None:
+        self._lod_pending = False
+        if self._t is None:
+            return
+        self._set_line_data()
+        self.canvas.draw_idle()
+
+    def _set_line_data(self) -> None:
+        x0, x1 = sorted(self.ax.get_xlim())
+        px = self._pixels()
+        for name, line in self._lines.items():
+            pyramid = self._lod.get(name)
+            if name == "pv_hat" and (self._pv_hat is None or self._t is None or len(self._pv_hat) != len(self._t)):
+                pyramid = None
+            if pyramid is None or self._t is None:
+                line.set_data([], [])
+                line.set_visible(False)
+            else:
+                line.set_data(*pyramid.view(self._t, x0, x1, px))
+                line.set_visible(True)
+
     # ----------------------------
     # draw
     # ----------------------------
-    def redraw(self) -> None:
-        self.ax.clear()
-        self.ax.grid(True)
+    def _move_markers(self) -> bool:
+        """Move spans/points in place; True if any marker's visibility changed."""
+        markers = [*self._spans.values(), *self._points.values()]
+        before = [m.get_visible() for m in markers]
+        t = self._t
+        n = 0 if t is None else len(t)
+
+        spans = {"baseline": self._baseline_span, "final": self._final_span, "fit": self._fit_span}
+        for name, span in spans.items():
+            if span is None or t is None or span[0] < 0 or span[1] <= span[0] or span[1] > n:
+                move_vspan(self._spans[name], None, None)
+            else:
+                a, b = span
+                move_vspan(self._spans[name], t[a], t[b - 1])
+
+        points = {"t_step": self._i_step, "t_dead": self._i_dead, "peak": self._i_peak}
+        for name, i in points.items():
+            if i is None or t is None or not (0 <= int(i) < n):
+                move_vline(self._points[name], None)
+            else:
+                move_vline(self._points[name], t[int(i)])
+
+        return before != [m.get_visible() for m in markers]
+
+    def _refresh_markers(self) -> None:
+        if self._move_markers():
+            # a marker appeared/disappeared: the legend changes, full draw
+            self._update_legend()
+            self.canvas.draw_idle()
+        else:
+            self._blit.update()
+
+    def _update_legend(self) -> None:
+        artists = [*self._lines.values(), *self._spans.values(), *self._points.values()]
+        handles = [a for a in artists if a.get_visible()]
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        if handles and self._t is not None:
+            self.ax.legend(handles=handles, loc="best")
 
+    def redraw(self) -> None:
+        """Refresh every persistent artist from the current state (no ax.clear())."""
         if self._t is None or self._pv is None or self._cv is None:
-            self.ax.set_title("Step Tuner — load CSV then select spans/points")
-            self.ax.set_xlabel("time (s)")
-            self.ax.set_ylabel("Value")
+            self._set_line_data()
+            self._move_markers()
+            self._update_legend()
+            self.ax.set_title(_IDLE_TITLE)
             self.canvas.draw_idle()
             return
 
-        t = self._t
-        cv = self._cv
-        pv = self._pv
-
-        self.ax.plot(t, pv, label="PV")
-        self.ax.plot(t, cv, linestyle="--", label="CV")
-
-        if self._pv_hat is not None and len(self._pv_hat) == len(t):
-            self.ax.plot(t, self._pv_hat, label="PV_hat")
-
-        # spans
-        def draw_span(span: Optional[Tuple[int, int]], label: str, alpha: float):
-            if span is None:
-                return
-            a, b = span
-            if a < 0 or b <= a or b > len(t):
-                return
-            self.ax.axvspan(t[a], t[b - 1], alpha=alpha, label=label)
-
-        draw_span(self._baseline_span, "baseline", 0.15)
-        draw_span(self._final_span, "final", 0.15)
-        draw_span(self._fit_span, "fit", 0.10)
-
-        # points
-        def draw_point(i: Optional[int], label: str):
-            if i is None:
-                return
-            i = int(i)
-            if i < 0 or i >= len(t):
-                return
-            self.ax.axvline(t[i], linestyle=":", linewidth=1.2, label=label)
-
-        draw_point(self._i_step, "t_step")
-        draw_point(self._i_dead, "t_dead")
-        draw_point(self._i_peak, "peak")
-
+        if self._autoscale_pending:
+            # new series: reset the view to the full signal
+            self._autoscale_pending = False
+            self.ax.set_xlim(float(self._t[0]), float(self._t[-1]))
+            self._set_line_data()
+            self.ax.relim(visible_only=True)
+            self.ax.autoscale_view(scalex=False)
+            self.toolbar.update()
+        else:
+            self._set_line_data()
+
+        self._move_markers()
+        self._update_legend()
         self.ax.set_title("Step Tuner — Baseline/Final/Fit (drag). Step/Deadtime/Peak (click)")
-        self.ax.set_xlabel("time (s)")
-        self.ax.set_ylabel("Value")
-        self.ax.legend(loc="best")
-
-        self.canvas.draw_idle()
\ No newline at end of file
+        self.canvas.draw_idle()
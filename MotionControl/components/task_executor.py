@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import queue
+import tkinter as tk
+from typing import Any, Callable, Hashable, Literal, Optional
+
+TaskKind = Literal["thread", "process"]
+
+
+class TaskHandle:
+    """
+    Cancellable handle for one submitted task.
+
+    cancel() drops a queued task outright; a task that is already running
+    finishes in its worker, but its result is discarded instead of being
+    delivered to the UI.
+    """
+
+    __slots__ = ("key", "_future", "_cancelled")
+
+    def __init__(self, future: Future, key: Optional[Hashable]):
+        self.key = key
+        self._future = future
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+        self._future.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def done(self) -> bool:
+        return self._future.done()
+
+
+class TaskExecutor:
+    """
+    Shared background executor for the Tk UI.
+
+      - "thread" tasks run on a thread pool (file I/O, pandas parsing).
+      - "process" tasks run on a process pool (NumPy / pure-Python number
+        crunching that would otherwise hold the GIL); the function and its
+        arguments must be picklable, i.e. module-level functions.
+
+    Callbacks never run on a worker: finished futures are queued and drained
+    on the Tk thread by an after() poll that only runs while tasks are in
+    flight.
+
+    key: submitting with a key cancels the previous task with the same key
+    (latest request wins), so a burst of debounced previews only ever
+    delivers the newest result.
+
+    A failed task without on_error is reported like an exception raised in
+    a Tk callback (root.report_callback_exception), never dropped silently.
+    """
+
+    def __init__(
+        self,
+        root: tk.Misc,
+        *,
+        thread_workers: int = 4,
+        process_workers: Optional[int] = None,
+        poll_ms: int = 16,
+    ):
+        self._root = root
+        self._threads = ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="ui-task")
+        self._process_workers = process_workers
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._poll_ms = int(poll_ms)
+
+        self._done: queue.Queue = queue.Queue()
+        self._latest: dict[Hashable, TaskHandle] = {}
+        self._in_flight = 0
+        self._polling = False
+        self._closed = False
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        kind: TaskKind = "thread",
+        key: Optional[Hashable] = None,
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        **kwargs: Any,
+    ) -> TaskHandle:
+        """
+        Run fn(*args, **kwargs) in the background.
+
+        on_done(result) / on_error(exc) are called on the Tk thread, unless the
+        task was cancelled or superseded by a newer task with the same key.
+        Without on_error, a failure goes to root.report_callback_exception.
+        """
+        if self._closed:
+            raise RuntimeError("TaskExecutor is shut down")
+
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel()
+
+        future = self._pool(kind).submit(fn, *args, **kwargs)
+        handle = TaskHandle(future, key)
+        if key is not None:
+            self._latest[key] = handle
+
+        self._in_flight += 1
+        future.add_done_callback(lambda f: self._done.put((handle, f, on_done, on_error)))
+        self._ensure_polling()
+        return handle
+
+    def cancel(self, key: Hashable) -> None:
+        handle = self._latest.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+
+    def shutdown(self) -> None:
+        self._closed = True
+        for handle in self._latest.values():
+            handle.cancel()
+        self._latest.clear()
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+    # ---- internals ----
+    def _pool(self, kind: TaskKind):
+        if kind == "thread":
+            return self._threads
+        if kind == "process":
+            if self._processes is None:
+                # created on first use: spawning workers is not free
+                self._processes = ProcessPoolExecutor(max_workers=self._process_workers)
+            return self._processes
+        raise ValueError(f"Unknown task kind: {kind!r}")
+
+    def _ensure_polling(self) -> None:
+        if not self._polling:
+            self._polling = True
+            self._root.after(self._poll_ms, self._poll)
+
+    def _poll(self) -> None:
+        while True:
+            try:
+                handle, future, on_done, on_error = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._in_flight -= 1
+            self._deliver(handle, future, on_done, on_error)
+
+        if self._in_flight > 0 and not self._closed:
+            self._root.after(self._poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    def _deliver(self, handle: TaskHandle, future: Future, on_done, on_error) -> None:
+        if handle.key is not None and self._latest.get(handle.key) is handle:
+            del self._latest[handle.key]
+        if handle.cancelled or future.cancelled():
+            return
+
+        exc = future.exception()
+        if exc is not None:
+            if on_error is not None:
+                on_error(exc)
+            else:
+                self._report(exc)
+            return
+        if on_done is not None:
+            on_done(future.result())
+
+    def _report(self, exc: BaseException) -> None:
+        # same sink Tk uses for exceptions escaping a callback
+        self._root._root().report_callback_exception(type(exc), exc, exc.__traceback__)
@@ -6,6 +6,7 @@ import numpy as np
 
 from components import (
     Router,
+    TaskExecutor,
     HomePage,
     KalmanPage,
     SignalGeneratorPage,
@@ -18,11 +19,14 @@ from models.kalman import (
     TuningResult,
     TuningOverrides,
     KalmanRunConfig,
+    AutotuneResult,
 )
 
 from services import (
     load_csv,
     compute_tuning,
+    autotune_kalman,
+    run_kalman_diagnostics,
     export_spans_json,
 )
 
@@ -33,6 +37,11 @@ class Ctrl:
         self.root.title("MotionControl")
         self.root.geometry("1200x900")
 
+        # Background work (CSV loads, filters, fits) runs here; results come
+        # back on the Tk thread.
+        self.executor = TaskExecutor(self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Router
         self.router = Router(self.root)
         self.router.pack(fill=tk.BOTH, expand=True)
@@ -57,24 +66,29 @@ class Ctrl:
             on_back=lambda: self.router.show("home"),
             on_load_csv=self.on_load_csv,
             on_export_json=self.on_export_json,
+            on_autotune=self.on_autotune,
             on_time_unit_changed=self.on_time_unit_changed,
             on_span_selected=self.on_span_selected,
             on_tuning_changed=self.on_tuning_changed,
+            executor=self.executor,
         )
 
         self.signal_generator_page = SignalGeneratorPage(
             self.router,
             on_back=lambda: self.router.show("home"),
+            executor=self.executor,
         )
 
         self.step_page = StepResponsePage(
             self.router,
-            on_back=lambda: self.router.show("home")
+            on_back=lambda: self.router.show("home"),
+            executor=self.executor,
         )
 
         self.step_response_id_page = StepTuningPage(
             self.router,
             on_back=lambda: self.router.show("home"),
+            executor=self.executor,
         )
 
         self.router.add_page("home", self.home_page)
@@ -97,12 +111,15 @@ class Ctrl:
         if not path:
             return
 
-        try:
-            self.ts = load_csv(path, time_unit=self.view.time_unit())
-        except Exception as e:
-            messagebox.showerror("Load error", str(e))
-            return
+        self.executor.submit(
+            load_csv, path, time_unit=self.view.time_unit(),
+            key="kalman_load",
+            on_done=self._on_csv_loaded,
+            on_error=lambda e: messagebox.showerror("Load error", str(e)),
+        )
 
+    def _on_csv_loaded(self, ts: TimeSeriesData) -> None:
+        self.ts = ts
         self.spans.clear()
         self.result = None
 
@@ -115,12 +132,15 @@ class Ctrl:
         # If we already loaded a CSV, re-load it with the new time unit.
         if self.ts is None:
             return
-        try:
-            self.ts = load_csv(self.ts.source_path, time_unit=self.view.time_unit())
-        except Exception as e:
-            messagebox.showerror("Time unit error", str(e))
-            return
+        self.executor.submit(
+            load_csv, self.ts.source_path, time_unit=self.view.time_unit(),
+            key="kalman_load",
+            on_done=self._on_time_unit_loaded,
+            on_error=lambda e: messagebox.showerror("Time unit error", str(e)),
+        )
 
+    def _on_time_unit_loaded(self, ts: TimeSeriesData) -> None:
+        self.ts = ts
         self.view.plot.set_series(self.ts.t, self.ts.x)
         self.recompute()
 
@@ -151,6 +171,24 @@ class Ctrl:
 
         self.recompute()
 
+    def on_autotune(self) -> None:
+        if self.ts is None:
+            messagebox.showinfo("Auto-tune", "Load a CSV first.")
+            return
+
+        self.executor.submit(
+            autotune_kalman, self.ts,
+            kind="process",
+            key="kalman_autotune",
+            on_done=self._on_autotuned,
+            on_error=lambda e: messagebox.showerror("Auto-tune error", str(e)),
+        )
+
+    def _on_autotuned(self, tuned: AutotuneResult) -> None:
+        # tuned values become manual overrides; spans keep feeding the suggestions
+        self.view.tuning_controls.set_manual(r_x=tuned.r_x, q_x=tuned.q_x, q_x_dot=tuned.q_x_dot)
+        self.on_tuning_changed()
+
     def on_export_json(self) -> None:
         if self.ts is None:
             messagebox.showinfo("Nothing to export", "Load a CSV first.")
@@ -175,12 +213,12 @@ class Ctrl:
     def recompute(self) -> None:
         if self.ts is None:
             self.result = None
+            self.executor.cancel("kalman_diagnostics")
             self.view.results.render(self.ts, self.spans, self.result)
             self.view.plot.set_kalman(None)
             return
 
         self.result = compute_tuning(self.ts, self.spans)
-        self.view.results.render(self.ts, self.spans, self.result)
 
         # let tuning panel know dt for helper button
         self.view.tuning_controls.set_dt(self.ts.dt_s)
@@ -199,11 +237,28 @@ class Ctrl:
         q_x_dot = self.overrides.active_q_x_dot(suggested_qxd)
 
         # Only plot kalman if numbers are finite
+        self.view.results.render(self.ts, self.spans, self.result)
+
         if np.isfinite(r_x) and np.isfinite(q_x) and np.isfinite(q_x_dot):
             cfg = KalmanRunConfig(r_x=r_x, q_x=q_x, q_x_dot=q_x_dot)
             self.view.plot.set_kalman(cfg, show=True)
+            if self.view.show_diagnostics_var.get():
+                # results re-render once the (long) diagnostics run is back
+                self.executor.submit(
+                    run_kalman_diagnostics, self.ts.t, self.ts.x, cfg,
+                    kind="process",
+                    key="kalman_diagnostics",
+                    on_done=lambda out: self.view.results.render(self.ts, self.spans, self.result, out[2]),
+                    on_error=lambda e: messagebox.showerror("Diagnostics error", str(e)),
+                )
+                return
         else:
             self.view.plot.set_kalman(None)
+        self.executor.cancel("kalman_diagnostics")
+
+    def on_close(self) -> None:
+        self.executor.shutdown()
+        self.root.destroy()
 
     def run(self):
         self.root.mainloop()
@@ -3,6 +3,11 @@ from .timeseries_model import TimeSeriesData
 from .tuning_result_model import TuningResult
 from .kalman_run_config_model import KalmanRunConfig
 from .tuning_overrides_model import TuningOverrides
+from .kalman_observer_state_model import KalmanObserverState
+from .autotune_bounds_model import AutotuneBounds
+from .autotune_result_model import AutotuneResult
+from .kalman_diagnostics_model import KalmanDiagnostics
+from .multi_channel_series_model import MultiChannelSeries
 
 
 __all__ = [
@@ -12,4 +17,9 @@ __all__ = [
     "TuningResult",
     "KalmanRunConfig",
     "TuningOverrides",
+    "KalmanObserverState",
+    "AutotuneBounds",
+    "AutotuneResult",
+    "KalmanDiagnostics",
+    "MultiChannelSeries",
 ]
\ No newline at end of file
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class AutotuneBounds:
+    # (lo, hi) search range per tuning value; lo == hi fixes the value
+    r_x: Tuple[float, float]
+    q_x: Tuple[float, float]
+    q_x_dot: Tuple[float, float]
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .tuning_result_model import TuningResult
+
+
+@dataclass(frozen=True)
+class AutotuneResult(TuningResult):
+    # tuned q_x (also reported as q_x_user)
+    q_x: float = float("nan")
+
+    # search bookkeeping
+    objective: str = "nll"
+    objective_value: float = float("nan")
+    mean_nis: float = float("nan")
+    n_evaluations: int = 0
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass(frozen=True)
+class KalmanDiagnostics:
+    # per sample, shape (N,) (NaN where no update ran)
+    innovation: np.ndarray              # y_res = x - x_pred
+    innovation_var: np.ndarray          # S = P00' + r_x
+    normalized_innovation: np.ndarray   # y_res / sqrt(S)
+    k0: np.ndarray
+    k1: np.ndarray
+    p_trace: np.ndarray                 # P00 + P11 after the update
+
+    # running stats over the last `window` valid updates, shape (N,)
+    window: int
+    nis_window: np.ndarray              # mean NIS, ≈ 1 when consistent
+    whiteness_window: np.ndarray        # lag-1 autocorrelation, ≈ 0 when white
+
+    # whole-signal summary
+    n_valid: int
+    nis_mean: float
+    whiteness: float
+    nis_in_band: float                  # fraction of full windows inside the 95% NIS band
+    whiteness_in_band: float            # fraction of full windows inside the 95% whiteness band
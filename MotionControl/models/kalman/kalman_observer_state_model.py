@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class KalmanObserverState:
+    # state estimate
+    x: float
+    x_dot: float
+
+    # covariance (P10 == P01)
+    p00: float
+    p01: float
+    p11: float
+
+    # time of the last pushed sample (None before the first push)
+    t_last: Optional[float]
+    initialized: bool
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass(frozen=True)
+class MultiChannelSeries:
+    t: np.ndarray               # seconds, shape (N,)
+    x: np.ndarray               # signals, shape (N, C), one column per channel
+    channels: tuple[str, ...]   # column names, len C
+    dt_s: float                 # median dt in seconds
+    source_path: str            # csv path for display
@@ -3,6 +3,7 @@ from .ipdt_params_model import IPDTParams
 from .sopdt_params import SOPDTUnderdampedParams
 from .step_spec_model import StepSpec
 from .accuator_params_model import ActuatorParams
+from .step_batch_result_model import StepBatchResult
 
 
 __all__ = [
@@ -11,4 +12,5 @@ __all__ = [
     "SOPDTUnderdampedParams",
     "StepSpec",
     "ActuatorParams",
+    "StepBatchResult",
 ]
\ No newline at end of file
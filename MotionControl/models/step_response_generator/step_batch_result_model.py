@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class StepBatchResult:
+    model: str
+    n_runs: int
+    t: np.ndarray
+
+    # per-run step metrics, shape (n_runs,); NaN where undefined
+    # (no net response, threshold never reached, not settled by the end)
+    final_value: np.ndarray
+    rise_time_s: np.ndarray
+    overshoot_pct: np.ndarray
+    settling_time_s: np.ndarray
+
+    # percentile levels and, per metric name, the NaN-ignoring percentiles
+    percentiles: np.ndarray
+    summary: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    # (n_runs, N) PV trajectories, only when requested
+    pv: Optional[np.ndarray] = None
+    settle_band: float = 0.02
@@ -1,2 +1,16 @@
 from .selections_model import StepTuneSelections
-from .step_id_result_model import StepIdResult
\ No newline at end of file
+from .step_id_result_model import StepIdResult
+from .auto_selection_policy_model import AutoSelectionPolicy
+from .step_batch_id_record_model import StepBatchIdRecord
+from .step_segment_model import StepSegment
+from .multi_step_report_model import MultiStepReport
+
+
+__all__ = [
+    "StepTuneSelections",
+    "StepIdResult",
+    "AutoSelectionPolicy",
+    "StepBatchIdRecord",
+    "StepSegment",
+    "MultiStepReport",
+]
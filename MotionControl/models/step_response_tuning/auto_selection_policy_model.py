@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class AutoSelectionPolicy:
+    # baseline window ending guard_s before the step; None: everything before it
+    baseline_s: Optional[float] = None
+    guard_s: float = 0.0
+    min_baseline_samples: int = 10
+
+    # auto_detect_deadtime_index detector: "threshold", "sustained" or "cusum"
+    deadtime_detector: str = "cusum"
+
+    # settled when the smoothed PV stays within settle_band * |dy| of the final
+    # value (or within the smoothed baseline noise, whichever is wider)
+    settle_band: float = 0.02
+    tail_fraction: float = 0.1   # share of the record used for the first final-value estimate
+    smooth_fraction: float = 0.01  # moving-average window as a share of the post-step samples
+    min_final_samples: int = 10
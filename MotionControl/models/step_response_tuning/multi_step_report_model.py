@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .step_id_result_model import StepIdResult
+from .step_segment_model import StepSegment
+
+
+@dataclass(frozen=True)
+class MultiStepReport:
+    model: str
+    method: str
+    segments: Tuple[StepSegment, ...]
+
+    # per segment: the identification result, or None and the error text
+    results: Tuple[Optional[StepIdResult], ...]
+    errors: Tuple[str, ...]
+
+    # per segment operating point (PV before the step) and parameter values,
+    # NaN where identification failed
+    operating_point: np.ndarray
+    params: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    # per parameter: mean, std, spread_pct (std / |mean|), min, max and
+    # slope (linear trend against the operating point)
+    drift: Dict[str, Dict[str, float]] = field(default_factory=dict)
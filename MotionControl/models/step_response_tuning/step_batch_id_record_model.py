@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class StepBatchIdRecord:
+    path: str
+    model: str
+    method: str
+
+    # "" when the file was identified; otherwise the error, and the result
+    # fields below keep their defaults
+    error: str = ""
+
+    n_samples: int = 0
+    dt_s: float = float("nan")
+    t_step_s: float = float("nan")
+    theta_s: float = float("nan")
+    du: float = float("nan")
+    dy: float = float("nan")
+    params: Dict[str, float] = field(default_factory=dict)
+    rmse: float = float("nan")
+    n_fit: int = 0
+    n_iter: int = 0
+
+    # wall time per stage (seconds)
+    load_s: float = float("nan")
+    identify_s: float = float("nan")
+    total_s: float = float("nan")
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
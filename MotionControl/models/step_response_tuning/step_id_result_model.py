@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 
 @dataclass
@@ -27,6 +27,16 @@ class StepIdResult:
     rmse: float = float("nan")
     n_fit: int = 0
 
+    # "heuristic" (span/point estimates) or "least_squares" (LM refinement)
+    method: str = "heuristic"
+    n_iter: int = 0
+
+    # bootstrap percentile intervals {name: (lo, hi)} at ci_level, from
+    # n_boot refits (empty until bootstrap_intervals is run)
+    intervals: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    ci_level: float = float("nan")
+    n_boot: int = 0
+
     note: str = ""
 
     def get(self, key: str, default: Optional[float] = None) -> Optional[float]:
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class StepSegment:
+    # sample range [a, b) of the full record holding exactly one CV edge
+    a: int
+    b: int
+
+    # first sample at the new CV level, and the CV change across the edge
+    step_i: int
+    du: float
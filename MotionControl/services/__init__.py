@@ -1,32 +1,73 @@
-from .csv_service import load_csv
+from .csv_service import load_csv, load_csv_channels
 from .export_service import export_spans_json
-from .kalman_service import run_procedural_kalman
-from .tuning_service import compute_tuning
-from .signal_generator_service import generate_signal_csv
+from .kalman_service import (
+    run_procedural_kalman,
+    run_kalman_batch,
+    run_kalman_batch_likelihood,
+    KalmanObserver,
+    run_rts_smoother,
+    run_kalman_diagnostics,
+    run_kalman_channels,
+    plc_dt_seconds,
+)
+from .tuning_service import compute_tuning, autotune_kalman
+from .signal_generator_service import (
+    generate_signal_csv,
+    generate_signal_series,
+    iter_signal_blocks,
+    write_signal_csv,
+    write_signal_npy,
+    feed_signal,
+)
 from .step_response_generator_service import (
     simulate_step_response,
     export_step_csv,
 )
+from .step_batch_service import simulate_step_batch
 from .step_identification_service import (
     load_step_csv,
     auto_detect_step_index,
     auto_detect_deadtime_index,
+    auto_select_spans,
     identify,
+    bootstrap_intervals,
     StepSeries,
 )
+from .step_identification_batch_service import identify_batch
+from .step_segmentation_service import segment_steps, identify_segments
 
 
 __all__ = [
     "load_csv",
+    "load_csv_channels",
     "export_spans_json",
     "run_procedural_kalman",
+    "run_kalman_batch",
+    "run_kalman_batch_likelihood",
+    "KalmanObserver",
+    "run_rts_smoother",
+    "run_kalman_diagnostics",
+    "run_kalman_channels",
+    "plc_dt_seconds",
     "compute_tuning",
+    "autotune_kalman",
     "generate_signal_csv",
+    "generate_signal_series",
+    "iter_signal_blocks",
+    "write_signal_csv",
+    "write_signal_npy",
+    "feed_signal",
     "simulate_step_response",
     "export_step_csv",
+    "simulate_step_batch",
     "load_step_csv",
     "auto_detect_step_index",
     "auto_detect_deadtime_index",
+    "auto_select_spans",
     "identify",
+    "bootstrap_intervals",
     "StepSeries",
+    "identify_batch",
+    "segment_steps",
+    "identify_segments",
 ]
@@ -1,13 +1,28 @@
 from __future__ import annotations
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
-from models.kalman import TimeSeriesData
-from .helpers import median_dt_seconds
+from models.kalman import TimeSeriesData, MultiChannelSeries
+from .helpers import (
+    median_dt_seconds,
+    stream_csv_columns,
+    csv_header,
+    ProgressCallback,
+    read_column_cache,
+    write_column_cache,
+)
 
 
-def load_csv(path: str, *, time_unit: str = "s") -> TimeSeriesData:
+def load_csv(
+    path: str,
+    *,
+    time_unit: str = "s",
+    progress: Optional[ProgressCallback] = None,
+    use_cache: bool = True,
+) -> TimeSeriesData:
     """
     Load CSV with headers: time, x
 
@@ -15,23 +30,109 @@ def load_csv(path: str, *, time_unit: str = "s") -> TimeSeriesData:
       - "s"  : time column is seconds
       - "ms" : time column is milliseconds
 
+    The file is streamed in chunks (non-finite rows dropped per chunk, median
+    dt accumulated on the fly), so peak memory stays near the size of the
+    returned arrays. progress(bytes_read, bytes_total) is called per chunk.
+
+    use_cache: the parsed columns are saved as .npy files in a sidecar
+    directory (<path>.mccache/) with a JSON header holding dt_s and the
+    source's size, mtime and sampled hash. A later load of an unchanged file
+    memory-maps those arrays (read-only) instead of reparsing the text.
+
     Returns a TimeSeriesData with time in seconds.
     """
-    df = pd.read_csv(path)
+    if time_unit not in ("s", "ms"):
+        raise ValueError("time_unit must be 's' or 'ms'")
+
+    cache_tag = f"timeseries_{time_unit}"
+    if use_cache:
+        cached = read_column_cache(path, cache_tag)
+        if cached is not None:
+            arrays, meta = cached
+            return TimeSeriesData(t=arrays["t"], x=arrays["x"], dt_s=float(meta["dt_s"]), source_path=path)
 
-    if "time" not in df.columns or "x" not in df.columns:
+    header = csv_header(path)
+    if "time" not in header or "x" not in header:
         raise ValueError("CSV must contain headers: time, x")
 
-    t = df["time"].to_numpy(dtype=float)
-    x = df["x"].to_numpy(dtype=float)
+    cols, dt_sketch = stream_csv_columns(
+        path,
+        ["time", "x"],
+        finite=["time", "x"],
+        time_divisor=1000.0 if time_unit == "ms" else None,
+        progress=progress,
+    )
+    t = cols["time"]
+    x = cols["x"]
+
+    if t.size < 10:
+        raise ValueError("Not enough valid samples after filtering NaNs/Infs")
+
+    dt_s = dt_sketch.median()
+    if not np.isfinite(dt_s) or dt_s <= 0:
+        raise ValueError("Could not determine a positive dt from time column")
+
+    if use_cache:
+        write_column_cache(path, cache_tag, {"t": t, "x": x}, {"dt_s": float(dt_s)})
+
+    return TimeSeriesData(t=t, x=x, dt_s=float(dt_s), source_path=path)
+
+
+def load_csv_channels(
+    path: str,
+    *,
+    time_unit: str = "s",
+    time_column: str = "time",
+) -> MultiChannelSeries:
+    """
+    Load a wide CSV: one time column plus any number of numeric channels
+    (e.g. a historian export with one column per position tag).
+
+    Every numeric column other than time_column becomes a channel; the values
+    land in one (N, C) float64 block (a single copy out of the DataFrame, not
+    one array per column).
+
+    Rows with a non-finite time are dropped. A missing sample inside a channel
+    holds that channel's previous value (leading gaps take the first valid
+    value), so every channel stays on the shared time base.
+
+    Returns a MultiChannelSeries with time in seconds.
+    """
+    df = pd.read_csv(path)
+
+    if time_column not in df.columns:
+        raise ValueError(f"CSV must contain a '{time_column}' column")
+
+    values = df.drop(columns=[time_column]).select_dtypes(include="number")
+    if values.shape[1] == 0:
+        raise ValueError("CSV has no numeric channel columns")
 
-    ok = np.isfinite(t) & np.isfinite(x)
-    t = t[ok]
-    x = x[ok]
+    t = pd.to_numeric(df[time_column], errors="coerce").to_numpy(dtype=float)
+    x = values.to_numpy(dtype=float)
+    channels = tuple(str(c) for c in values.columns)
+    del df, values
+
+    ok = np.isfinite(t)
+    if not ok.all():
+        t = t[ok]
+        x = x[ok]
 
     if t.size < 10:
         raise ValueError("Not enough valid samples after filtering NaNs/Infs")
 
+    finite = np.isfinite(x)
+    if not finite.all():
+        empty = ~finite.any(axis=0)
+        if empty.any():
+            names = ", ".join(c for c, e in zip(channels, empty) if e)
+            raise ValueError(f"Channels with no finite samples: {names}")
+        # index of the last finite sample per channel (sample-and-hold)
+        rows = np.where(finite, np.arange(len(t))[:, None], -1)
+        np.maximum.accumulate(rows, axis=0, out=rows)
+        first = np.argmax(finite, axis=0)
+        rows = np.where(rows < 0, first[None, :], rows)
+        x = np.take_along_axis(x, rows, axis=0)
+
     if time_unit == "ms":
         t = t / 1000.0
     elif time_unit != "s":
@@ -41,4 +142,4 @@ def load_csv(path: str, *, time_unit: str = "s") -> TimeSeriesData:
     if not np.isfinite(dt_s) or dt_s <= 0:
         raise ValueError("Could not determine a positive dt from time column")
 
-    return TimeSeriesData(t=t, x=x, dt_s=float(dt_s), source_path=path)
+    return MultiChannelSeries(t=t, x=x, channels=channels, dt_s=float(dt_s), source_path=path)
@@ -4,6 +4,36 @@ from .math_helpers import (
     qx_dot_from_ramp_span_excel_like,
     median_dt_seconds,
 )
+from .iir_helpers import (
+    state_space_filter,
+    matrix_powers,
+    expm,
+    zoh_discretize,
+    batch_state_space_filter,
+)
+from .cache_helpers import LruCache
+from .lod_helpers import MinMaxPyramid
+from .csv_stream_helpers import (
+    stream_csv_columns,
+    csv_header,
+    MedianSketch,
+    GrowableColumn,
+    ProgressCallback,
+)
+from .rate_limit_helpers import rate_limit
+from .least_squares_helpers import (
+    levenberg_marquardt,
+    levenberg_marquardt_batch,
+    ResidualFunction,
+    BatchResidualFunction,
+)
+from .delay_line_helpers import DelayLine, DelayInterpolation, delay_signal
+from .csv_write_helpers import format_fixed_rows, write_csv_columns, write_csv_blocks
+from .column_cache_helpers import (
+    read_column_cache,
+    write_column_cache,
+    cache_dir_for,
+)
 
 
 __all__ = [
@@ -11,4 +41,30 @@ __all__ = [
     "rx_from_steady_span",
     "qx_dot_from_ramp_span_excel_like",
     "median_dt_seconds",
+    "state_space_filter",
+    "matrix_powers",
+    "expm",
+    "zoh_discretize",
+    "batch_state_space_filter",
+    "LruCache",
+    "MinMaxPyramid",
+    "stream_csv_columns",
+    "csv_header",
+    "MedianSketch",
+    "GrowableColumn",
+    "ProgressCallback",
+    "rate_limit",
+    "levenberg_marquardt",
+    "levenberg_marquardt_batch",
+    "ResidualFunction",
+    "BatchResidualFunction",
+    "DelayLine",
+    "DelayInterpolation",
+    "delay_signal",
+    "format_fixed_rows",
+    "write_csv_columns",
+    "write_csv_blocks",
+    "read_column_cache",
+    "write_column_cache",
+    "cache_dir_for",
 ]
\ No newline at end of file
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+from typing import Any, Optional
+
+import numpy as np
+
+_CACHE_VERSION = 1
+_HASH_BLOCK = 1 << 16
+
+
+def cache_dir_for(source: str) -> str:
+    """Sidecar directory next to the source file: <source>.mccache/"""
+    return f"{source}.mccache"
+
+
+def _sampled_hash(source: str, size: int) -> str:
+    # blocks at the start, middle and end of the file: catches edits that keep
+    # size and mtime without reading the whole file
+    h = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(source, "rb") as fh:
+        for offset in sorted({0, max(size // 2 - _HASH_BLOCK // 2, 0), max(size - _HASH_BLOCK, 0)}):
+            fh.seek(offset)
+            h.update(fh.read(_HASH_BLOCK))
+    return h.hexdigest()
+
+
+def _source_stamp(source: str) -> dict[str, Any]:
+    st = os.stat(source)
+    return {
+        "source_size": int(st.st_size),
+        "source_mtime_ns": int(st.st_mtime_ns),
+        "source_hash": _sampled_hash(source, int(st.st_size)),
+    }
+
+
+def read_column_cache(
+    source: str,
+    tag: str,
+) -> Optional[tuple[dict[str, np.ndarray], dict[str, Any]]]:
+    """
+    Columns cached for `source` under `tag`, memory-mapped read-only, plus
+    the header's extra fields. None if there is no cache or it is stale
+    (source size, mtime or sampled hash changed) or unreadable.
+    """
+    folder = cache_dir_for(source)
+    header_path = os.path.join(folder, f"{tag}.json")
+    try:
+        with open(header_path, "r", encoding="utf-8") as f:
+            header = json.load(f)
+        st = os.stat(source)
+        if (
+            header.get("version") != _CACHE_VERSION
+            or header.get("source_size") != st.st_size
+            or header.get("source_mtime_ns") != st.st_mtime_ns
+            or header.get("source_hash") != _sampled_hash(source, int(st.st_size))
+        ):
+            return None
+        arrays = {
+            name: np.load(os.path.join(folder, f"{tag}.{name}.npy"), mmap_mode="r")
+            for name in header["columns"]
+        }
+    except (OSError, ValueError, KeyError):
+        return None
+
+    if len({len(a) for a in arrays.values()}) > 1:
+        return None
+    return arrays, header.get("meta", {})
+
+
+def write_column_cache(
+    source: str,
+    tag: str,
+    arrays: dict[str, np.ndarray],
+    meta: Optional[dict[str, Any]] = None,
+) -> bool:
+    """
+    Write `arrays` as <tag>.<name>.npy plus a <tag>.json header into the
+    sidecar directory. Every file is written to a temp name and renamed into
+    place, header last, so a reader never sees a partial cache. Returns False
+    (and leaves the source untouched) if the cache cannot be written, e.g. on
+    a read-only share.
+    """
+    folder = cache_dir_for(source)
+    try:
+        stamp = _source_stamp(source)
+        os.makedirs(folder, exist_ok=True)
+        for name, values in arrays.items():
+            _atomic_write(folder, f"{tag}.{name}.npy", lambda f, v=values: np.save(f, np.asarray(v)))
+
+        header = {
+            "version": _CACHE_VERSION,
+            **stamp,
+            "columns": list(arrays),
+            "meta": meta or {},
+        }
+        text = json.dumps(header, indent=2)
+        _atomic_write(folder, f"{tag}.json", lambda f: f.write(text.encode("utf-8")))
+    except OSError:
+        return False
+    return True
+
+
+def _atomic_write(folder: str, name: str, write) -> None:
+    # Created with os.open(..., 0o666) rather than mkstemp, whose files are
+    # 0600: the kernel applies the umask, so caches of logs in a shared folder
+    # stay readable by whoever can read a plainly created file there.
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp = os.path.join(folder, f".{name}.{uuid.uuid4().hex}")
+        try:
+            fd = os.open(tmp, flags, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, os.path.join(folder, name))
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import os
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+# progress(bytes_read, bytes_total)
+ProgressCallback = Callable[[int, int], None]
+
+
+class GrowableColumn:
+    """
+    Preallocated float64 buffer that grows geometrically as chunks arrive.
+    finish() trims it in place (realloc), so no second full-size copy is made.
+    """
+
+    def __init__(self, capacity: int = 1 << 16):
+        self._buf = np.empty(max(int(capacity), 16), dtype=float)
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def reserve(self, capacity: int) -> None:
+        if capacity > len(self._buf):
+            self._buf.resize(int(capacity), refcheck=False)
+
+    def append(self, values: np.ndarray) -> None:
+        m = len(values)
+        need = self._n + m
+        if need > len(self._buf):
+            self.reserve(max(need, int(len(self._buf) * 1.5)))
+        self._buf[self._n:need] = values
+        self._n = need
+
+    def finish(self) -> np.ndarray:
+        self._buf.resize(self._n, refcheck=False)
+        return self._buf
+
+
+class MedianSketch:
+    """
+    Streaming median of positive, finite values (used for dt).
+
+    Values are kept as sorted (distinct value, count) pairs: exact, and tiny
+    for sampled logs where dt takes few distinct values. A jittered timebase
+    stays exact up to max_bins distinct values (16 bytes each). Past that,
+    neighbouring bins are merged by cumulative count (count-weighted mean),
+    so no merged bin holds more than 8 / max_bins of the values seen so far,
+    and the median is off by at most that fraction of ranks. `exact` tells
+    which case applies.
+    """
+
+    def __init__(self, max_bins: int = 1 << 20):
+        self.max_bins = max(int(max_bins), 16)
+        self._values = np.empty(0, dtype=float)
+        self._counts = np.empty(0, dtype=np.int64)
+        self.exact = True
+
+    @property
+    def count(self) -> int:
+        return int(self._counts.sum())
+
+    def add(self, values: np.ndarray) -> None:
+        values = values[np.isfinite(values) & (values > 0)]
+        if values.size == 0:
+            return
+        v, c = np.unique(values, return_counts=True)
+
+        # merge into the sorted bins: O(bins + chunk), no re-sort of the bins
+        pos = np.searchsorted(self._values, v)
+        hit = pos < len(self._values)
+        hit[hit] = self._values[pos[hit]] == v[hit]
+        np.add.at(self._counts, pos[hit], c[hit])
+        new = ~hit
+        if new.any():
+            self._values = np.insert(self._values, pos[new], v[new])
+            self._counts = np.insert(self._counts, pos[new], c[new])
+        if len(self._values) > self.max_bins:
+            self._compress()
+
+    def _compress(self) -> None:
+        # Groups of neighbouring bins whose starting ranks fall in the same
+        # 1 / g slice of the total count; a bin holding >= 1 / g on its own
+        # stays alone. A merged group thus holds < 2 / g of the count (8 /
+        # max_bins with g = max_bins / 4) and there are at most 3 g groups.
+        g = self.max_bins // 4
+        counts = self._counts
+        n = int(counts.sum())
+        start = np.cumsum(counts) - counts
+        heavy = counts * g >= n
+        brk = np.empty(len(counts), dtype=bool)
+        brk[0] = True
+        brk[1:] = (
+            (start[1:] * g // n != start[:-1] * g // n)
+            | heavy[1:]
+            | heavy[:-1]
+        )
+        groups = np.cumsum(brk) - 1
+        w = np.bincount(groups, weights=counts)
+        self._values = np.bincount(groups, weights=self._values * counts) / w
+        self._counts = np.add.reduceat(counts, np.flatnonzero(brk))
+        self.exact = False
+
+    def median(self) -> float:
+        """Median as np.median would return it (exact while self.exact)."""
+        n = self.count
+        if n == 0:
+            return float("nan")
+        cum = np.cumsum(self._counts)
+        lo = self._values[np.searchsorted(cum, (n - 1) // 2, side="right")]
+        hi = self._values[np.searchsorted(cum, n // 2, side="right")]
+        return float((lo + hi) / 2.0)
+
+
+def stream_csv_columns(
+    path: str,
+    columns: Sequence[str],
+    *,
+    finite: Sequence[str],
+    time_column: str = "time",
+    time_divisor: Optional[float] = None,
+    chunk_rows: int = 1 << 18,
+    progress: Optional[ProgressCallback] = None,
+) -> tuple[dict[str, np.ndarray], MedianSketch]:
+    """
+    Read the named columns of a CSV in fixed-size chunks.
+
+    Per chunk: rows where any of the `finite` columns is NaN/Inf are dropped,
+    the time column is divided by time_divisor (if given), and the survivors
+    are appended to growable float64 buffers. dt (diffs of the kept time
+    values, including across chunk boundaries) feeds a MedianSketch, so the
+    median dt is known without keeping a dt array.
+
+    Returns (arrays by column name, dt sketch). Peak memory is the final
+    arrays plus one chunk.
+    """
+    import pandas as pd
+
+    total = os.path.getsize(path)
+    bufs = {c: GrowableColumn() for c in columns}
+    sketch = MedianSketch()
+    t_last: Optional[float] = None
+    reserved = False
+
+    with open(path, "rb") as fh:
+        reader = pd.read_csv(fh, usecols=list(columns), chunksize=int(chunk_rows))
+        for chunk in reader:
+            cols = {c: chunk[c].to_numpy(dtype=float) for c in columns}
+            if time_divisor is not None:
+                cols[time_column] = cols[time_column] / time_divisor
+
+            ok = np.ones(len(chunk), dtype=bool)
+            for c in finite:
+                ok &= np.isfinite(cols[c])
+            if not ok.all():
+                cols = {c: v[ok] for c, v in cols.items()}
+
+            t = cols[time_column]
+            if t.size:
+                if t_last is not None:
+                    sketch.add(np.array([t[0] - t_last]))
+                sketch.add(np.diff(t))
+                t_last = float(t[-1])
+
+            if not reserved and len(chunk):
+                # size the buffers once from the bytes-per-row of the first chunk
+                reserved = True
+                pos = fh.tell()
+                if 0 < pos < total:
+                    est = int(total / pos * len(chunk) * 1.05) + 1
+                    for b in bufs.values():
+                        b.reserve(est)
+
+            for c, b in bufs.items():
+                b.append(cols[c])
+
+            if progress is not None:
+                progress(min(fh.tell(), total), total)
+
+    if progress is not None:
+        progress(total, total)
+    return {c: b.finish() for c, b in bufs.items()}, sketch
+
+
+def csv_header(path: str) -> list[str]:
+    import pandas as pd
+
+    return [str(c) for c in pd.read_csv(path, nrows=0).columns]
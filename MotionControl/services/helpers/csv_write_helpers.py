@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Iterable, Sequence
+
+import numpy as np
+
+# integer parts beyond this lose digits as float64 anyway: format them in Python
+_FAST_LIMIT = 2.0**53
+
+
+def format_fixed_rows(columns: Sequence[np.ndarray], decimals: int = 6) -> bytes:
+    """
+    CSV rows ("a,b,...\\n") of equal-length float columns, each value written
+    like f"{v:.{decimals}f}".
+
+    Integer and fraction parts are converted to int64 and their digits laid
+    out in a (rows, width) byte matrix with NumPy, so no per-value Python
+    formatting runs. The output is byte-identical to the f-string: the few
+    values whose scaled fraction lies within rounding error of a decimal tie
+    (where NumPy's rounding could differ from the correctly rounded one) are
+    split with Python formatting instead, as are whole columns with
+    non-finite or huge values.
+    """
+    cols = [np.asarray(c, dtype=float) for c in columns]
+    n = len(cols[0]) if cols else 0
+    if n == 0:
+        return b""
+
+    fields = [_fixed_field(c, decimals) for c in cols]
+    seps = np.full((n, 1), ord(","), dtype=np.uint8)
+    parts: list[np.ndarray] = []
+    for i, f in enumerate(fields):
+        parts.append(f)
+        parts.append(seps if i < len(fields) - 1 else np.full((n, 1), ord("\n"), dtype=np.uint8))
+    rows = np.hstack(parts)
+    # 0 bytes are left padding inside a field: drop them row-major
+    return rows[rows != 0].tobytes()
+
+
+def _fixed_field(v: np.ndarray, decimals: int) -> np.ndarray:
+    scale = 10.0**decimals
+    if not np.all(np.isfinite(v)) or np.max(np.abs(v)) >= _FAST_LIMIT:
+        text = [f"{x:.{decimals}f}".encode("ascii") for x in v]
+        width = max(len(s) for s in text)
+        out = np.zeros((len(v), width), dtype=np.uint8)
+        for i, s in enumerate(text):
+            out[i, width - len(s):] = np.frombuffer(s, dtype=np.uint8)
+        return out
+
+    n = len(v)
+    a = np.abs(v)
+    neg = np.signbit(v)  # like %f, -0.0 and tiny negatives print as "-0.000"
+
+    # split before scaling: |v| - floor(|v|) is exact, so only the fraction is
+    # rounded and large values keep all of their decimals
+    int_part = np.floor(a)
+    scaled = (a - int_part) * scale
+    frac = np.rint(scaled).astype(np.int64)
+    int_part = int_part.astype(np.int64)
+    carry = frac >= int(scale)
+    int_part[carry] += 1
+    frac[carry] -= int(scale)
+
+    # `scaled` is off the exact product by at most half an ulp (< scale *
+    # 2**-53); only a value that close to .5 can round the other way
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) <= scale * 2.0**-45
+    for i in np.flatnonzero(near_tie):
+        ip, _, fp = f"{a[i]:.{decimals}f}".partition(".")
+        int_part[i] = int(ip)
+        frac[i] = int(fp) if fp else 0
+
+    n_int = max(len(str(int(int_part.max()))), 1)
+    # one leading column for the sign
+    width = 1 + n_int + (1 + decimals if decimals else 0)
+    out = np.empty((n, width), dtype=np.uint8)
+
+    # digits right to left, one column per pass
+    m = frac.copy()
+    for col in range(width - 1, width - 1 - decimals, -1):
+        out[:, col] = m % 10 + ord("0")
+        m //= 10
+    if decimals:
+        out[:, 1 + n_int] = ord(".")
+
+    # integer part: positions left of the first significant digit stay 0
+    # (padding) and the sign goes right before that digit
+    m = int_part.copy()
+    out[:, 0] = 0
+    sign_col = np.full(n, n_int - 1, dtype=np.int64)
+    for col in range(n_int, 0, -1):
+        digit = (m % 10 + ord("0")).astype(np.uint8)
+        if col < n_int:
+            blank = m == 0
+            digit[blank] = 0
+            sign_col[~blank] = col - 1
+        out[:, col] = digit
+        m //= 10
+    rows = np.flatnonzero(neg)
+    out[rows, sign_col[rows]] = ord("-")
+    return out
+
+
+def write_csv_columns(
+    fh: BinaryIO,
+    header: Sequence[str],
+    columns: Sequence[np.ndarray],
+    *,
+    decimals: int = 6,
+    chunk_rows: int = 1 << 18,
+    workers: int = 4,
+) -> None:
+    """
+    Write a header line and the columns as fixed-point CSV to a binary file,
+    chunk_rows rows at a time (see write_csv_blocks).
+    """
+    n = len(columns[0]) if columns else 0
+    step = int(chunk_rows)
+    blocks = ([c[i0:i0 + step] for c in columns] for i0 in range(0, n, step))
+    write_csv_blocks(fh, header, blocks, decimals=decimals, workers=workers)
+
+
+def write_csv_blocks(
+    fh: BinaryIO,
+    header: Sequence[str],
+    blocks: Iterable[Sequence[np.ndarray]],
+    *,
+    decimals: int = 6,
+    workers: int = 4,
+) -> None:
+    """
+    Write a header line, then each block of equal-length columns as
+    fixed-point CSV rows. blocks may be a generator: it is consumed lazily,
+    so memory stays bounded however long the output is.
+
+    Blocks are formatted on `workers` threads (the NumPy work releases the
+    GIL) and written in order.
+    """
+    fh.write((",".join(header) + "\n").encode("ascii"))
+
+    if workers <= 1:
+        for cols in blocks:
+            fh.write(format_fixed_rows(cols, decimals))
+        return
+
+    with ThreadPoolExecutor(max_workers=int(workers)) as pool:
+        # bounded look-ahead: at most 2 * workers formatted blocks in memory
+        pending = []
+        for cols in blocks:
+            pending.append(pool.submit(format_fixed_rows, cols, decimals))
+            if len(pending) >= 2 * workers:
+                fh.write(pending.pop(0).result())
+        for fut in pending:
+            fh.write(fut.result())
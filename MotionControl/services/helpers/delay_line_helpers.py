@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import Literal, Optional, Union
+
+import numpy as np
+
+from .iir_helpers import state_space_filter
+
+DelayInterpolation = Literal["linear", "thiran"]
+
+# delays this close to a whole number of samples are taken as exact
+_INTEGER_TOL = 1e-9
+
+
+class DelayLine:
+    """
+    Streaming transport delay: y[k] = u(k - D[k]) with D in samples, read
+    from a ring buffer that holds the last max_delay samples.
+
+    process() takes one chunk at a time and keeps its state, so chained
+    chunked simulations give the same result as one whole-array call. Reads
+    before the first sample return the first sample (the line starts "full"
+    of the initial value, like the old shifted-array deadtime).
+
+    interpolation:
+      - "linear": fractional delays blend the two neighbouring samples. Works
+        with a per-sample delay array (time-varying transport delay).
+      - "thiran": integer delay plus a first-order Thiran allpass for the
+        fraction (flat magnitude, no low-pass smearing). The delay must be
+        constant within a chunk.
+    """
+
+    def __init__(
+        self,
+        max_delay: float,
+        *,
+        interpolation: DelayInterpolation = "linear",
+    ):
+        if interpolation not in ("linear", "thiran"):
+            raise ValueError("interpolation must be 'linear' or 'thiran'")
+        if not np.isfinite(max_delay) or max_delay < 0:
+            raise ValueError("max_delay must be a finite number of samples >= 0")
+        self.max_delay = float(max_delay)
+        self.interpolation = interpolation
+        # +2: the interpolation partner and the Thiran sample before it
+        self._history = int(np.ceil(self.max_delay)) + 2
+        self._ring = np.zeros(_pow2(self._history + 1), dtype=float)
+        self._count = 0
+        # None: start the allpass at rest for the next input value
+        self._allpass_state: Optional[float] = None
+
+    def reset(self) -> None:
+        self._count = 0
+        self._allpass_state = None
+
+    def process(self, u: np.ndarray, delay: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Delay one chunk. delay is in samples: a scalar, or one value per
+        sample of the chunk ("linear" only).
+        """
+        u = np.asarray(u, dtype=float)
+        L = len(u)
+        if L == 0:
+            return np.empty(0, dtype=float)
+
+        d = np.asarray(delay, dtype=float)
+        if d.ndim not in (0, 1) or (d.ndim == 1 and len(d) != L):
+            raise ValueError("delay must be a scalar or one value per sample")
+        if not np.all(np.isfinite(d)) or np.any(d < 0) or np.any(d > self.max_delay + _INTEGER_TOL):
+            raise ValueError(f"delay must be within [0, {self.max_delay}] samples")
+        if d.ndim == 1 and self.interpolation == "thiran":
+            raise ValueError("thiran interpolation needs a constant delay per chunk; use 'linear'")
+
+        self._write(u)
+        g = self._count + np.arange(L)
+        self._count += L
+
+        if self.interpolation == "thiran":
+            return self._thiran(g, float(d))
+
+        d_round = np.rint(d)
+        d = np.where(np.abs(d - d_round) < _INTEGER_TOL, d_round, d)
+        p = np.maximum(g - d, 0.0)
+        i0 = np.floor(p).astype(np.int64)
+        f = p - i0
+        i1 = np.minimum(i0 + 1, g)
+        return (1.0 - f) * self._read(i0) + f * self._read(i1)
+
+    # ---- internals ----
+    def _write(self, u: np.ndarray) -> None:
+        L = len(u)
+        if self._history + L > len(self._ring):
+            self._grow(self._history + L)
+        cap = len(self._ring)
+        start = self._count % cap
+        first = min(L, cap - start)
+        self._ring[start:start + first] = u[:first]
+        self._ring[:L - first] = u[first:]
+
+    def _grow(self, need: int) -> None:
+        old = self._ring
+        cap = _pow2(need)
+        ring = np.zeros(cap, dtype=float)
+        # re-place the retained history at its new ring positions
+        keep = min(self._count, len(old))
+        if keep:
+            g = np.arange(self._count - keep, self._count)
+            ring[g % cap] = old[g % len(old)]
+        self._ring = ring
+
+    def _read(self, g: np.ndarray) -> np.ndarray:
+        return self._ring[g % len(self._ring)]
+
+    def _thiran(self, g: np.ndarray, d: float) -> np.ndarray:
+        n = int(np.rint(d))
+        if abs(d - n) < _INTEGER_TOL:
+            self._allpass_state = None
+            return self._read(np.maximum(g - n, 0))
+
+        # integer part n, fraction frac in [0.5, 1.5) where the first-order
+        # allpass is most accurate (frac < 0.5 only for d < 0.5)
+        n = max(int(np.floor(d - 0.5)), 0)
+        frac = d - n
+        a = (1.0 - frac) / (1.0 + frac)
+
+        v = self._read(np.maximum(g - n, 0))
+        if self._allpass_state is None:
+            # steady state for a constant input v[0] (no start-up transient)
+            self._allpass_state = (1.0 - a) * float(v[0])
+        # transposed direct form: y[k] = a v[k] + q[k-1],
+        # q[k] = -a q[k-1] + (1 - a^2) v[k]
+        q = state_space_filter(np.array([[-a]]), np.array([1.0 - a * a]), v, np.array([self._allpass_state]))[:, 0]
+        y = a * v
+        y[0] += self._allpass_state
+        y[1:] += q[:-1]
+        self._allpass_state = float(q[-1])
+        return y
+
+
+def _pow2(n: int) -> int:
+    cap = 1
+    while cap < n:
+        cap *= 2
+    return cap
+
+
+def delay_signal(
+    u: np.ndarray,
+    delay: Union[float, np.ndarray],
+    *,
+    max_delay: Optional[float] = None,
+    interpolation: DelayInterpolation = "linear",
+) -> np.ndarray:
+    """One-shot DelayLine over a whole array (delay in samples)."""
+    d = np.asarray(delay, dtype=float)
+    line = DelayLine(float(np.max(d)) if max_delay is None else max_delay, interpolation=interpolation)
+    return line.process(u, d)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+import numpy as np
+
+# fun(p) -> (residuals (N,), Jacobian d residuals / d p (N, n_params))
+ResidualFunction = Callable[[np.ndarray], tuple[np.ndarray, np.ndarray]]
+
+
+def levenberg_marquardt(
+    fun: ResidualFunction,
+    p0: np.ndarray,
+    *,
+    lower: Optional[np.ndarray] = None,
+    upper: Optional[np.ndarray] = None,
+    max_iter: int = 50,
+    ftol: float = 1e-10,
+    xtol: float = 1e-10,
+) -> tuple[np.ndarray, float, int, bool]:
+    """
+    Minimize 0.5 * ||r(p)||^2 with Levenberg-Marquardt.
+
+    Steps solve (J'J + lam * diag(J'J)) dp = -J'r (Marquardt scaling, so
+    parameters of very different magnitude are handled alike) and are
+    clipped into [lower, upper]. lam shrinks after an accepted step and
+    grows after a rejected one. Only the small normal-equation matrix is
+    formed, so the cost per iteration is one residual/Jacobian evaluation.
+
+    Returns (p, cost, iterations, converged).
+    """
+    p = np.asarray(p0, dtype=float).copy()
+    n = len(p)
+    lo = np.full(n, -np.inf) if lower is None else np.asarray(lower, dtype=float)
+    hi = np.full(n, np.inf) if upper is None else np.asarray(upper, dtype=float)
+    p = np.clip(p, lo, hi)
+
+    r, J = fun(p)
+    cost = 0.5 * float(r @ r)
+    lam = 1e-3
+    it = 0
+    while it < max_iter:
+        it += 1
+        A = J.T @ J
+        g = J.T @ r
+        scale = np.maximum(np.diag(A), 1e-30)
+
+        while True:
+            try:
+                dp = np.linalg.solve(A + lam * np.diag(scale), -g)
+            except np.linalg.LinAlgError:
+                dp = np.zeros(n)
+            p_new = np.clip(p + dp, lo, hi)
+            step = p_new - p
+            r_new, J_new = fun(p_new)
+            cost_new = 0.5 * float(r_new @ r_new)
+
+            if np.isfinite(cost_new) and cost_new <= cost:
+                break
+            lam *= 4.0
+            if lam > 1e12 or not np.any(step):
+                return p, cost, it, False
+
+        drop = cost - cost_new
+        p, r, J, cost = p_new, r_new, J_new, cost_new
+        lam = max(lam / 3.0, 1e-12)
+
+        if drop <= ftol * max(cost, 1e-300) or np.all(np.abs(step) <= xtol * (np.abs(p) + xtol)):
+            return p, cost, it, True
+    return p, cost, it, False
+
+
+# fun(P, rows) -> (residuals (k, N), Jacobians (k, N, n_params)) for the
+# parameter rows P (k, n_params) of problems `rows` (k,)
+BatchResidualFunction = Callable[[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]]
+
+
+def levenberg_marquardt_batch(
+    fun: BatchResidualFunction,
+    p0: np.ndarray,
+    *,
+    lower: Optional[np.ndarray] = None,
+    upper: Optional[np.ndarray] = None,
+    max_iter: int = 50,
+    ftol: float = 1e-10,
+    xtol: float = 1e-10,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    levenberg_marquardt for R independent problems at once, p0 (R, n).
+
+    Every iteration evaluates `fun` once for all problems still running and
+    solves their normal equations as one stacked solve. Each problem keeps
+    its own lam: a rejected step raises it and is retried on the next
+    iteration (so iterations count attempts, not accepted steps). A problem
+    whose next step would already be within xtol stops without evaluating
+    it.
+
+    Returns (p (R, n), cost (R,), iterations (R,), converged (R,)).
+    """
+    p = np.array(p0, dtype=float, ndmin=2)
+    R, n = p.shape
+    lo = np.full(n, -np.inf) if lower is None else np.asarray(lower, dtype=float)
+    hi = np.full(n, np.inf) if upper is None else np.asarray(upper, dtype=float)
+    p = np.clip(p, lo, hi)
+
+    rows = np.arange(R)
+    r, J = fun(p, rows)
+    cost = 0.5 * np.einsum("rk,rk->r", r, r)
+    A, g = _normal_equations(J, r)
+    del r, J
+
+    lam = np.full(R, 1e-3)
+    iters = np.zeros(R, dtype=np.int64)
+    active = np.ones(R, dtype=bool)
+    converged = np.zeros(R, dtype=bool)
+    eye = np.eye(n)
+
+    for _ in range(int(max_iter)):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        iters[idx] += 1
+
+        Ai = A[idx]
+        scale = np.maximum(np.einsum("rii->ri", Ai), 1e-30)
+        M = Ai + (lam[idx, None] * scale)[:, :, None] * eye
+        dp = _solve_rows(M, -g[idx])
+        p_new = np.clip(p[idx] + dp, lo, hi)
+        step = p_new - p[idx]
+
+        # a predicted step below xtol needs no evaluation: already converged
+        tiny = np.all(np.abs(step) <= xtol * (np.abs(p[idx]) + xtol), axis=1)
+        if tiny.any():
+            converged[idx[tiny]] = True
+            active[idx[tiny]] = False
+            idx, p_new, step = idx[~tiny], p_new[~tiny], step[~tiny]
+            if idx.size == 0:
+                break
+
+        r_new, J_new = fun(p_new, idx)
+        cost_new = 0.5 * np.einsum("rk,rk->r", r_new, r_new)
+        ok = np.isfinite(cost_new) & (cost_new <= cost[idx])
+
+        acc = idx[ok]
+        drop = cost[acc] - cost_new[ok]
+        p[acc] = p_new[ok]
+        cost[acc] = cost_new[ok]
+        A[acc], g[acc] = _normal_equations(J_new[ok], r_new[ok])
+        lam[acc] = np.maximum(lam[acc] / 3.0, 1e-12)
+        small = np.all(np.abs(step[ok]) <= xtol * (np.abs(p[acc]) + xtol), axis=1)
+        done = acc[(drop <= ftol * np.maximum(cost[acc], 1e-300)) | small]
+        converged[done] = True
+        active[done] = False
+
+        rej = idx[~ok]
+        lam[rej] *= 4.0
+        stuck = (lam[rej] > 1e12) | ~np.any(step[~ok], axis=1)
+        active[rej[stuck]] = False
+
+    return p, cost, iters, converged
+
+
+def _normal_equations(J: np.ndarray, r: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # stacked J'J and J'r from the per-parameter rows of J (contiguous when
+    # J is a transposed view of them): one BLAS dot per entry of the
+    # symmetric J'J beats a stacked (P, N) x (N, P) matmul for long N
+    rows = np.ascontiguousarray(np.swapaxes(J, 1, 2))
+    k, n, _ = rows.shape
+    A = np.empty((k, n, n))
+    for i in range(n):
+        for j in range(i, n):
+            A[:, i, j] = A[:, j, i] = (rows[:, i, None, :] @ rows[:, j, :, None])[:, 0, 0]
+    return A, (rows @ r[:, :, None])[:, :, 0]
+
+
+def _solve_rows(M: np.ndarray, b: np.ndarray) -> np.ndarray:
+    try:
+        return np.linalg.solve(M, b[:, :, None])[:, :, 0]
+    except np.linalg.LinAlgError:
+        # one singular system fails the stacked solve: redo row by row
+        out = np.zeros_like(b)
+        for i in range(len(b)):
+            try:
+                out[i] = np.linalg.solve(M[i], b[i])
+            except np.linalg.LinAlgError:
+                pass
+        return out
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+class MinMaxPyramid:
+    """
+    Multi-resolution min/max decimation of one signal, for plotting.
+
+    Level 0 holds, for every bucket of `base` samples, the index of the
+    bucket's min and max; each higher level merges pairs of buckets, so the
+    whole pyramid is built once in O(N) and costs ~N indices of memory.
+
+    view() picks the coarsest level that still gives about one bucket per
+    pixel over the visible range and returns the min and max samples of each
+    bucket, plus the first and last visible sample, in time order. Returned
+    points are real samples (peaks and spikes survive decimation); ranges
+    that are already small are returned raw.
+    """
+
+    def __init__(self, y: np.ndarray, *, base: int = 4):
+        self.y = np.asarray(y)
+        n = len(self.y)
+        idx_type = np.int32 if n < 2**31 else np.int64
+        self._levels: list[tuple[int, np.ndarray, np.ndarray]] = []
+
+        base = max(int(base), 2)
+        if n <= base:
+            return
+
+        n_buckets = -(-n // base)
+        # pad with the last sample: argmin/argmax return the first occurrence,
+        # so a padded value never wins over the real sample at n - 1
+        blocks = np.pad(self.y, (0, n_buckets * base - n), mode="edge").reshape(n_buckets, base)
+        offset = np.arange(n_buckets, dtype=idx_type) * base
+        i_min = offset + np.argmin(blocks, axis=1).astype(idx_type)
+        i_max = offset + np.argmax(blocks, axis=1).astype(idx_type)
+
+        bucket = base
+        self._levels.append((bucket, i_min, i_max))
+        while len(i_min) > 1:
+            if len(i_min) % 2:
+                i_min = np.append(i_min, i_min[-1])
+                i_max = np.append(i_max, i_max[-1])
+            a, b = i_min[0::2], i_min[1::2]
+            i_min = np.where(self.y[b] < self.y[a], b, a)
+            a, b = i_max[0::2], i_max[1::2]
+            i_max = np.where(self.y[b] > self.y[a], b, a)
+            bucket *= 2
+            self._levels.append((bucket, i_min, i_max))
+
+    def view(self, t: np.ndarray, x0: float, x1: float, n_pixels: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Decimated (t, y) for the time range [x0, x1] at about n_pixels buckets.
+
+        t is the full-resolution time array the pyramid was built against
+        (shared by every pyramid of a panel). One sample beyond each edge is
+        included so lines run to the axes border.
+        """
+        n = len(self.y)
+        i0 = max(int(np.searchsorted(t, x0, side="left")) - 1, 0)
+        i1 = min(int(np.searchsorted(t, x1, side="right")) + 1, n)
+        count = i1 - i0
+        target = max(int(n_pixels), 1)
+
+        if count <= 2 * target or not self._levels:
+            return t[i0:i1], self.y[i0:i1]
+
+        for bucket, i_min, i_max in self._levels:
+            if count <= bucket * target:
+                break
+
+        j0 = i0 // bucket
+        j1 = -(-i1 // bucket)
+        lo = i_min[j0:j1]
+        hi = i_max[j0:j1]
+        # first / last visible sample, then the min and max of every bucket
+        idx = np.empty(2 * len(lo) + 2, dtype=lo.dtype)
+        idx[0] = i0
+        idx[1:-1:2] = np.minimum(lo, hi)
+        idx[2:-1:2] = np.maximum(lo, hi)
+        idx[-1] = i1 - 1
+        idx.sort()
+        return t[idx], self.y[idx]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+_NUMBA_KERNEL = None
+_NUMBA_TRIED = False
+_SCALAR_STRETCH = 256
+
+
+def _rate_limit_loop(u: np.ndarray, max_step: float, out: np.ndarray) -> None:
+    # reference recurrence (also the numba kernel's source)
+    out[0] = u[0]
+    for k in range(1, len(u)):
+        du = u[k] - out[k - 1]
+        if du > max_step:
+            du = max_step
+        elif du < -max_step:
+            du = -max_step
+        out[k] = out[k - 1] + du
+
+
+def _rate_limit_scalar(u: list, prev: float, m: float) -> list:
+    # same recurrence on Python floats: cheaper than indexing NumPy arrays
+    out = []
+    for x in u:
+        du = x - prev
+        if du > m:
+            du = m
+        elif du < -m:
+            du = -m
+        prev = prev + du
+        out.append(prev)
+    return out
+
+
+def _numba_kernel():
+    global _NUMBA_KERNEL, _NUMBA_TRIED
+    if not _NUMBA_TRIED:
+        _NUMBA_TRIED = True
+        try:
+            import numba
+        except ImportError:
+            _NUMBA_KERNEL = None
+        else:
+            _NUMBA_KERNEL = numba.njit(cache=True, nogil=True)(_rate_limit_loop)
+    return _NUMBA_KERNEL
+
+
+def rate_limit(
+    u: np.ndarray,
+    max_step: float,
+    *,
+    use_numba: Optional[bool] = None,
+    window: int = 64,
+) -> np.ndarray:
+    """
+    Slew-rate limiter, bit-identical to the sequential loop
+
+      out[0] = u[0]
+      out[k] = out[k-1] + clip(u[k] - out[k-1], -max_step, max_step)
+
+    With numba available the loop itself is compiled. Otherwise the signal is
+    walked in segments, each resolved with a few NumPy calls:
+
+      - tracking: out[k] == u[k] while every step is within the limit and
+        out[k-1] + (u[k] - out[k-1]) rounds back to u[k] (checked per sample);
+      - limiting: out[k] = out[k-1] +/- max_step while the input keeps
+        running away, produced with np.add.accumulate (same sequential sums).
+
+    Steps, ramps and holds cost a handful of vector calls each; the window
+    grows while segments stay long. Where segments keep breaking after a few
+    samples (noisy input riding the limit) a stretch is run as a plain scalar
+    loop instead.
+    """
+    u = np.asarray(u, dtype=float)
+    n = len(u)
+    out = np.empty(n, dtype=float)
+    if n == 0:
+        return out
+    m = float(max_step)
+
+    kernel = _numba_kernel() if use_numba in (None, True) else None
+    if use_numba and kernel is None:
+        raise ImportError("numba is required for use_numba=True")
+    if kernel is not None:
+        kernel(u, m, out)
+        return out
+
+    out[0] = u[0]
+    k = 1
+    w_min = max(int(window), 4)
+    w = w_min
+    while k < n:
+        prev = out[k - 1]
+        k1 = min(k + w, n)
+        seg = u[k:k1]
+        du = seg[0] - prev
+
+        if -m <= du <= m and prev + du == seg[0]:
+            # tracking run: out follows u exactly
+            before = np.empty(k1 - k)
+            before[0] = prev
+            before[1:] = seg[:-1]
+            d = seg - before
+            ok = (d <= m) & (d >= -m) & (before + d == seg)
+            bad = np.flatnonzero(~ok)
+            end = k + (int(bad[0]) if bad.size else len(seg))
+            out[k:end] = u[k:end]
+        elif du > m or du < -m:
+            # limiting run: out moves by exactly +/- m per sample
+            step = m if du > m else -m
+            acc = np.empty(k1 - k + 1)
+            acc[0] = prev
+            acc[1:] = step
+            np.add.accumulate(acc, out=acc)
+            d = seg - acc[:-1]
+            ok = d > m if step > 0 else d < -m
+            bad = np.flatnonzero(~ok)
+            end = k + (int(bad[0]) if bad.size else len(seg))
+            out[k:end] = acc[1:end - k + 1]
+        else:
+            # NaN, or a step whose rounding leaves out != u
+            end = k
+
+        if end - k < 8:
+            # short segment: vector calls cost more than they save here
+            end = min(k + _SCALAR_STRETCH, n)
+            out[k:end] = _rate_limit_scalar(u[k:end].tolist(), float(prev), m)
+            w = w_min
+        else:
+            w = min(w * 2, 1 << 16) if end == k1 else w_min
+        k = end
+    return out
@@ -1,14 +1,195 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import Literal, Optional, Sequence
 import numpy as np
 
-from models.kalman import KalmanRunConfig
+from models.kalman import KalmanRunConfig, KalmanObserverState, KalmanDiagnostics
+from .helpers import state_space_filter
+
+KalmanMode = Literal["exact", "steady_state"]
+KalmanPrecision = Literal["float64", "plc_real"]
+
+
+class KalmanObserver:
+    """
+    Streaming form of the AOI: holds the filter state between calls so a
+    signal can be fed one sample (push) or one chunk (push_many) at a time.
+
+    Feeding a signal in any chunking produces exactly the same output as
+    run_procedural_kalman on the whole array.
+    """
+
+    __slots__ = ("cfg", "x", "x_dot", "P00", "P01", "P11", "t_last", "initialized")
+
+    def __init__(self, cfg: KalmanRunConfig):
+        self.cfg = cfg
+        self.reset()
+
+    def reset(self) -> None:
+        """Re-arm init (next push starts the estimate at the measurement)."""
+        self.x = 0.0
+        self.x_dot = 0.0
+        self.P00 = float(self.cfg.p00)
+        self.P01 = float(self.cfg.p01)
+        self.P11 = float(self.cfg.p11)
+        self.t_last: float | None = None
+        self.initialized = False
+
+    def snapshot(self) -> KalmanObserverState:
+        return KalmanObserverState(
+            x=self.x,
+            x_dot=self.x_dot,
+            p00=self.P00,
+            p01=self.P01,
+            p11=self.P11,
+            t_last=self.t_last,
+            initialized=self.initialized,
+        )
+
+    def restore(self, state: KalmanObserverState) -> None:
+        self.x = float(state.x)
+        self.x_dot = float(state.x_dot)
+        self.P00 = float(state.p00)
+        self.P01 = float(state.p01)
+        self.P11 = float(state.p11)
+        self.t_last = None if state.t_last is None else float(state.t_last)
+        self.initialized = bool(state.initialized)
+
+    def push(self, t: float, x: float) -> tuple[float, float]:
+        """
+        Feed one sample. Returns (y, y_dot).
+        """
+        y, y_dot = self.push_many(np.array([t], dtype=float), np.array([x], dtype=float))
+        return float(y[0]), float(y_dot[0])
+
+    def push_many(
+        self,
+        t_arr: np.ndarray,
+        x_arr: np.ndarray,
+        *,
+        cov_out: Optional[np.ndarray] = None,
+        diag_out: Optional[np.ndarray] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Feed a chunk of samples. Returns (y, y_dot) arrays for the chunk.
+
+        cov_out: optional (n, 3) float64 array that receives the covariance
+        (P00, P01, P11) held after each sample.
+        diag_out: optional (n, 4) float64 array that receives (y_res, S, K0, K1)
+        for each sample (NaN where no update ran).
+        """
+        cfg = self.cfg
+        n = len(x_arr)
+        y = np.empty(n, dtype=float)
+        y_dot = np.empty(n, dtype=float)
+        if n == 0:
+            return y, y_dot
+
+        x_pred = self.x
+        x_dot_pred = self.x_dot
+
+        P00 = self.P00
+        P01 = self.P01
+        P10 = self.P01
+        P11 = self.P11
+
+        k0 = 0
+        t_prev = self.t_last
+
+        # --- init ---
+        if not self.initialized:
+            x_pred = float(x_arr[0])
+            x_dot_pred = 0.0
+            y[0] = x_pred
+            y_dot[0] = x_dot_pred
+            t_prev = t_arr[0]
+            self.initialized = True
+            k0 = 1
+            if cov_out is not None:
+                cov_out[0] = (P00, P01, P11)
+            if diag_out is not None:
+                diag_out[0] = np.nan
+
+        for k in range(k0, n):
+            dt_s = float(t_arr[k] - t_prev)
+            t_prev = t_arr[k]
+            if not np.isfinite(dt_s) or dt_s <= 0.0:
+                # pass-through
+                y[k] = float(x_arr[k])
+                y_dot[k] = 0.0
+                if cov_out is not None:
+                    cov_out[k] = (P00, P01, P11)
+                if diag_out is not None:
+                    diag_out[k] = np.nan
+                continue
+
+            # =====================
+            # PREDICT
+            # =====================
+            x_pred = x_pred + (dt_s * x_dot_pred)
+
+            # covariance predict (scalar expanded)
+            xcov00 = (P00 + dt_s * P10) + dt_s * (P01 + dt_s * P11)
+            xcov01 = (P01 + dt_s * P11)
+            xcov10 = (P10 + dt_s * P11)
+            xcov11 = (P11)
+
+            # add process noise
+            xcov00 = xcov00 + cfg.q_x
+            xcov11 = xcov11 + cfg.q_x_dot
+
+            # =====================
+            # UPDATE
+            # =====================
+            y_res = float(x_arr[k] - x_pred)
+            S = xcov00 + cfg.r_x
+
+            if S > 0.0 and np.isfinite(S):
+                K0 = xcov00 / S
+                K1 = xcov10 / S
+
+                x_pred = x_pred + (K0 * y_res)
+                x_dot_pred = x_dot_pred + (K1 * y_res)
+
+                if cfg.bleed_enable:
+                    if abs(x_arr[k] - x_pred) < cfg.bleed_thresh:
+                        x_dot_pred = x_dot_pred * cfg.bleed_factor
+
+                # covariance update
+                P00 = (1.0 - K0) * xcov00
+                P01 = (1.0 - K0) * xcov01
+                P10 = xcov10 - (K1 * xcov00)
+                P11 = xcov11 - (K1 * xcov01)
+
+                # enforce symmetry
+                P10 = P01
+
+                if diag_out is not None:
+                    diag_out[k] = (y_res, S, K0, K1)
+            elif diag_out is not None:
+                diag_out[k] = (y_res, S, np.nan, np.nan)
+
+            y[k] = x_pred
+            y_dot[k] = x_dot_pred
+            if cov_out is not None:
+                cov_out[k] = (P00, P01, P11)
+
+        self.x = float(x_pred)
+        self.x_dot = float(x_dot_pred)
+        self.P00 = float(P00)
+        self.P01 = float(P01)
+        self.P11 = float(P11)
+        self.t_last = float(t_prev)
+        return y, y_dot
 
 
 def run_procedural_kalman(
     t_s: np.ndarray,
     x: np.ndarray,
     cfg: KalmanRunConfig,
+    *,
+    mode: KalmanMode = "exact",
+    precision: KalmanPrecision = "float64",
 ) -> tuple[np.ndarray, np.ndarray]:
     """
     Reproduces the AOI behavior across an entire signal:
@@ -16,73 +197,795 @@ def run_procedural_kalman(
       - init on first sample
       - predict/update each step
     Returns (y, y_dot) arrays.
+
+    mode:
+      - "exact"        : per-sample AOI recursion
+      - "steady_state" : run_kalman_steady_state (falls back to exact when
+                         the signal/config does not qualify)
+
+    precision:
+      - "float64"  : float64 math, float-second dt
+      - "plc_real" : what the controller computes (see plc_dt_seconds):
+                     32-bit REAL math, dt as an integer-ms timer PRE,
+                     pass-through on dt <= 0. Returns float32 arrays.
+    """
+    _check_precision(precision)
+    if precision == "plc_real":
+        if mode != "exact":
+            raise ValueError("precision='plc_real' only supports mode='exact'")
+        return _run_plc_real(plc_dt_seconds(t_s), np.asarray(x, dtype=np.float32), cfg)
+    if mode == "steady_state":
+        return run_kalman_steady_state(t_s, x, cfg)
+    if mode != "exact":
+        raise ValueError(f"Unknown mode: {mode!r}")
+    return KalmanObserver(cfg).push_many(t_s, x)
+
+
+# samples per backward-pass chunk of run_rts_smoother
+_RTS_CHUNK = 8192
+
+
+def run_rts_smoother(
+    t_s: np.ndarray,
+    x: np.ndarray,
+    cfg: KalmanRunConfig,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rauch–Tung–Striebel smoother (offline, zero-lag reference).
+
+    Runs the causal AOI forward pass while storing the filtered covariance as
+    one (N, 3) float64 array (P00, P01, P11; ~24 bytes/sample), then a backward
+    pass over fixed-size chunks (only O(chunk) scratch on top of the outputs):
+
+      C[k]   = P[k] F' inv(F P[k] F' + Q)
+      s_s[k] = s[k] + C[k] (s_s[k+1] - F s[k])
+
+    Pass-through samples (invalid dt) keep y = x, y_dot = 0 in both outputs and
+    carry the smoothed state across unchanged. The bleed is not part of the
+    model; its effect is taken as-is from the forward states.
+
+    Returns (y, y_dot, y_smooth, y_dot_smooth).
     """
     n = len(x)
-    y = np.empty(n, dtype=float)
-    y_dot = np.empty(n, dtype=float)
+    cov = np.empty((n, 3), dtype=float)
+    y, y_dot = KalmanObserver(cfg).push_many(t_s, x, cov_out=cov)
+    if n < 2:
+        return y, y_dot, y.copy(), y_dot.copy()
 
-    # --- init ---
-    x_pred = float(x[0])
-    x_dot_pred = 0.0
+    t_s = np.asarray(t_s, dtype=float)
+    q_x = float(cfg.q_x)
+    q_x_dot = float(cfg.q_x_dot)
+    x_s = np.empty(n, dtype=float)
+    v_s = np.empty(n, dtype=float)
+
+    # The backward pass walks fixed-size chunks from the end, so apart from
+    # the outputs and cov only O(_RTS_CHUNK) temporaries are alive. A chunk
+    # [a, b] holds the transitions k -> k + 1 for k = a .. b - 1.
+    bounds = [(a, min(a + _RTS_CHUNK, n - 1)) for a in range(0, n - 1, _RTS_CHUNK)]
+
+    # pass-through samples hold the previous filtered state: one forward scan
+    # finds, for each chunk, the sample whose state its first sample holds
+    seeds = []
+    held = 0
+    for a, b in bounds:
+        seeds.append(held)
+        dt = np.diff(t_s[a:b + 1])
+        ok = np.flatnonzero(np.isfinite(dt) & (dt > 0.0))
+        if ok.size:
+            held = a + int(ok[-1]) + 1
+
+    xn = vn = 0.0
+    for (a, b), seed in zip(reversed(bounds), reversed(seeds)):
+        dt = np.diff(t_s[a:b + 1])
+        valid = np.isfinite(dt) & (dt > 0.0)
+
+        # filtered internal state of samples a .. b
+        idx = np.where(np.r_[False, valid], np.arange(a, b + 1), -1)
+        idx[0] = seed
+        np.maximum.accumulate(idx, out=idx)
+        xs = y[idx]
+        vs = y_dot[idx]
+        if b == n - 1:
+            xn = float(xs[-1])
+            vn = float(vs[-1])
+            x_s[-1] = xn
+            v_s[-1] = vn
 
+        # smoother gains (F = I, Q = 0 across pass-through samples)
+        d = np.where(valid, dt, 0.0)
+        qx = np.where(valid, q_x, 0.0)
+        qv = np.where(valid, q_x_dot, 0.0)
+        P00, P01, P11 = cov[a:b, 0], cov[a:b, 1], cov[a:b, 2]
+
+        pp00 = (P00 + d * P01) + d * (P01 + d * P11) + qx
+        pp01 = P01 + d * P11
+        pp11 = P11 + qv
+
+        # P F'
+        a00 = P00 + d * P01
+        a01 = P01
+        a10 = P01 + d * P11
+        a11 = P11
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            det = pp00 * pp11 - pp01 * pp01
+            inv = 1.0 / det
+            C00 = (a00 * pp11 - a01 * pp01) * inv
+            C01 = (a01 * pp00 - a00 * pp01) * inv
+            C10 = (a10 * pp11 - a11 * pp01) * inv
+            C11 = (a11 * pp00 - a10 * pp01) * inv
+        bad = ~(np.isfinite(det) & (det > 0.0))
+        for C in (C00, C01, C10, C11):
+            C[bad] = 0.0
+
+        # predicted state F s[k]
+        xp = xs[:-1] + d * vs[:-1]
+
+        xs_l, vs_l, xp_l = xs.tolist(), vs.tolist(), xp.tolist()
+        C00_l, C01_l, C10_l, C11_l = C00.tolist(), C01.tolist(), C10.tolist(), C11.tolist()
+        out_x = [0.0] * (b - a)
+        out_v = [0.0] * (b - a)
+        for j in range(b - a - 1, -1, -1):
+            ex = xn - xp_l[j]
+            ev = vn - vs_l[j]
+            xn = xs_l[j] + C00_l[j] * ex + C01_l[j] * ev
+            vn = vs_l[j] + C10_l[j] * ex + C11_l[j] * ev
+            out_x[j] = xn
+            out_v[j] = vn
+        x_s[a:b] = out_x
+        v_s[a:b] = out_v
+
+        # keep the forward pass-through convention
+        pt = np.flatnonzero(~valid) + a + 1
+        x_s[pt] = y[pt]
+        v_s[pt] = y_dot[pt]
+
+    return y, y_dot, x_s, v_s
+
+
+def run_kalman_diagnostics(
+    t_s: np.ndarray,
+    x: np.ndarray,
+    cfg: KalmanRunConfig,
+    *,
+    window: int = 200,
+) -> tuple[np.ndarray, np.ndarray, KalmanDiagnostics]:
+    """
+    AOI run that also keeps what the filter computes every step:
+      - innovation y_res and its variance S
+      - normalized innovation y_res / sqrt(S)
+      - gains K0, K1 and trace(P) after the update
+
+    Running consistency statistics over the last `window` valid updates
+    (samples without an update, e.g. pass-through on a bad dt, are skipped,
+    so a window always holds `window` updates once that many have run) come
+    from prefix sums of the normalized innovations (no re-scan per window):
+      - windowed mean NIS (≈ 1 when r_x/q match the data)
+      - windowed lag-1 autocorrelation (≈ 0 when the innovations are white)
+
+    Returns (y, y_dot, diagnostics).
+    """
+    n = len(x)
+    window = max(int(window), 2)
+    cov = np.empty((n, 3), dtype=float)
+    diag = np.empty((n, 4), dtype=float)
+    y, y_dot = KalmanObserver(cfg).push_many(t_s, x, cov_out=cov, diag_out=diag)
+
+    innovation = diag[:, 0]
+    S = diag[:, 1]
+    k0 = diag[:, 2]
+    k1 = diag[:, 3]
+    p_trace = cov[:, 0] + cov[:, 2]
+
+    valid = np.isfinite(k0) & np.isfinite(innovation)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        nu = np.where(valid, innovation / np.sqrt(S), np.nan)
+
+    # prefix sums over the sequence of valid updates (pass-through and failed
+    # updates are skipped, not counted as zeros); lag-1 pairs are consecutive
+    # updates
+    nu_v = nu[valid]
+    n_valid = len(nu_v)
+
+    def prefix(a: np.ndarray) -> np.ndarray:
+        return np.concatenate(([0.0], np.cumsum(a)))
+
+    c_s = prefix(nu_v)
+    c_ss = prefix(nu_v * nu_v)
+    c_lag = prefix(nu_v[1:] * nu_v[:-1])
+
+    # window ending at sample i: the last `window` valid updates up to i
+    j = np.cumsum(valid)
+    lo = np.maximum(j - window, 0)
+    w_n = j - lo
+    w_s = c_s[j] - c_s[lo]
+    w_ss = c_ss[j] - c_ss[lo]
+    # pairs (p, p + 1) with lo <= p and p + 1 < j
+    hi_lag = np.maximum(j - 1, lo)
+    w_lag = c_lag[hi_lag] - c_lag[lo]
+    w_lag_n = hi_lag - lo
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        nis_window = np.where(w_n > 0, w_ss / w_n, np.nan)
+        mean = w_s / w_n
+        var = w_ss / w_n - mean * mean
+        whiteness_window = np.where(
+            (w_lag_n > 1) & (var > 0), (w_lag / w_lag_n - mean * mean) / var, np.nan
+        )
+
+    if n_valid > 1:
+        m = c_s[-1] / n_valid
+        var_all = c_ss[-1] / n_valid - m * m
+        nis_mean = float(c_ss[-1] / n_valid)
+        whiteness = float((c_lag[-1] / (n_valid - 1) - m * m) / var_all) if var_all > 0 else float("nan")
+    else:
+        nis_mean = float("nan")
+        whiteness = float("nan")
+
+    # 95% bands for a consistent filter over a full window
+    nis_band = 1.96 * np.sqrt(2.0 / window)
+    white_band = 1.96 / np.sqrt(window)
+    # one full window per update (samples without an update repeat the last)
+    full = valid & (w_n >= window)
+    with np.errstate(invalid="ignore"):
+        nis_in_band = float(np.mean(np.abs(nis_window[full] - 1.0) <= nis_band)) if full.any() else float("nan")
+        white_in_band = float(np.mean(np.abs(whiteness_window[full]) <= white_band)) if full.any() else float("nan")
+
+    diagnostics = KalmanDiagnostics(
+        innovation=innovation,
+        innovation_var=S,
+        normalized_innovation=nu,
+        k0=k0,
+        k1=k1,
+        p_trace=p_trace,
+        window=window,
+        nis_window=nis_window,
+        whiteness_window=whiteness_window,
+        n_valid=n_valid,
+        nis_mean=nis_mean,
+        whiteness=whiteness,
+        nis_in_band=nis_in_band,
+        whiteness_in_band=white_in_band,
+    )
+    return y, y_dot, diagnostics
+
+
+def _steady_state_gain(
+    cfg: KalmanRunConfig,
+    dt_s: float,
+    *,
+    tol: float,
+    max_iter: int,
+) -> Optional[tuple[float, float, int]]:
+    """
+    Iterate the (data independent) covariance recursion at a fixed dt.
+
+    Returns (K0, K1, k_switch): the converged gains and the first step k at
+    which |K_k - K_inf| <= tol * |K_inf| for both gains. None if the gains do
+    not converge within max_iter or S becomes non-positive.
+    """
     P00 = float(cfg.p00)
     P01 = float(cfg.p01)
-    P10 = float(cfg.p01)
     P11 = float(cfg.p11)
 
+    gains: list[tuple[float, float]] = []
+    K0_prev = K1_prev = float("nan")
+    for _ in range(max_iter):
+        xcov00 = (P00 + dt_s * P01) + dt_s * (P01 + dt_s * P11) + cfg.q_x
+        xcov01 = P01 + dt_s * P11
+        xcov11 = P11 + cfg.q_x_dot
+        S = xcov00 + cfg.r_x
+        if not (S > 0.0 and np.isfinite(S)):
+            return None
+
+        K0 = xcov00 / S
+        K1 = xcov01 / S
+        P00 = (1.0 - K0) * xcov00
+        P01 = (1.0 - K0) * xcov01
+        P11 = xcov11 - K1 * xcov01
+        gains.append((K0, K1))
+
+        eps = 4.0 * np.finfo(float).eps
+        if abs(K0 - K0_prev) <= eps * abs(K0) and abs(K1 - K1_prev) <= eps * abs(K1):
+            break
+        K0_prev, K1_prev = K0, K1
+    else:
+        return None
+
+    K0_inf, K1_inf = gains[-1]
+    k_switch = len(gains)
+    for k, (K0, K1) in enumerate(gains, start=1):
+        if abs(K0 - K0_inf) <= tol * abs(K0_inf) and abs(K1 - K1_inf) <= tol * abs(K1_inf):
+            k_switch = k
+            break
+    return K0_inf, K1_inf, k_switch
+
+
+def run_kalman_steady_state(
+    t_s: np.ndarray,
+    x: np.ndarray,
+    cfg: KalmanRunConfig,
+    *,
+    tol: float = 1e-12,
+    dt_rtol: float = 1e-9,
+    max_iter: int = 50_000,
+    use_scipy: Optional[bool] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fast path for uniformly sampled signals.
+
+    With a constant dt the covariance recursion does not depend on the data and
+    the gains converge to fixed K_inf. The exact AOI recursion runs until the
+    gains are within tol of K_inf (usually a few dozen samples); the rest of the
+    signal is a constant-gain 2-state filter
+
+      s[k] = (I - K H) F s[k-1] + K x[k],    s = [x̂, v̂]
+
+    evaluated as a linear IIR (scipy.signal.lfilter, or the NumPy FFT fallback).
+
+    Falls back to the exact path when dt is not uniform (max |dt - median| >
+    dt_rtol * median), bleed is enabled (the bleed makes the filter nonlinear)
+    or the gains do not converge (e.g. q_x = q_x_dot = 0).
+
+    Error bound against the exact path (for both x̂ and v̂):
+
+      |s_fast[k] - s_exact[k]| <= G * tol * |K_inf| * max|innovation|  + roundoff
+
+    where G = sum_j ||A^j|| is the noise gain of the steady-state loop
+    A = (I - K H) F. Non-uniform dt within dt_rtol adds a term of the same form
+    with tol replaced by ~dt_rtol. Roundoff is ~1e-12 relative to the signal
+    scale (IIR / FFT evaluation order differs from the sequential loop).
+    """
+    n = len(x)
+    if n < 3 or cfg.bleed_enable:
+        return run_procedural_kalman(t_s, x, cfg)
+
+    dt = np.diff(np.asarray(t_s, dtype=float))
+    if not np.all(np.isfinite(dt)):
+        return run_procedural_kalman(t_s, x, cfg)
+    dt_s = float(np.median(dt))
+    if not dt_s > 0.0 or float(np.max(np.abs(dt - dt_s))) > dt_rtol * dt_s:
+        return run_procedural_kalman(t_s, x, cfg)
+
+    gain = _steady_state_gain(cfg, dt_s, tol=tol, max_iter=min(max_iter, n - 1))
+    if gain is None:
+        return run_procedural_kalman(t_s, x, cfg)
+    K0, K1, k_switch = gain
+
+    y = np.empty(n, dtype=float)
+    y_dot = np.empty(n, dtype=float)
+
+    # exact AOI recursion through the gain transient
+    obs = KalmanObserver(cfg)
+    y[:k_switch + 1], y_dot[:k_switch + 1] = obs.push_many(t_s[:k_switch + 1], x[:k_switch + 1])
+
+    # constant-gain IIR for the rest
+    A = np.array([
+        [1.0 - K0, (1.0 - K0) * dt_s],
+        [-K1, 1.0 - K1 * dt_s],
+    ])
+    B = np.array([K0, K1])
+    s = state_space_filter(A, B, x[k_switch + 1:], np.array([obs.x, obs.x_dot]), use_scipy=use_scipy)
+    y[k_switch + 1:] = s[:, 0]
+    y_dot[k_switch + 1:] = s[:, 1]
+    return y, y_dot
+
+
+def _check_precision(precision: str) -> None:
+    if precision not in ("float64", "plc_real"):
+        raise ValueError(f"Unknown precision: {precision!r}")
+
+
+def plc_dt_seconds(t_s: np.ndarray) -> np.ndarray:
+    """
+    Per-step dt as the AOI sees it, shape (N-1,) float32.
+
+    The controller gets dt as an integer-ms timer PRE and converts it in REAL:
+    dt_s = REAL(dt_ms) / 1000.0. Non-finite or non-positive steps become 0.0,
+    which the filter treats as pass-through.
+    """
+    dt = np.diff(np.asarray(t_s, dtype=float))
+    with np.errstate(invalid="ignore"):
+        dt_ms = np.where(np.isfinite(dt), np.rint(dt * 1000.0), 0.0)
+    dt_ms = np.maximum(dt_ms, 0.0).astype(np.float32)
+    return dt_ms / np.float32(1000.0)
+
+
+def _dt_for(t_s: np.ndarray, precision: KalmanPrecision) -> np.ndarray:
+    if precision == "plc_real":
+        return plc_dt_seconds(t_s)
+    return np.diff(np.asarray(t_s, dtype=float))
+
+
+def _run_plc_real(
+    dt_s: np.ndarray,
+    x: np.ndarray,
+    cfg: KalmanRunConfig,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Single-filter AOI recursion in np.float32 scalars (one REAL per tag).
+
+    dt_s is the (N-1,) float32 output of plc_dt_seconds; x is float32.
+    Same result as _kalman_batch_core(precision="plc_real") for one config,
+    without the per-step array overhead.
+    """
+    f32 = np.float32
+    n = len(x)
+    y = np.empty(n, dtype=f32)
+    y_dot = np.empty(n, dtype=f32)
+    if n == 0:
+        return y, y_dot
+
+    r_x = f32(cfg.r_x)
+    q_x = f32(cfg.q_x)
+    q_x_dot = f32(cfg.q_x_dot)
+    bleed_enable = bool(cfg.bleed_enable)
+    bleed_thresh = f32(cfg.bleed_thresh)
+    bleed_factor = f32(cfg.bleed_factor)
+    one = f32(1.0)
+
+    # --- init ---
+    x_pred = x[0]
+    x_dot_pred = f32(0.0)
+    P00 = f32(cfg.p00)
+    P01 = f32(cfg.p01)
+    P10 = P01
+    P11 = f32(cfg.p11)
     y[0] = x_pred
     y_dot[0] = x_dot_pred
 
-    for k in range(1, n):
-        dt_s = float(t_s[k] - t_s[k - 1])
-        if not np.isfinite(dt_s) or dt_s <= 0.0:
-            # pass-through
-            y[k] = float(x[k])
-            y_dot[k] = 0.0
-            continue
-
-        # =====================
-        # PREDICT
-        # =====================
-        x_pred = x_pred + (dt_s * x_dot_pred)
-
-        # covariance predict (scalar expanded)
-        xcov00 = (P00 + dt_s * P10) + dt_s * (P01 + dt_s * P11)
-        xcov01 = (P01 + dt_s * P11)
-        xcov10 = (P10 + dt_s * P11)
-        xcov11 = (P11)
-
-        # add process noise
-        xcov00 = xcov00 + cfg.q_x
-        xcov11 = xcov11 + cfg.q_x_dot
-
-        # =====================
-        # UPDATE
-        # =====================
-        y_res = float(x[k] - x_pred)
-        S = xcov00 + cfg.r_x
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for k in range(1, n):
+            xk = x[k]
+            dt = dt_s[k - 1]
+            if not dt > 0.0:
+                # pass-through
+                y[k] = xk
+                y_dot[k] = 0.0
+                continue
+
+            # PREDICT
+            x_pred = x_pred + (dt * x_dot_pred)
+            xcov00 = (P00 + dt * P10) + dt * (P01 + dt * P11)
+            xcov01 = P01 + dt * P11
+            xcov10 = P10 + dt * P11
+            xcov11 = P11
+            xcov00 = xcov00 + q_x
+            xcov11 = xcov11 + q_x_dot
+
+            # UPDATE
+            y_res = xk - x_pred
+            S = xcov00 + r_x
+            if S > 0.0:
+                K0 = xcov00 / S
+                K1 = xcov10 / S
+                x_pred = x_pred + (K0 * y_res)
+                x_dot_pred = x_dot_pred + (K1 * y_res)
+                if bleed_enable and abs(xk - x_pred) < bleed_thresh:
+                    x_dot_pred = x_dot_pred * bleed_factor
+                P00 = (one - K0) * xcov00
+                P01 = (one - K0) * xcov01
+                P11 = xcov11 - (K1 * xcov01)
+                P10 = P01
+
+            y[k] = x_pred
+            y_dot[k] = x_dot_pred
+
+    return y, y_dot
+
+
+def _cfg_arrays(cfgs: Sequence[KalmanRunConfig]) -> dict[str, np.ndarray]:
+    """
+    Unpack a sequence of configs into one float64 vector per field.
+    """
+    return {
+        "r_x": np.array([c.r_x for c in cfgs], dtype=float),
+        "q_x": np.array([c.q_x for c in cfgs], dtype=float),
+        "q_x_dot": np.array([c.q_x_dot for c in cfgs], dtype=float),
+        "bleed_enable": np.array([bool(c.bleed_enable) for c in cfgs], dtype=bool),
+        "bleed_thresh": np.array([c.bleed_thresh for c in cfgs], dtype=float),
+        "bleed_factor": np.array([c.bleed_factor for c in cfgs], dtype=float),
+        "p00": np.array([c.p00 for c in cfgs], dtype=float),
+        "p01": np.array([c.p01 for c in cfgs], dtype=float),
+        "p11": np.array([c.p11 for c in cfgs], dtype=float),
+    }
+
+
+def _kalman_batch_core(
+    dt_all: np.ndarray,
+    x: np.ndarray,
+    c: dict[str, np.ndarray],
+    *,
+    keep_outputs: bool = True,
+    innovation_stats: bool = False,
+    count_from: Optional[np.ndarray] = None,
+    precision: KalmanPrecision = "float64",
+) -> tuple[Optional[np.ndarray], Optional[np.ndarray], Optional[tuple[np.ndarray, np.ndarray, np.ndarray]]]:
+    """
+    Shared loop behind the batched entry points.
+
+    Shapes broadcast: dt_all is (N-1, ...) and x is (N, ...); the filter bank
+    has shape broadcast(x.shape[1:], dt_all.shape[1:], cfg arrays). A 1-D
+    dt_all / x is shared by every filter.
+
+    Returns (y, y_dot, stats) where y / y_dot are (N, *bank) buffers (None when
+    keep_outputs is False) and stats is (sum_log_S, sum_nis, count) per filter
+    (None unless innovation_stats). Only updates with a valid S are counted,
+    and with count_from only steps k >= count_from.
+
+    With precision="plc_real" every state, input and tuning value is float32
+    (the AOI's REAL) and an update runs whenever S > 0.0, exactly as the AOI
+    tests it, so an overflowing filter diverges here the way it would on the
+    controller.
+    """
+    plc = precision == "plc_real"
+    ftype = np.float32 if plc else float
+    if plc:
+        x = np.asarray(x, dtype=np.float32)
+        dt_all = np.asarray(dt_all, dtype=np.float32)
+
+    n = len(x)
+    r_x = c["r_x"].astype(ftype)
+    q_x = c["q_x"].astype(ftype)
+    q_x_dot = c["q_x_dot"].astype(ftype)
+    bleed_enable = c["bleed_enable"]
+    bleed_thresh = c["bleed_thresh"].astype(ftype)
+    bleed_factor = c["bleed_factor"].astype(ftype)
+    any_bleed = bool(np.any(bleed_enable))
+
+    shape = np.broadcast_shapes(x.shape[1:], dt_all.shape[1:], r_x.shape)
+    shared_dt = dt_all.ndim == 1
+
+    y = np.empty((n, *shape), dtype=ftype) if keep_outputs else None
+    y_dot = np.empty((n, *shape), dtype=ftype) if keep_outputs else None
+
+    sum_log_S = np.zeros(shape, dtype=float)
+    sum_nis = np.zeros(shape, dtype=float)
+    count = np.zeros(shape, dtype=float)
+    count_until = 0 if count_from is None else int(np.max(count_from))
+
+    if n == 0:
+        # empty trace: empty outputs, like run_procedural_kalman
+        return y, y_dot, ((sum_log_S, sum_nis, count) if innovation_stats else None)
+
+    # --- init ---
+    x_pred = np.broadcast_to(x[0], shape).astype(ftype)
+    x_dot_pred = np.zeros(shape, dtype=ftype)
+
+    # P10 is seeded from p01 and re-forced to P01 after every update,
+    # so a single P01 array carries both off-diagonal terms.
+    P00 = np.broadcast_to(c["p00"], shape).astype(ftype)
+    P01 = np.broadcast_to(c["p01"], shape).astype(ftype)
+    P11 = np.broadcast_to(c["p11"], shape).astype(ftype)
+
+    if keep_outputs:
+        y[0] = x_pred
+        y_dot[0] = x_dot_pred
+
+    dt_ok = np.isfinite(dt_all) & (dt_all > 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for k in range(1, n):
+            xk = x[k]
+            dt_ok_k = dt_ok[k - 1]
+            if shared_dt:
+                if not dt_ok_k:
+                    # pass-through
+                    if keep_outputs:
+                        y[k] = xk
+                        y_dot[k] = 0.0
+                    continue
+                all_dt_ok = True
+            else:
+                all_dt_ok = bool(dt_ok_k.all())
+            dt_s = dt_all[k - 1]
+
+            # PREDICT
+            x_prev = x_pred
+            x_pred = x_pred + dt_s * x_dot_pred
+
+            xcov00 = (P00 + dt_s * P01) + dt_s * (P01 + dt_s * P11)
+            xcov01 = P01 + dt_s * P11
+            xcov00 = xcov00 + q_x
+            xcov11 = P11 + q_x_dot
+
+            # UPDATE
+            y_res = xk - x_pred
+            S = xcov00 + r_x
+            ok = (S > 0.0) if plc else (S > 0.0) & np.isfinite(S)
+            if not all_dt_ok:
+                ok = ok & dt_ok_k
 
-        if S > 0.0 and np.isfinite(S):
             K0 = xcov00 / S
-            K1 = xcov10 / S
+            K1 = xcov01 / S
+
+            x_upd = x_pred + K0 * y_res
+            x_dot_upd = x_dot_pred + K1 * y_res
+
+            if any_bleed:
+                bleed = bleed_enable & (np.abs(xk - x_upd) < bleed_thresh)
+                x_dot_upd = np.where(bleed, x_dot_upd * bleed_factor, x_dot_upd)
+
+            P00_upd = (1.0 - K0) * xcov00
+            P01_upd = (1.0 - K0) * xcov01
+            P11_upd = xcov11 - K1 * xcov01
+
+            if innovation_stats:
+                log_S = np.log(S)
+                nis = y_res * y_res / S
+                counted = ok
+                if k < count_until:
+                    counted = counted & (k >= count_from)
+
+            if ok.all():
+                x_pred = x_upd
+                x_dot_pred = x_dot_upd
+                P00, P01, P11 = P00_upd, P01_upd, P11_upd
+            else:
+                if not all_dt_ok:
+                    # pass-through filters skip the predict as well
+                    x_pred = np.where(dt_ok_k, x_pred, x_prev)
+                x_pred = np.where(ok, x_upd, x_pred)
+                x_dot_pred = np.where(ok, x_dot_upd, x_dot_pred)
+                P00 = np.where(ok, P00_upd, P00)
+                P01 = np.where(ok, P01_upd, P01)
+                P11 = np.where(ok, P11_upd, P11)
+
+            if innovation_stats:
+                if counted is ok and ok.all():
+                    sum_log_S += log_S
+                    sum_nis += nis
+                    count += 1.0
+                else:
+                    sum_log_S += np.where(counted, log_S, 0.0)
+                    sum_nis += np.where(counted, nis, 0.0)
+                    count += counted
+
+            if keep_outputs:
+                if all_dt_ok:
+                    y[k] = x_pred
+                    y_dot[k] = x_dot_pred
+                else:
+                    y[k] = np.where(dt_ok_k, x_pred, xk)
+                    y_dot[k] = np.where(dt_ok_k, x_dot_pred, 0.0)
+
+    stats = (sum_log_S, sum_nis, count) if innovation_stats else None
+    return y, y_dot, stats
+
+
+def run_kalman_batch(
+    t_s: np.ndarray,
+    x: np.ndarray,
+    cfgs: Sequence[KalmanRunConfig],
+    *,
+    precision: KalmanPrecision = "float64",
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Run many tunings over the same signal in one pass along the time axis.
+
+    Every filter is advanced together as a NumPy vector of length n_cfg, using
+    the exact operation order of run_procedural_kalman, so each row matches the
+    scalar AOI output bit-for-bit.
+
+    Returns (y, y_dot) arrays of shape (n_cfg, N). They are transposed views of
+    (N, n_cfg) buffers (each time step writes one contiguous row).
+
+    precision: as in run_procedural_kalman ("plc_real" gives float32 rows).
+    """
+    _check_precision(precision)
+    cfgs = list(cfgs)
+    n = len(x)
+    if len(cfgs) == 0:
+        return np.empty((0, n), dtype=float), np.empty((0, n), dtype=float)
 
-            x_pred = x_pred + (K0 * y_res)
-            x_dot_pred = x_dot_pred + (K1 * y_res)
+    dt_all = _dt_for(t_s, precision)
+    y, y_dot, _ = _kalman_batch_core(dt_all, np.asarray(x), _cfg_arrays(cfgs), precision=precision)
+    return y.T, y_dot.T
 
-            if cfg.bleed_enable:
-                if abs(x[k] - x_pred) < cfg.bleed_thresh:
-                    x_dot_pred = x_dot_pred * cfg.bleed_factor
 
-            # covariance update
-            P00 = (1.0 - K0) * xcov00
-            P01 = (1.0 - K0) * xcov01
-            P10 = xcov10 - (K1 * xcov00)
-            P11 = xcov11 - (K1 * xcov01)
+def run_kalman_channels(
+    t_s: np.ndarray,
+    x: np.ndarray,
+    cfgs: KalmanRunConfig | Sequence[KalmanRunConfig],
+    *,
+    precision: KalmanPrecision = "float64",
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Filter many channels that share one time base in a single sweep.
 
-            # enforce symmetry
-            P10 = P01
+    x is (N, C); cfgs is one config for every channel or one per channel.
+    All channels advance together as length-C vectors with the operation order
+    of run_procedural_kalman, so each column matches the scalar AOI run on
+    that channel bit-for-bit.
 
-        y[k] = x_pred
-        y_dot[k] = x_dot_pred
+    Returns (y, y_dot), each (N, C). precision: as in run_procedural_kalman
+    ("plc_real" keeps the whole (N, C) sweep in float32).
+    """
+    _check_precision(precision)
+    x = np.asarray(x, dtype=np.float32 if precision == "plc_real" else float)
+    if x.ndim != 2:
+        raise ValueError("x must be a 2-D (N, C) array")
+    n, n_ch = x.shape
 
+    cfgs = [cfgs] if isinstance(cfgs, KalmanRunConfig) else list(cfgs)
+    if len(cfgs) not in (1, n_ch):
+        raise ValueError(f"expected 1 or {n_ch} configs, got {len(cfgs)}")
+
+    if n == 0 or n_ch == 0:
+        return np.empty((n, n_ch), dtype=float), np.empty((n, n_ch), dtype=float)
+
+    dt_all = _dt_for(t_s, precision)
+    y, y_dot, _ = _kalman_batch_core(dt_all, x, _cfg_arrays(cfgs), precision=precision)
     return y, y_dot
+
+
+def _likelihood_windows(n: int, window: int, burn_in: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Start index and first counted step of each overlapping window of length
+    window + burn_in. Window 0 counts from its first sample; every later window
+    warms up for burn_in samples. Counted regions tile [0, n) exactly once.
+    """
+    length = window + burn_in
+    starts = list(range(0, n - length + 1, window))
+    first = [0] + [burn_in] * (len(starts) - 1)
+    covered = starts[-1] + length
+    if covered < n:
+        starts.append(n - length)
+        first.append(covered - (n - length))
+    return np.asarray(starts), np.asarray(first)
+
+
+def run_kalman_batch_likelihood(
+    t_s: np.ndarray,
+    x: np.ndarray,
+    cfgs: Sequence[KalmanRunConfig],
+    *,
+    window: Optional[int] = None,
+    burn_in: int = 512,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Innovation statistics for many tunings, without keeping the estimates.
+
+    Returns (nll, mean_nis) per config:
+      nll      = 0.5 * sum( log(2*pi*S) + y_res^2 / S )   (negative log-likelihood)
+      mean_nis = mean( y_res^2 / S )                      (≈ 1 for a consistent filter)
+    Configs with no valid update get nll = inf, mean_nis = nan.
+
+    window: if set (and the signal is longer than window + burn_in), the signal
+    is cut into overlapping windows that are all filtered together, each one
+    warmed up over burn_in samples before its innovations are counted. This
+    trades the exact sequential pass for ~N / window fewer Python steps; the
+    result differs from the full pass only by what the filter has not
+    forgotten after burn_in samples.
+    """
+    cfgs = list(cfgs)
+    if len(cfgs) == 0:
+        return np.empty(0, dtype=float), np.empty(0, dtype=float)
+
+    t_s = np.asarray(t_s, dtype=float)
+    x = np.asarray(x, dtype=float)
+    c = _cfg_arrays(cfgs)
+
+    n = len(x)
+    if window is None or n <= int(window) + int(burn_in):
+        _, _, (sum_log_S, sum_nis, count) = _kalman_batch_core(
+            np.diff(t_s), x, c, keep_outputs=False, innovation_stats=True
+        )
+    else:
+        starts, first = _likelihood_windows(n, int(window), int(burn_in))
+        idx = starts[None, :] + np.arange(int(window) + int(burn_in))[:, None]   # (L, n_win)
+        t_w = t_s[idx]
+        x_w = x[idx][:, :, None]
+        dt_w = np.diff(t_w, axis=0)[:, :, None]
+        _, _, (sum_log_S, sum_nis, count) = _kalman_batch_core(
+            dt_w, x_w, c, keep_outputs=False, innovation_stats=True, count_from=first[:, None]
+        )
+        sum_log_S = sum_log_S.sum(axis=0)
+        sum_nis = sum_nis.sum(axis=0)
+        count = count.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        nll = 0.5 * (sum_log_S + count * np.log(2.0 * np.pi) + sum_nis)
+        mean_nis = sum_nis / count
+    nll = np.where((count > 0) & np.isfinite(nll), nll, np.inf)
+    return nll, mean_nis
@@ -1,34 +1,47 @@
 from __future__ import annotations
 
-import csv
+import math
 import os
-import random
+from typing import Callable, Iterator, Optional, Protocol
 
-from models.signal_generator import RampHoldProfile
+import numpy as np
 
+from models.signal_generator import RampHoldProfile
+from .helpers import write_csv_blocks
 
-def ramp_hold_value(profile: RampHoldProfile, t_ms: int) -> float:
-    period = profile.T_UP_MS + profile.T_HOLD_HI_MS + profile.T_DOWN_MS + profile.T_HOLD_LO_MS
-    u = t_ms % period
+# Noise is drawn in canonical blocks of this many samples, block k from
+# default_rng([rng_seed, k]). Any output chunking slices those blocks, so the
+# signal is identical whatever block_samples the caller streams with.
+NOISE_BLOCK_SAMPLES = 1 << 16
 
-    if u < profile.T_UP_MS:
-        frac = u / max(profile.T_UP_MS, 1)
-        return profile.X_LO + frac * (profile.X_HI - profile.X_LO)
 
-    u -= profile.T_UP_MS
-    if u < profile.T_HOLD_HI_MS:
-        return profile.X_HI
+def ramp_hold_values(profile: RampHoldProfile, t_ms: np.ndarray) -> np.ndarray:
+    """
+    Noise-free ramp/hold/ramp/hold waveform at times t_ms (vectorized
+    ramp_hold_value: one modulo over the whole index array, then np.select).
+    Integer t_ms is handled exactly; float t_ms allows sub-ms sample times.
+    """
+    t_up, t_hi = profile.T_UP_MS, profile.T_HOLD_HI_MS
+    t_down, t_lo = profile.T_DOWN_MS, profile.T_HOLD_LO_MS
+    period = t_up + t_hi + t_down + t_lo
 
-    u -= profile.T_HOLD_HI_MS
-    if u < profile.T_DOWN_MS:
-        frac = u / max(profile.T_DOWN_MS, 1)
-        return profile.X_HI - frac * (profile.X_HI - profile.X_LO)
+    u = np.asarray(t_ms) % period
+    span = profile.X_HI - profile.X_LO
+    u_down = u - (t_up + t_hi)
 
-    return profile.X_LO
+    return np.select(
+        [u < t_up, u < t_up + t_hi, u < t_up + t_hi + t_down],
+        [
+            profile.X_LO + (u / max(t_up, 1)) * span,
+            profile.X_HI,
+            profile.X_HI - (u_down / max(t_down, 1)) * span,
+        ],
+        default=profile.X_LO,
+    )
 
 
-def gaussian_noise(sigma: float, rng: random.Random) -> float:
-    return rng.gauss(0.0, sigma)
+def ramp_hold_value(profile: RampHoldProfile, t_ms: int) -> float:
+    return float(ramp_hold_values(profile, np.array([t_ms]))[0])
 
 
 def get_app_dir() -> str:
@@ -36,38 +49,239 @@ def get_app_dir() -> str:
     return os.path.dirname(os.path.abspath(__file__ + "/.."))  # services/.. -> app dir
 
 
-def generate_signal_csv(
+class SignalSink(Protocol):
+    """Anything that consumes (t, x) chunks, e.g. KalmanObserver."""
+
+    def push_many(self, t_arr: np.ndarray, x_arr: np.ndarray): ...
+
+
+def signal_sample_count(dt_ms: float, seconds: float) -> int:
+    if dt_ms <= 0:
+        raise ValueError("dt_ms must be > 0")
+    if seconds < 0:
+        raise ValueError("seconds must be >= 0")
+    # small tolerance so e.g. 0.3 s / 0.1 ms is not cut short by float error
+    return int(math.floor(float(seconds) * 1000.0 / float(dt_ms) + 1e-9))
+
+
+def iter_signal_blocks(
     *,
-    out_filename: str = "signal.csv",
-    dt_ms: int = 50,
-    seconds: int = 20,
+    dt_ms: float = 50,
+    seconds: float = 20,
     profile: RampHoldProfile = RampHoldProfile(),
     noise_amp: float = 10.0,
     rng_seed: int = 12345,
     time_unit_seconds: bool = True,
-) -> str:
+    block_samples: int = NOISE_BLOCK_SAMPLES,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
     """
-    Writes CSV to the app dir (same directory that contains kalman_ui.py).
-    Returns absolute path to the written file.
+    Yield (t, x) chunks of at most block_samples samples covering the whole
+    signal, so arbitrarily long signals never sit in memory at once.
+
+    Sample i is at t = i * dt_ms (no accumulated drift). Output does not
+    depend on block_samples: noise comes from fixed NOISE_BLOCK_SAMPLES blocks
+    seeded with (rng_seed, block index).
     """
-    app_dir = get_app_dir()
-    out_path = os.path.join(app_dir, out_filename)
+    block_samples = int(block_samples)
+    if block_samples <= 0:
+        raise ValueError("block_samples must be > 0")
 
+    total_samples = signal_sample_count(dt_ms, seconds)
+    dt = int(dt_ms) if float(dt_ms).is_integer() else float(dt_ms)
     sigma_x = float(noise_amp) / 3.0  # 99.7% within +/- noise_amp
-    rng = random.Random(int(rng_seed))
+    noise = _BlockNoise(int(rng_seed), sigma_x)
+
+    for i0 in range(0, total_samples, block_samples):
+        i1 = min(i0 + block_samples, total_samples)
+        t_ms = np.arange(i0, i1, dtype=np.int64) * dt
 
-    total_samples = int((int(seconds) * 1000) / int(dt_ms))
+        x = ramp_hold_values(profile, t_ms)
+        x += noise.samples(i0, i1)
 
-    with open(out_path, "w", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(["time", "x"])
+        t = (t_ms / 1000.0) if time_unit_seconds else t_ms.astype(float)
+        yield t, x
 
-        for i in range(total_samples):
-            t_ms = i * int(dt_ms)
-            x_true = ramp_hold_value(profile, t_ms)
-            x_meas = x_true + gaussian_noise(sigma_x, rng)
 
-            t_out = (t_ms / 1000.0) if time_unit_seconds else float(t_ms)
-            w.writerow([f"{t_out:.6f}", f"{x_meas:.6f}"])
+class _BlockNoise:
+    """Gaussian noise for any sample range, built from the canonical blocks."""
+
+    def __init__(self, seed: int, sigma: float):
+        self.seed = seed
+        self.sigma = sigma
+        self._k = -1
+        self._block = np.empty(0)
+
+    def _get(self, k: int) -> np.ndarray:
+        if k != self._k:
+            rng = np.random.default_rng([self.seed, k])
+            self._block = rng.normal(0.0, self.sigma, size=NOISE_BLOCK_SAMPLES)
+            self._k = k
+        return self._block
+
+    def samples(self, i0: int, i1: int) -> np.ndarray:
+        out = np.empty(i1 - i0, dtype=float)
+        i = i0
+        while i < i1:
+            k, j = divmod(i, NOISE_BLOCK_SAMPLES)
+            m = min(NOISE_BLOCK_SAMPLES - j, i1 - i)
+            out[i - i0:i - i0 + m] = self._get(k)[j:j + m]
+            i += m
+        return out
+
+
+def generate_signal_series(
+    *,
+    dt_ms: float = 50,
+    seconds: float = 20,
+    profile: RampHoldProfile = RampHoldProfile(),
+    noise_amp: float = 10.0,
+    rng_seed: int = 12345,
+    time_unit_seconds: bool = True,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Whole (t, x) arrays of the signal iter_signal_blocks streams (same
+    samples). t is in seconds, or milliseconds if not time_unit_seconds.
+    """
+    n = signal_sample_count(dt_ms, seconds)
+    t = np.empty(n, dtype=float)
+    x = np.empty(n, dtype=float)
+    i = 0
+    for t_b, x_b in iter_signal_blocks(
+        dt_ms=dt_ms,
+        seconds=seconds,
+        profile=profile,
+        noise_amp=noise_amp,
+        rng_seed=rng_seed,
+        time_unit_seconds=time_unit_seconds,
+    ):
+        t[i:i + len(t_b)] = t_b
+        x[i:i + len(x_b)] = x_b
+        i += len(t_b)
+    return t, x
+
+
+def write_signal_csv(
+    out_path: str,
+    *,
+    dt_ms: float = 50,
+    seconds: float = 20,
+    profile: RampHoldProfile = RampHoldProfile(),
+    noise_amp: float = 10.0,
+    rng_seed: int = 12345,
+    time_unit_seconds: bool = True,
+    block_samples: int = NOISE_BLOCK_SAMPLES,
+) -> str:
+    """Stream the signal as time,x CSV (6 decimals) to out_path."""
+    blocks = iter_signal_blocks(
+        dt_ms=dt_ms,
+        seconds=seconds,
+        profile=profile,
+        noise_amp=noise_amp,
+        rng_seed=rng_seed,
+        time_unit_seconds=time_unit_seconds,
+        block_samples=block_samples,
+    )
+    with open(out_path, "wb") as f:
+        write_csv_blocks(f, ["time", "x"], blocks, decimals=6)
+    return out_path
+
 
+def write_signal_npy(
+    out_path: str,
+    *,
+    dt_ms: float = 50,
+    seconds: float = 20,
+    profile: RampHoldProfile = RampHoldProfile(),
+    noise_amp: float = 10.0,
+    rng_seed: int = 12345,
+    time_unit_seconds: bool = True,
+    block_samples: int = NOISE_BLOCK_SAMPLES,
+) -> str:
+    """
+    Stream the signal into an (n, 2) float64 .npy file ([:, 0] = t,
+    [:, 1] = x) through a write memmap; np.load(out_path, mmap_mode="r")
+    reads it back without loading it.
+    """
+    n = signal_sample_count(dt_ms, seconds)
+    out = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.float64, shape=(n, 2))
+    try:
+        i = 0
+        for t, x in iter_signal_blocks(
+            dt_ms=dt_ms,
+            seconds=seconds,
+            profile=profile,
+            noise_amp=noise_amp,
+            rng_seed=rng_seed,
+            time_unit_seconds=time_unit_seconds,
+            block_samples=block_samples,
+        ):
+            out[i:i + len(t), 0] = t
+            out[i:i + len(t), 1] = x
+            i += len(t)
+        out.flush()
+    finally:
+        del out
     return out_path
+
+
+def feed_signal(
+    sink: SignalSink,
+    *,
+    dt_ms: float = 50,
+    seconds: float = 20,
+    profile: RampHoldProfile = RampHoldProfile(),
+    noise_amp: float = 10.0,
+    rng_seed: int = 12345,
+    time_unit_seconds: bool = True,
+    block_samples: int = NOISE_BLOCK_SAMPLES,
+    on_block: Optional[Callable[[np.ndarray, np.ndarray, object], None]] = None,
+) -> int:
+    """
+    Push the signal block by block into sink.push_many(t, x) (e.g. a
+    KalmanObserver for soak tests; use time_unit_seconds=True for it).
+    on_block(t, x, result) sees each block and whatever push_many returned.
+    Returns the number of samples pushed.
+    """
+    n = 0
+    for t, x in iter_signal_blocks(
+        dt_ms=dt_ms,
+        seconds=seconds,
+        profile=profile,
+        noise_amp=noise_amp,
+        rng_seed=rng_seed,
+        time_unit_seconds=time_unit_seconds,
+        block_samples=block_samples,
+    ):
+        result = sink.push_many(t, x)
+        if on_block is not None:
+            on_block(t, x, result)
+        n += len(t)
+    return n
+
+
+def generate_signal_csv(
+    *,
+    out_filename: str = "signal.csv",
+    dt_ms: float = 50,
+    seconds: float = 20,
+    profile: RampHoldProfile = RampHoldProfile(),
+    noise_amp: float = 10.0,
+    rng_seed: int = 12345,
+    time_unit_seconds: bool = True,
+) -> str:
+    """
+    Writes CSV to the app dir (same directory that contains kalman_ui.py),
+    streamed block by block. Returns absolute path to the written file.
+    """
+    app_dir = get_app_dir()
+    out_path = os.path.join(app_dir, out_filename)
+
+    return write_signal_csv(
+        out_path,
+        dt_ms=dt_ms,
+        seconds=seconds,
+        profile=profile,
+        noise_amp=noise_amp,
+        rng_seed=rng_seed,
+        time_unit_seconds=time_unit_seconds,
+    )
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from typing import Any, Mapping, Optional, Sequence
+
+import numpy as np
+
+from models.step_response_generator import (
+    FOPDTParams,
+    IPDTParams,
+    SOPDTUnderdampedParams,
+    StepSpec,
+    ActuatorParams,
+    StepBatchResult,
+)
+from .helpers import batch_state_space_filter, zoh_discretize
+from .step_response_generator_service import PVModelType, make_step_cv, actuator_block
+
+_MODEL_PARAMS = {
+    "FOPDT": FOPDTParams,
+    "IPDT": IPDTParams,
+    "SOPDT_UNDERDAMPED": SOPDTUnderdampedParams,
+}
+
+_METRICS = ("final_value", "rise_time_s", "overshoot_pct", "settling_time_s")
+
+
+def simulate_step_batch(
+    *,
+    spec: StepSpec,
+    model: PVModelType,
+    actuator: ActuatorParams,
+    params: Mapping[str, Any],
+    actuator_params: Optional[Mapping[str, Any]] = None,
+    base: FOPDTParams | IPDTParams | SOPDTUnderdampedParams | None = None,
+    keep_trajectories: bool = False,
+    percentiles: Sequence[float] = (5.0, 50.0, 95.0),
+    settle_band: float = 0.02,
+    shard_runs: int = 256,
+    workers: Optional[int] = None,
+) -> StepBatchResult:
+    """
+    Monte Carlo / sweep version of simulate_step_response.
+
+    params: model parameter columns by field name (e.g. {"K": K_arr,
+    "tau_s": tau_arr, "theta_s": 0.2}); arrays have one value per run,
+    scalars apply to every run, missing fields come from `base` (or the
+    model defaults). actuator_params: the same for ActuatorParams fields,
+    overriding `actuator`.
+
+    Runs are simulated shard_runs at a time as (runs, N) arrays: plants with
+    per-run exact ZOH matrices through one batched recurrence, deadtime as a
+    per-run linear-interpolated gather (same as DelayLine), the actuator once
+    per distinct actuator setting. With workers > 1 shards go to a process
+    pool.
+
+    Only per-run metrics are kept (rise time 10-90 %, overshoot, settling
+    time within settle_band of the final value, all relative to the step
+    time) plus their percentiles; PV trajectories are returned only with
+    keep_trajectories.
+    """
+    if model not in _MODEL_PARAMS:
+        raise ValueError(f"Unknown model: {model}")
+
+    base = base or _MODEL_PARAMS[model]()
+    model_cols = _param_columns(base, params, "params")
+    act_cols = _param_columns(actuator, actuator_params or {}, "actuator_params")
+    n_runs = _run_count(model_cols, act_cols)
+
+    dt_s = max(float(spec.dt_s), 1e-6)
+    n = int(round(float(spec.duration_s) / dt_s)) + 1
+    if n < 2:
+        raise ValueError("duration_s must be >= dt_s")
+    t = np.linspace(0.0, float(spec.duration_s), n)
+
+    shard_runs = max(int(shard_runs), 1)
+    bounds = [(i, min(i + shard_runs, n_runs)) for i in range(0, n_runs, shard_runs)]
+    jobs = [
+        (spec, model, _slice_columns(model_cols, i0, i1, n_runs), _slice_columns(act_cols, i0, i1, n_runs),
+         i1 - i0, keep_trajectories, float(settle_band))
+        for i0, i1 in bounds
+    ]
+
+    if workers is not None and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=int(workers)) as pool:
+            parts = list(pool.map(_simulate_shard, *zip(*jobs)))
+    else:
+        parts = [_simulate_shard(*job) for job in jobs]
+
+    metrics = {name: np.concatenate([p[name] for p in parts]) for name in _METRICS}
+    q = np.asarray(percentiles, dtype=float)
+    summary = {name: _nan_percentiles(values, q) for name, values in metrics.items()}
+    pv = np.concatenate([p["pv"] for p in parts]) if keep_trajectories else None
+
+    return StepBatchResult(
+        model=model,
+        n_runs=n_runs,
+        t=t,
+        percentiles=q,
+        summary=summary,
+        pv=pv,
+        settle_band=float(settle_band),
+        **metrics,
+    )
+
+
+# ----------------------------
+# parameter matrix
+# ----------------------------
+
+def _param_columns(base: Any, overrides: Mapping[str, Any], what: str) -> dict[str, np.ndarray]:
+    names = [f.name for f in fields(base)]
+    unknown = set(overrides) - set(names)
+    if unknown:
+        raise ValueError(f"Unknown {what} fields: {sorted(unknown)} (expected {names})")
+
+    cols = {}
+    for name in names:
+        value = np.asarray(overrides.get(name, getattr(base, name)), dtype=float)
+        if value.ndim > 1:
+            raise ValueError(f"{what}[{name!r}] must be a scalar or 1-D array")
+        cols[name] = value
+    return cols
+
+
+def _run_count(*col_sets: dict[str, np.ndarray]) -> int:
+    lengths = {len(v) for cols in col_sets for v in cols.values() if v.ndim == 1}
+    if len(lengths) > 1:
+        raise ValueError(f"Parameter arrays differ in length: {sorted(lengths)}")
+    n_runs = lengths.pop() if lengths else 1
+    if n_runs < 1:
+        raise ValueError("Need at least one run")
+    return n_runs
+
+
+def _slice_columns(cols: dict[str, np.ndarray], i0: int, i1: int, n_runs: int) -> dict[str, np.ndarray]:
+    return {name: (v[i0:i1] if v.ndim == 1 else np.full(i1 - i0, float(v))) for name, v in cols.items()}
+
+
+# ----------------------------
+# one shard (module level: runs in worker processes)
+# ----------------------------
+
+def _simulate_shard(
+    spec: StepSpec,
+    model: PVModelType,
+    model_cols: dict[str, np.ndarray],
+    act_cols: dict[str, np.ndarray],
+    runs: int,
+    keep_trajectories: bool,
+    settle_band: float,
+) -> dict[str, np.ndarray]:
+    dt_s = max(float(spec.dt_s), 1e-6)
+    n = int(round(float(spec.duration_s) / dt_s)) + 1
+    t = np.linspace(0.0, float(spec.duration_s), n)
+    cv_cmd = make_step_cv(t, spec)
+
+    # actuator: one pass per distinct setting, then gathered per run
+    act_names = list(act_cols)
+    act_matrix = np.column_stack([act_cols[name] for name in act_names])
+    settings, which = np.unique(act_matrix, axis=0, return_inverse=True)
+    cv_eff = np.empty((len(settings), n), dtype=float)
+    for i, row in enumerate(settings):
+        cv_eff[i] = actuator_block(cv_cmd, dt_s, ActuatorParams(**dict(zip(act_names, row))))
+    u = cv_eff[np.asarray(which).reshape(-1)] - float(spec.cv0)
+
+    u_d = _delay_rows(u, np.maximum(model_cols["theta_s"], 0.0) / dt_s)
+
+    A, B = _plant_matrices(model, model_cols)
+    Ad = np.empty_like(A)
+    Bd = np.empty_like(B)
+    for r in range(runs):
+        Ad[r], Bd_r = zoh_discretize(A[r], B[r], dt_s)
+        Bd[r] = Bd_r[:, 0]
+
+    # ZOH timing as in simulate_step_response: y[k] is driven by u[0..k-1]
+    u_prev = np.zeros_like(u_d)
+    u_prev[:, 1:] = u_d[:, :-1]
+    y = batch_state_space_filter(Ad, Bd, u_prev)[:, :, 0]
+
+    out = _step_metrics(t, y, float(spec.t_step_s), settle_band)
+    if keep_trajectories:
+        out["pv"] = act_cols["pv0"][:, None] + y
+    return out
+
+
+def _plant_matrices(model: PVModelType, cols: dict[str, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    K = cols["K"]
+    R = len(K)
+    if model == "FOPDT":
+        tau = np.maximum(cols["tau_s"], 1e-9)
+        return (-1.0 / tau).reshape(R, 1, 1), (K / tau).reshape(R, 1)
+    if model == "IPDT":
+        leak = cols["leak_tau_s"]
+        a = np.where(leak > 1e-9, -1.0 / np.where(leak > 1e-9, leak, 1.0), 0.0)
+        return a.reshape(R, 1, 1), K.reshape(R, 1)
+
+    zeta = cols["zeta"]
+    wn = np.maximum(cols["wn"], 1e-6)
+    A = np.zeros((R, 2, 2))
+    A[:, 0, 1] = 1.0
+    A[:, 1, 0] = -(wn * wn)
+    A[:, 1, 1] = -2.0 * zeta * wn
+    B = np.zeros((R, 2))
+    B[:, 1] = K * wn * wn
+    return A, B
+
+
+def _delay_rows(u: np.ndarray, delay: np.ndarray) -> np.ndarray:
+    """Per-row constant delay in samples, interpolated like DelayLine('linear')."""
+    R, n = u.shape
+    d_round = np.rint(delay)
+    d = np.where(np.abs(delay - d_round) < 1e-9, d_round, delay)[:, None]
+    k = np.arange(n)[None, :]
+    p = np.maximum(k - d, 0.0)
+    i0 = np.floor(p).astype(np.int64)
+    f = p - i0
+    i1 = np.minimum(i0 + 1, k)
+    return (1.0 - f) * np.take_along_axis(u, i0, axis=1) + f * np.take_along_axis(u, i1, axis=1)
+
+
+def _first_true(mask: np.ndarray) -> np.ndarray:
+    """Index of the first True per row, -1 where none."""
+    idx = np.argmax(mask, axis=1)
+    return np.where(mask[np.arange(len(mask)), idx], idx, -1)
+
+
+def _step_metrics(t: np.ndarray, y: np.ndarray, t_step_s: float, band: float) -> dict[str, np.ndarray]:
+    R, n = y.shape
+    final = y[:, -1].copy()
+    nan = np.full(R, np.nan)
+
+    ok = np.abs(final) > 1e-12
+    scale = np.where(ok, final, 1.0)[:, None]
+    yn = y / scale  # normalized: 0 before the step, 1 at the final value
+
+    after = (t >= t_step_s)[None, :]
+    i10 = _first_true((yn >= 0.1) & after)
+    i90 = _first_true((yn >= 0.9) & after)
+    rise = np.where(ok & (i10 >= 0) & (i90 >= 0), t[i90] - t[np.maximum(i10, 0)], nan)
+
+    peak = np.max(np.where(after, yn, -np.inf), axis=1)
+    overshoot = np.where(ok, np.maximum(peak - 1.0, 0.0) * 100.0, nan)
+
+    outside = (np.abs(yn - 1.0) > band) & after
+    # last sample outside the band; settled from the sample after it
+    last_out = n - 1 - _first_true(outside[:, ::-1])
+    last_out = np.where(outside.any(axis=1), last_out, -1)
+    i_step = int(np.searchsorted(t, t_step_s, side="left"))
+    settled = np.where(last_out < 0, i_step, last_out + 1)
+    settle = np.where(ok & (settled < n), t[np.minimum(settled, n - 1)] - t_step_s, nan)
+
+    return {
+        "final_value": final,
+        "rise_time_s": rise,
+        "overshoot_pct": overshoot,
+        "settling_time_s": settle,
+    }
+
+
+def _nan_percentiles(values: np.ndarray, q: np.ndarray) -> np.ndarray:
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return np.full(len(q), np.nan)
+    return np.percentile(finite, q)
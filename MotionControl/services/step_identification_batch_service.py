@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import csv
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Optional, Sequence
+
+from models.step_response_tuning import AutoSelectionPolicy, StepBatchIdRecord
+from .step_identification_service import (
+    PVModelType,
+    IdentifyMethod,
+    load_step_csv,
+    auto_select_spans,
+    identify,
+)
+
+# summary table layout: one row per file, model parameters that a model does
+# not have are left empty
+_PARAM_COLUMNS = ("K", "tau_s", "zeta", "wn")
+SUMMARY_COLUMNS = (
+    "path", "status", "error", "model", "method", "n_samples", "dt_s",
+    "t_step_s", "theta_s", "du", "dy", *_PARAM_COLUMNS,
+    "rmse", "n_fit", "n_iter", "load_s", "identify_s", "total_s",
+)
+
+
+def identify_batch(
+    paths: Sequence[str],
+    model: PVModelType,
+    selection_policy: Optional[AutoSelectionPolicy] = None,
+    *,
+    method: IdentifyMethod = "heuristic",
+    time_unit: str = "s",
+    use_cache: bool = True,
+    summary_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    on_record: Optional[Callable[[StepBatchIdRecord], None]] = None,
+) -> list[StepBatchIdRecord]:
+    """
+    Headless Step Response Tuner over many logs: each file is loaded
+    (load_step_csv), its spans chosen by auto_select_spans with
+    selection_policy, and identified with `method`.
+
+    Files run on a process pool when workers > 1. A file that fails (bad
+    CSV, no step, fit error, even a crashed worker) yields a record with
+    `error` set instead of stopping the batch.
+
+    Records are streamed as they complete: appended to summary_path (CSV, or
+    Parquet for a .parquet/.pq suffix, which needs pyarrow) and passed to
+    on_record. The returned list is in the order of `paths`.
+    """
+    if model not in ("FOPDT", "IPDT", "SOPDT_UNDERDAMPED"):
+        raise ValueError(f"Unknown model: {model}")
+    if method not in ("heuristic", "least_squares"):
+        raise ValueError(f"Unknown identification method: {method}")
+
+    paths = [os.fspath(p) for p in paths]
+    policy = selection_policy or AutoSelectionPolicy()
+    args = (model, policy, method, time_unit, use_cache)
+    records: list[Optional[StepBatchIdRecord]] = [None] * len(paths)
+
+    writer = _SummaryWriter(summary_path) if summary_path else None
+    try:
+        def emit(i: int, rec: StepBatchIdRecord) -> None:
+            records[i] = rec
+            if writer is not None:
+                writer.write(rec)
+            if on_record is not None:
+                on_record(rec)
+
+        if workers is not None and workers > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=int(workers)) as pool:
+                futures = {pool.submit(_identify_file, p, *args): i for i, p in enumerate(paths)}
+                for fut in as_completed(futures):
+                    i = futures[fut]
+                    try:
+                        rec = fut.result()
+                    except Exception as e:
+                        rec = StepBatchIdRecord(path=paths[i], model=model, method=method, error=_describe(e))
+                    emit(i, rec)
+        else:
+            for i, p in enumerate(paths):
+                emit(i, _identify_file(p, *args))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return [r for r in records if r is not None]
+
+
+def _identify_file(
+    path: str,
+    model: PVModelType,
+    policy: AutoSelectionPolicy,
+    method: IdentifyMethod,
+    time_unit: str,
+    use_cache: bool,
+) -> StepBatchIdRecord:
+    # module level: runs in worker processes; only the small record goes back
+    t0 = time.perf_counter()
+    load_s = float("nan")
+    try:
+        ts = load_step_csv(path, time_unit=time_unit, use_cache=use_cache)
+        t1 = time.perf_counter()
+        load_s = t1 - t0
+        sel = auto_select_spans(ts, model, policy)
+        res, _ = identify(ts, sel, model, method=method)
+    except Exception as e:
+        return StepBatchIdRecord(
+            path=path, model=model, method=method, error=_describe(e),
+            load_s=load_s, total_s=time.perf_counter() - t0,
+        )
+
+    t2 = time.perf_counter()
+    return StepBatchIdRecord(
+        path=path,
+        model=res.model,
+        method=res.method,
+        n_samples=int(len(ts.t)),
+        dt_s=float(ts.dt_s),
+        t_step_s=res.t_step_s,
+        theta_s=res.theta_s,
+        du=res.du,
+        dy=res.dy,
+        params=dict(res.params),
+        rmse=res.rmse,
+        n_fit=res.n_fit,
+        n_iter=res.n_iter,
+        load_s=load_s,
+        identify_s=t2 - t1,
+        total_s=t2 - t0,
+    )
+
+
+def _describe(e: BaseException) -> str:
+    return f"{type(e).__name__}: {e}"
+
+
+def summary_row(rec: StepBatchIdRecord) -> dict:
+    """One summary-table row (SUMMARY_COLUMNS) for a record; None = empty."""
+    def num(x: float) -> Optional[float]:
+        return None if x is None or math.isnan(x) else float(x)
+
+    row = {
+        "path": rec.path,
+        "status": "ok" if rec.ok else "error",
+        "error": rec.error,
+        "model": rec.model,
+        "method": rec.method,
+        "n_samples": rec.n_samples,
+        "dt_s": num(rec.dt_s),
+        "t_step_s": num(rec.t_step_s),
+        "theta_s": num(rec.theta_s),
+        "du": num(rec.du),
+        "dy": num(rec.dy),
+        "rmse": num(rec.rmse),
+        "n_fit": rec.n_fit,
+        "n_iter": rec.n_iter,
+        "load_s": num(rec.load_s),
+        "identify_s": num(rec.identify_s),
+        "total_s": num(rec.total_s),
+    }
+    for name in _PARAM_COLUMNS:
+        row[name] = num(rec.params.get(name))
+    return row
+
+
+class _SummaryWriter:
+    """
+    Appends summary rows as they arrive. CSV rows are flushed one by one, so
+    a long batch can be watched (or survives a crash); Parquet rows are
+    buffered into row groups of `group_rows`.
+    """
+
+    def __init__(self, path: str, *, group_rows: int = 64):
+        self.path = os.fspath(path)
+        self.parquet = os.path.splitext(self.path)[1].lower() in (".parquet", ".pq")
+        self.group_rows = max(int(group_rows), 1)
+        self._rows: list[dict] = []
+
+        if self.parquet:
+            pa, pq = _pyarrow()
+            self._pa = pa
+            fields = [
+                pa.field(c, pa.string() if c in ("path", "status", "error", "model", "method")
+                         else pa.int64() if c in ("n_samples", "n_fit", "n_iter") else pa.float64())
+                for c in SUMMARY_COLUMNS
+            ]
+            self._schema = pa.schema(fields)
+            self._pq = pq.ParquetWriter(self.path, self._schema)
+        else:
+            self._fh = open(self.path, "w", newline="", encoding="utf-8")
+            self._csv = csv.DictWriter(self._fh, fieldnames=list(SUMMARY_COLUMNS))
+            self._csv.writeheader()
+            self._fh.flush()
+
+    def write(self, rec: StepBatchIdRecord) -> None:
+        row = summary_row(rec)
+        if not self.parquet:
+            self._csv.writerow({k: ("" if v is None else v) for k, v in row.items()})
+            self._fh.flush()
+            return
+        self._rows.append(row)
+        if len(self._rows) >= self.group_rows:
+            self._flush_group()
+
+    def close(self) -> None:
+        if self.parquet:
+            self._flush_group()
+            self._pq.close()
+        else:
+            self._fh.close()
+
+    def _flush_group(self) -> None:
+        if self._rows:
+            self._pq.write_table(self._pa.Table.from_pylist(self._rows, schema=self._schema))
+            self._rows = []
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet summaries need pyarrow; use a .csv summary_path instead") from e
+    return pa, pq
@@ -1,16 +1,41 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional, Tuple, Literal
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from functools import cached_property
+from typing import Callable, Optional, Tuple, Literal
 
 import numpy as np
 
+from .helpers import (
+    levenberg_marquardt,
+    levenberg_marquardt_batch,
+    stream_csv_columns,
+    csv_header,
+    ProgressCallback,
+    read_column_cache,
+    write_column_cache,
+)
+
 from models.step_response_tuning import (
     StepTuneSelections,
-    StepIdResult
+    StepIdResult,
+    AutoSelectionPolicy,
 )
 
 PVModelType = Literal["FOPDT", "IPDT", "SOPDT_UNDERDAMPED"]
+IdentifyMethod = Literal["heuristic", "least_squares"]
+DeadtimeDetector = Literal["threshold", "sustained", "cusum"]
+
+
+@dataclass(frozen=True)
+class BaselineStats:
+    # finite-sample statistics of PV and its sample-to-sample change on a span
+    pv_mean: float
+    pv_std: float
+    dpv_std: float
+    n: int
+    n_dpv: int
 
 
 @dataclass(frozen=True)
@@ -21,53 +46,101 @@ class StepSeries:
     dt_s: float
     source_path: str = ""
 
+    @cached_property
+    def dpv(self) -> np.ndarray:
+        """np.diff(pv), computed once per series."""
+        return np.diff(self.pv)
+
+    @cached_property
+    def _stats_cache(self) -> dict:
+        return {}
+
+    def baseline_stats(self, span: Tuple[int, int]) -> BaselineStats:
+        """PV / dPV noise statistics over span, cached per span."""
+        a, b = int(span[0]), int(span[1])
+        stats = self._stats_cache.get((a, b))
+        if stats is None:
+            pv = self.pv[max(a, 0):b]
+            pv = pv[np.isfinite(pv)]
+            dp = self.dpv[max(a, 0):max(b - 1, 0)]
+            dp = dp[np.isfinite(dp)]
+            stats = BaselineStats(
+                pv_mean=float(np.mean(pv)) if pv.size else float("nan"),
+                pv_std=float(np.std(pv, ddof=1)) if pv.size > 1 else float("nan"),
+                dpv_std=float(np.std(dp, ddof=1)) if dp.size > 1 else float("nan"),
+                n=int(pv.size),
+                n_dpv=int(dp.size),
+            )
+            self._stats_cache[(a, b)] = stats
+        return stats
+
 
 # ----------------------------
 # CSV loader (expects time, CV, PV)
 # ----------------------------
 
-def load_step_csv(path: str, *, time_unit: str = "s") -> StepSeries:
-    import pandas as pd
-
-    df = pd.read_csv(path)
-    cols = [c.strip() for c in df.columns]
+def load_step_csv(
+    path: str,
+    *,
+    time_unit: str = "s",
+    progress: Optional[ProgressCallback] = None,
+    use_cache: bool = True,
+) -> StepSeries:
+    """
+    Load CSV with headers: time, PV and (optionally) CV.
 
-    if "time" not in cols:
+    Streamed in chunks like load_csv; progress(bytes_read, bytes_total) is
+    called per chunk. With use_cache, an unchanged file is memory-mapped from
+    its sidecar .npy cache instead of being reparsed (see load_csv).
+    """
+    cache_tag = f"step_{time_unit.lower()}"
+    if use_cache:
+        cached = read_column_cache(path, cache_tag)
+        if cached is not None:
+            arrays, meta = cached
+            return StepSeries(
+                t=arrays["t"], cv=arrays["cv"], pv=arrays["pv"], dt_s=float(meta["dt_s"]), source_path=path
+            )
+
+    # header names are matched with surrounding whitespace stripped
+    names = {c.strip(): c for c in csv_header(path)}
+
+    if "time" not in names:
         raise ValueError("CSV must include a 'time' column")
-    if "PV" not in cols and "pv" not in cols:
+    if "PV" not in names and "pv" not in names:
         raise ValueError("CSV must include 'PV' column (case sensitive preferred)")
-    if "CV" not in cols and "cv" not in cols:
+    pv_col = names["PV" if "PV" in names else "pv"]
+    if "CV" not in names and "cv" not in names:
         # allow missing CV (assume it steps 0->1 at detected time)
-        cv = None
-    else:
-        cv = df["CV" if "CV" in df.columns else "cv"].to_numpy(dtype=float)
-
-    t = df["time"].to_numpy(dtype=float)
-    pv = df["PV" if "PV" in df.columns else "pv"].to_numpy(dtype=float)
-
-    if time_unit.lower() == "ms":
-        t = t / 1000.0
-
-    ok = np.isfinite(t) & np.isfinite(pv)
-    if cv is not None:
-        ok = ok & np.isfinite(cv)
-
-    t = t[ok]
-    pv = pv[ok]
-    if cv is None:
-        cv = np.zeros_like(pv)
+        cv_col = None
     else:
-        cv = cv[ok]
+        cv_col = names["CV" if "CV" in names else "cv"]
+
+    time_col = names["time"]
+    columns = [time_col, pv_col] + ([cv_col] if cv_col is not None else [])
+    cols, dt_sketch = stream_csv_columns(
+        path,
+        columns,
+        finite=columns,
+        time_column=time_col,
+        time_divisor=1000.0 if time_unit.lower() == "ms" else None,
+        progress=progress,
+    )
+
+    t = cols[time_col]
+    pv = cols[pv_col]
+    cv = np.zeros_like(pv) if cv_col is None else cols[cv_col]
 
     if t.size < 5:
         raise ValueError("Not enough samples after cleaning")
 
-    dt = np.diff(t)
-    dt = dt[np.isfinite(dt) & (dt > 0)]
-    dt_s = float(np.median(dt)) if dt.size else 0.0
+    dt_s = dt_sketch.median() if dt_sketch.count else 0.0
     if dt_s <= 0:
         dt_s = float((t[-1] - t[0]) / max(len(t) - 1, 1))
 
+    if use_cache:
+        write_column_cache(path, cache_tag, {"t": t, "cv": cv, "pv": pv}, {"dt_s": float(dt_s)})
+
     return StepSeries(t=t, cv=cv, pv=pv, dt_s=dt_s, source_path=path)
 
 
@@ -125,39 +198,224 @@ def auto_detect_step_index(ts: StepSeries) -> int:
     return max(0, min(i, len(t) - 1))
 
 
-def auto_detect_deadtime_index(ts: StepSeries, selections: StepTuneSelections) -> Optional[int]:
+def auto_detect_deadtime_index(
+    ts: StepSeries,
+    selections: StepTuneSelections,
+    *,
+    detector: DeadtimeDetector = "threshold",
+    sustain_n: int = 10,
+    cusum_h: float = 10.0,
+) -> Optional[int]:
     """
-    Find first index after t_step where PV derivative exceeds baseline noise threshold.
-    Needs baseline span selected.
+    Find the first index after t_step where the PV starts to respond.
+    Needs baseline span selected (its noise sets the thresholds).
+
+    detector:
+      - "threshold": first sample whose PV change exceeds 5 sigma of the
+        baseline PV change. Sensitive to single noise spikes.
+      - "sustained": start of the first run of sustain_n samples whose PV
+        stays more than 5 sigma away from the baseline mean. A spike
+        shorter than sustain_n samples never triggers.
+      - "cusum": two-sided CUSUM of the standardized PV deviation (clipped
+        to 4 sigma, drift 1 sigma, alarm at cusum_h); the onset is the
+        sample after the alarming sum was last zero. Picks up slow starts
+        that a level threshold only sees late; a lone spike cannot alarm.
     """
+    if detector not in ("threshold", "sustained", "cusum"):
+        raise ValueError(f"Unknown deadtime detector: {detector}")
+
     base = selections.baseline.as_tuple()
     step_i = selections.t_step.get() or auto_detect_step_index(ts)
     if base is None:
         return None
 
-    a, b = base
-    pv = ts.pv
-    t = ts.t
+    stats = ts.baseline_stats(base)
+    # at least 5 finite baseline PV changes (so also at least 6 finite PV
+    # samples): every sigma below is finite
+    if stats.n_dpv < 5:
+        return None
+    start = max(step_i, 1)
 
-    # baseline derivative stats
-    dp = np.diff(pv)
-    dp_base = dp[max(a, 0):max(b - 1, 0)]
-    dp_base = dp_base[np.isfinite(dp_base)]
-    if dp_base.size < 5:
+    if detector == "threshold":
+        thr = max(5.0 * stats.dpv_std, 1e-12)
+        dp = ts.dpv
+        k = _first_index(lambda a, b: np.abs(dp[a:b]) >= thr, start, len(dp))
+        return None if k is None else k + 1
+
+    sigma = max(stats.pv_std, 1e-12)
+    mu = stats.pv_mean
+    pv = ts.pv
+    n = len(pv)
+
+    if detector == "sustained":
+        n_run = max(int(sustain_n), 1)
+        # blocks overlap by n_run - 1 so runs across a block edge are seen
+        a, block = start, 4096
+        while a < n:
+            b = min(a + block, n)
+            z = (pv[max(a - n_run + 1, start):b] - mu) / sigma
+            i = min(_first_run(z > 5.0, n_run), _first_run(z < -5.0, n_run))
+            if i < len(z):
+                return max(a - n_run + 1, start) + i
+            a, block = b, block * 2
         return None
 
-    sigma = float(np.std(dp_base, ddof=1))
-    thr = max(5.0 * sigma, 1e-12)
+    return _cusum_onset(pv, start, mu, sigma, float(cusum_h))
 
-    for k in range(max(step_i, 1), len(pv) - 1):
-        if not np.isfinite(dp[k]):
-            continue
-        if abs(dp[k]) >= thr:
-            return k + 1
 
+def _first_index(mask: Callable[[int, int], np.ndarray], start: int, stop: int, block: int = 4096) -> Optional[int]:
+    """
+    First k in [start, stop) where mask(a, b)[k - a] is True, evaluated on
+    doubling blocks: an early hit costs one small block, no hit one pass.
+    """
+    a = start
+    while a < stop:
+        b = min(a + block, stop)
+        hits = np.flatnonzero(mask(a, b))
+        if hits.size:
+            return a + int(hits[0])
+        a = b
+        block *= 2
+    return None
+
+
+def _first_run(mask: np.ndarray, n_run: int) -> int:
+    """Start of the first run of n_run True values, len(mask) if none."""
+    if n_run <= 1:
+        hits = np.flatnonzero(mask)
+        return int(hits[0]) if hits.size else len(mask)
+    # run ends where the count over the last n_run samples reaches n_run
+    c = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+    full = np.flatnonzero(c[n_run:] - c[:-n_run] == n_run)
+    return int(full[0]) if full.size else len(mask)
+
+
+def _cusum_onset(pv: np.ndarray, start: int, mu: float, sigma: float, h: float) -> Optional[int]:
+    """
+    Two-sided CUSUM of x = (pv - mu) / sigma from `start`, one row per
+    direction: S[k] = max(0, S[k-1] +/- x[k] - 1), S[start - 1] = 0, in
+    closed form S = C - running_min(C) over C = cumsum(+/-x - 1), on
+    doubling blocks so an early response only costs one small block.
+
+    x is clipped to +/-4 (NaN -> 0), so a single spike adds at most 3 and
+    only a sustained deviation reaches h. For the first direction to alarm,
+    returns the index after its sum was last zero.
+    """
+    n = len(pv)
+    sign = np.array([[1.0], [-1.0]])
+    c_last = np.zeros((2, 1))    # C before the block
+    c_min = np.zeros((2, 1))     # running minimum of C so far
+    i_min = np.full(2, start)    # index after the last sample at that minimum
+    a, block = start, 4096
+    while a < n:
+        b = min(a + block, n)
+        x = np.clip(np.nan_to_num((pv[a:b] - mu) / sigma, nan=0.0), -4.0, 4.0)
+        c = c_last + np.cumsum(sign * x - 1.0, axis=1)
+        run_min = np.minimum(np.minimum.accumulate(c, axis=1), c_min)
+        alarm = c - run_min > h
+        first = np.where(alarm.any(axis=1), np.argmax(alarm, axis=1), b - a)
+
+        for r in range(2):
+            # last position before the alarm where C sat at its running minimum
+            at_min = np.flatnonzero(c[r, :first[r]] <= run_min[r, :first[r]])
+            if at_min.size:
+                i_min[r] = a + int(at_min[-1]) + 1
+        if first.min() < b - a:
+            return int(i_min[int(np.argmin(first))])
+        c_last, c_min = c[:, -1:], run_min[:, -1:]
+        a, block = b, block * 2
     return None
 
 
+def auto_select_spans(
+    ts: StepSeries,
+    model: PVModelType,
+    policy: Optional[AutoSelectionPolicy] = None,
+) -> StepTuneSelections:
+    """
+    Build the selections a user would click for a single-step record:
+
+      - t_step from the CV edge (auto_detect_step_index)
+      - baseline: the policy window ending before the step
+      - t_dead from auto_detect_deadtime_index(policy.deadtime_detector)
+      - final (FOPDT/SOPDT): from the settle time to the end. The PV is
+        smoothed with a moving average and counts as settled after the last
+        sample outside the settle band around the final value.
+      - fit (IPDT): from the deadtime (or step) to the end
+      - peak (SOPDT): the largest excursion in the step direction
+    """
+    policy = policy or AutoSelectionPolicy()
+    n = len(ts.t)
+    dt_s = max(float(ts.dt_s), 1e-12)
+    sel = StepTuneSelections()
+
+    step_i = auto_detect_step_index(ts)
+    sel.t_step.set(step_i)
+
+    b = step_i - int(round(max(policy.guard_s, 0.0) / dt_s))
+    a = 0 if policy.baseline_s is None else max(b - int(round(policy.baseline_s / dt_s)), 0)
+    if b - a < max(int(policy.min_baseline_samples), 2):
+        raise ValueError(f"Only {max(b - a, 0)} baseline samples before the step at index {step_i}")
+    sel.baseline.set(a, b)
+
+    dead_i = auto_detect_deadtime_index(ts, sel, detector=policy.deadtime_detector)
+    if dead_i is not None:
+        sel.t_dead.set(dead_i)
+
+    if model == "IPDT":
+        if n - (dead_i or step_i) < 5:
+            raise ValueError("Too few samples after the step for an IPDT slope fit")
+        sel.fit.set(dead_i or step_i, n)
+        return sel
+
+    pv = ts.pv
+    pv0 = _span_mean(pv, (a, b))
+    n_tail = max(int((n - step_i) * policy.tail_fraction), int(policy.min_final_samples), 1)
+    pv1 = _span_mean(pv, (max(n - n_tail, step_i), n))
+    dy = pv1 - pv0
+
+    base = pv[a:b]
+    sigma = float(np.std(base[np.isfinite(base)], ddof=1)) if b - a > 1 else 0.0
+    settle_i = step_i + settle_index(pv[step_i:], pv0, pv1, sigma, policy)
+    settle_i = max(min(settle_i, n - max(int(policy.min_final_samples), 1)), step_i + 1)
+    if settle_i >= n:
+        raise ValueError("Too few samples after the step for a FINAL span")
+    sel.final.set(settle_i, n)
+
+    if model == "SOPDT_UNDERDAMPED":
+        excursion = np.sign(dy) * (np.nan_to_num(pv[step_i:settle_i], nan=pv0) - pv0)
+        sel.peak.set(step_i + int(np.argmax(excursion)))
+    return sel
+
+
+def settle_index(
+    x: np.ndarray,
+    start_value: float,
+    final_value: float,
+    sigma: float,
+    policy: AutoSelectionPolicy,
+) -> int:
+    """
+    First index of x (a response moving from start_value to final_value)
+    after which a trailing moving average of x stays within the settle band
+    of final_value: policy.settle_band * |final - start|, widened to 4 sigma
+    of the averaged noise (sigma: per-sample noise std). len(x) if never.
+    """
+    n = len(x)
+    if n == 0:
+        return 0
+    w = max(int(n * policy.smooth_fraction), 1)
+    xx = np.nan_to_num(np.asarray(x, dtype=float), nan=final_value)
+    c = np.concatenate(([0.0], np.cumsum(xx)))
+    k = np.arange(n)
+    lo = np.maximum(k + 1 - w, 0)
+    smooth = (c[k + 1] - c[lo]) / (k + 1 - lo)
+
+    band = max(float(policy.settle_band) * abs(final_value - start_value), 4.0 * sigma / np.sqrt(w), 1e-12)
+    outside = np.flatnonzero(np.abs(smooth - final_value) > band)
+    return int(outside[-1]) + 1 if outside.size else 0
+
+
 # ----------------------------
 # simulation (for overlays)
 # ----------------------------
@@ -216,6 +474,9 @@ def identify(
     ts: StepSeries,
     selections: StepTuneSelections,
     model: PVModelType,
+    *,
+    method: IdentifyMethod = "heuristic",
+    n_boot: int = 0,
 ) -> Tuple[StepIdResult, np.ndarray]:
     """
     Returns (result, pv_hat) for overlay.
@@ -224,7 +485,35 @@ def identify(
       - for FOPDT/SOPDT: final span for pv1/cv1
       - step point recommended (auto ok)
       - deadtime and peak optional (model-dependent)
+
+    method:
+      - "heuristic": K from the spans, tau from the 63 % crossing, zeta/wn
+        from the PEAK point, IPDT slope from a line fit.
+      - "least_squares": the heuristic estimate seeds a Levenberg-Marquardt
+        fit of all model parameters, theta included, minimizing the RMSE
+        over the FIT span (all samples if none is selected).
+
+    n_boot > 0 (least_squares only) attaches 95 % bootstrap intervals from
+    n_boot refits (see bootstrap_intervals).
     """
+    if method not in ("heuristic", "least_squares"):
+        raise ValueError(f"Unknown identification method: {method}")
+    if n_boot and method != "least_squares":
+        raise ValueError("Bootstrap intervals need method='least_squares'.")
+
+    res, pv_hat = _identify_heuristic(ts, selections, model)
+    if method == "least_squares":
+        res, pv_hat = _refine_least_squares(ts, selections, res)
+        if n_boot:
+            res = bootstrap_intervals(ts, selections, res, n_boot=n_boot)
+    return res, pv_hat
+
+
+def _identify_heuristic(
+    ts: StepSeries,
+    selections: StepTuneSelections,
+    model: PVModelType,
+) -> Tuple[StepIdResult, np.ndarray]:
     base = selections.baseline.as_tuple()
     if base is None:
         raise ValueError("Select a BASELINE span first.")
@@ -278,19 +567,18 @@ def identify(
         target = pv0 + 0.6321205588 * dy
         t_on = t_step_s + theta_s
 
-        idx = np.where(ts.t >= t_on)[0]
+        t, pv = ts.t, ts.pv
+        k0 = _first_index(lambda a, b: t[a:b] >= t_on, 0, len(t))
         tau_s = 1.0
-        if idx.size > 0:
-            # first crossing of target
-            k0 = idx[0]
-            kk = None
-            for k in range(k0, len(ts.pv)):
-                if np.isfinite(ts.pv[k]) and ((dy >= 0 and ts.pv[k] >= target) or (dy < 0 and ts.pv[k] <= target)):
-                    kk = k
-                    break
-            if kk is not None:
-                tau_s = float(ts.t[kk] - t_on)
-                tau_s = max(tau_s, ts.dt_s)
+        kk = None
+        # first crossing of target (NaN samples never cross)
+        if k0 is not None and dy >= 0:
+            kk = _first_index(lambda a, b: pv[a:b] >= target, k0, len(pv))
+        elif k0 is not None:
+            kk = _first_index(lambda a, b: pv[a:b] <= target, k0, len(pv))
+        if kk is not None:
+            tau_s = float(ts.t[kk] - t_on)
+            tau_s = max(tau_s, ts.dt_s)
 
         pv_hat = simulate_fopdt_overlay(ts.t, pv0=pv0, du=du, K=K, tau=tau_s, theta=theta_s, t_step=t_step_s)
 
@@ -372,7 +660,8 @@ def identify(
         Tp = float(t_peak - t_on)
         if Tp <= ts.dt_s:
             raise ValueError("Peak is too close to step/deadtime; check PEAK and DEADTIME selections.")
-        wd = float(2.0 * np.pi / Tp)
+        # first peak of an underdamped step response is at Tp = pi / wd
+        wd = float(np.pi / Tp)
         wn = float(wd / np.sqrt(1.0 - zeta * zeta))
 
         pv_hat = simulate_sopdt_underdamped_overlay(ts.t, pv0=pv0, du=du, K=K, zeta=zeta, wn=wn, theta=theta_s, t_step=t_step_s)
@@ -387,4 +676,297 @@ def identify(
         res.n_fit = int(np.sum(fit_mask)) if fit_mask is not None else int(len(ts.t))
         return res, pv_hat
 
-    raise ValueError(f"Unknown model: {model}")
\ No newline at end of file
+    raise ValueError(f"Unknown model: {model}")
+
+
+# ----------------------------
+# Least-squares refinement
+# ----------------------------
+#
+# Each model returns (pv_hat, J) on the fit samples, J = d pv_hat / d params,
+# from the same closed forms as the simulate_*_overlay functions. The
+# response starts at t_on = t_step + theta; before it pv_hat = pv0 and the
+# derivatives are 0.
+
+# Model responses and their Jacobians for the least-squares fit. p holds
+# one parameter vector (P,) or a stack of them (R, P); results broadcast to
+# y (N,) / (R, N) and J (N, P) / (R, N, P). J is a transposed view of
+# per-parameter rows, which matmul hands to BLAS without a copy.
+
+def _fopdt_jacobian(t, pv0, du, t_step, p):
+    K, tau, theta = (p[..., i, None] for i in range(3))
+    tt = t - (t_step + theta)
+    on = tt >= 0.0
+    np.maximum(tt, 0.0, out=tt)
+    E = np.exp(tt / -tau)
+    g = K * du
+    gE = g * E
+    J = np.stack([
+        du * (1.0 - E),
+        gE * tt / -(tau * tau),
+        np.where(on, gE / -tau, 0.0),
+    ], axis=-2)
+    return pv0 + (g - gE), np.swapaxes(J, -1, -2)
+
+
+def _ipdt_jacobian(t, pv0, du, t_step, p):
+    K, theta = (p[..., i, None] for i in range(2))
+    tt = np.maximum(t - (t_step + theta), 0.0)
+    on = t >= t_step + theta
+    J = np.stack([
+        du * tt,
+        np.where(on, -K * du, 0.0),
+    ], axis=-2)
+    return pv0 + K * du * tt, np.swapaxes(J, -1, -2)
+
+
+def _sopdt_jacobian(t, pv0, du, t_step, p):
+    # parameterized by decay sigma = zeta*wn and damped frequency wd, where
+    # y_unit = 1 - e^(-sigma t) (cos(wd t) + sigma/wd sin(wd t))
+    K, sigma, wd, theta = (p[..., i, None] for i in range(4))
+    tt = np.maximum(t - (t_step + theta), 0.0)
+    on = t >= t_step + theta
+    E = np.exp(-sigma * tt)
+    c = np.cos(wd * tt)
+    sn = np.sin(wd * tt)
+    r = sigma / wd
+
+    y_unit = np.where(on, 1.0 - E * (c + r * sn), 0.0)
+    g = K * du
+    gE = np.where(on, g * E, 0.0)
+    J = np.stack([
+        du * y_unit,
+        gE * (tt * c + r * tt * sn - sn / wd),
+        gE * (tt * sn - r * tt * c + r / wd * sn),
+        gE * -((sigma * sigma + wd * wd) / wd) * sn,
+    ], axis=-2)
+    return pv0 + g * y_unit, np.swapaxes(J, -1, -2)
+
+
+def _least_squares_problem(ts: StepSeries, selections: StepTuneSelections, seed: StepIdResult):
+    """
+    Samples and parameterization of the least-squares fit around `seed`:
+    (t, y, model_fn, p0, lower, upper) over the finite FIT-span samples.
+    """
+    fit_mask = _fit_mask_from_span(len(ts.t), selections.fit.as_tuple())
+    m = np.isfinite(ts.pv) & np.isfinite(ts.t)
+    if fit_mask is not None:
+        m &= fit_mask
+    t = ts.t[m]
+    y = ts.pv[m]
+    if t.size < 5:
+        raise ValueError("FIT span has too few samples for a least-squares fit.")
+
+    theta_max = max(float(ts.t[-1]) - seed.t_step_s, 0.0)
+    tiny = max(ts.dt_s * 1e-3, 1e-9)
+
+    if seed.model == "FOPDT":
+        model_fn = _fopdt_jacobian
+        p0 = [seed.params["K"], seed.params["tau_s"], seed.theta_s]
+        lower = [-np.inf, tiny, 0.0]
+        upper = [np.inf, np.inf, theta_max]
+    elif seed.model == "IPDT":
+        model_fn = _ipdt_jacobian
+        p0 = [seed.params["K"], seed.theta_s]
+        lower = [-np.inf, 0.0]
+        upper = [np.inf, theta_max]
+    else:
+        zeta, wn = seed.params["zeta"], seed.params["wn"]
+        model_fn = _sopdt_jacobian
+        p0 = [seed.params["K"], zeta * wn, wn * np.sqrt(1.0 - zeta * zeta), seed.theta_s]
+        lower = [-np.inf, 1e-9, tiny, 0.0]
+        upper = [np.inf, np.inf, np.inf, theta_max]
+    return t, y, model_fn, np.array(p0, dtype=float), np.array(lower), np.array(upper)
+
+
+def _reported_params(model: str, p: np.ndarray) -> dict[str, np.ndarray]:
+    """Fit vector(s) (..., P) -> reported parameters, theta_s included."""
+    if model == "FOPDT":
+        return {"K": p[..., 0], "tau_s": p[..., 1], "theta_s": p[..., 2]}
+    if model == "IPDT":
+        return {"K": p[..., 0], "theta_s": p[..., 1]}
+    wn = np.hypot(p[..., 1], p[..., 2])
+    return {"K": p[..., 0], "zeta": p[..., 1] / wn, "wn": wn, "theta_s": p[..., 3]}
+
+
+def _refine_least_squares(
+    ts: StepSeries,
+    selections: StepTuneSelections,
+    seed: StepIdResult,
+) -> Tuple[StepIdResult, np.ndarray]:
+    fit_mask = _fit_mask_from_span(len(ts.t), selections.fit.as_tuple())
+    t, y, model_fn, p0, lower, upper = _least_squares_problem(ts, selections, seed)
+    pv0, du, t_step = seed.pv0, seed.du, seed.t_step_s
+
+    def residuals(p):
+        y_hat, J = model_fn(t, pv0, du, t_step, p)
+        return y_hat - y, J
+
+    p, _cost, n_iter, converged = levenberg_marquardt(residuals, p0, lower=lower, upper=upper)
+
+    reported = {k: float(v) for k, v in _reported_params(seed.model, p).items()}
+    theta_s = reported.pop("theta_s")
+    params = reported
+    if seed.model == "FOPDT":
+        pv_hat = simulate_fopdt_overlay(ts.t, pv0=pv0, du=du, K=p[0], tau=p[1], theta=theta_s, t_step=t_step)
+    elif seed.model == "IPDT":
+        pv_hat = simulate_ipdt_overlay(ts.t, pv0=pv0, du=du, K=p[0], theta=theta_s, t_step=t_step)
+    else:
+        pv_hat = simulate_sopdt_underdamped_overlay(
+            ts.t, pv0=pv0, du=du, K=p[0], zeta=params["zeta"], wn=params["wn"], theta=theta_s, t_step=t_step
+        )
+
+    note = f"Least-squares fit ({n_iter} iterations{'' if converged else ', not converged'})."
+    res = StepIdResult(
+        model=seed.model,
+        cv0=seed.cv0, cv1=seed.cv1, pv0=pv0, pv1=seed.pv1, du=du, dy=seed.dy,
+        t_step_s=t_step, theta_s=theta_s,
+        params=params,
+        note=f"{seed.note} {note}".strip(),
+        method="least_squares",
+        n_iter=n_iter,
+    )
+    res.rmse = _rmse(ts.pv, pv_hat, mask=fit_mask)
+    res.n_fit = int(np.sum(fit_mask)) if fit_mask is not None else int(len(ts.t))
+    return res, pv_hat
+
+
+# ----------------------------
+# Bootstrap intervals
+# ----------------------------
+
+def bootstrap_intervals(
+    ts: StepSeries,
+    selections: StepTuneSelections,
+    result: StepIdResult,
+    *,
+    n_boot: int = 1000,
+    level: float = 0.95,
+    block_len: Optional[int] = None,
+    rng_seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    shard_bytes: int = 4 << 20,
+) -> StepIdResult:
+    """
+    Percentile confidence intervals for a least-squares result by residual
+    block bootstrap. Returns a copy of `result` with `intervals`
+    ({name: (lo, hi)} for the model parameters and theta_s), `ci_level` and
+    `n_boot` set.
+
+    The residuals of the fit are resampled as circular moving blocks of
+    block_len samples (default: from their autocorrelation, at least
+    N**(1/3)) so correlated noise and model error keep their structure.
+    Each replica, fitted curve + resampled residuals, is refitted from the
+    point estimate, with pv0 re-estimated from a block resample of the
+    BASELINE span (du, from the noise-free CV, stays fixed). Replicas are
+    refitted together with levenberg_marquardt_batch in shards that keep
+    their working arrays under shard_bytes (cache-sized: long traces go one
+    replica at a time, short ones many); with workers > 1 shards go to a
+    process pool. Shard j draws from default_rng([rng_seed, j]), so results
+    depend on rng_seed and shard_bytes but not on `workers`.
+    """
+    if result.method != "least_squares":
+        raise ValueError("Bootstrap intervals need a least-squares result (method='least_squares').")
+    if int(n_boot) < 2:
+        raise ValueError("n_boot must be >= 2")
+    if not 0.0 < level < 1.0:
+        raise ValueError("level must be in (0, 1)")
+
+    t, y, model_fn, p_hat, lower, upper = _least_squares_problem(ts, selections, result)
+    y_hat, J0 = model_fn(t, result.pv0, result.du, result.t_step_s, p_hat)
+    resid = y - y_hat
+    N = len(t)
+    # Gauss-Newton step matrix at the point estimate, shared by all replicas
+    G = np.linalg.pinv(J0)
+
+    # baseline deviations: pv0 is re-estimated per replica from their resample
+    a, b = selections.baseline.as_tuple() or (0, 0)
+    base = ts.pv[a:b]
+    base_dev = base[np.isfinite(base)] - result.pv0
+
+    L = int(block_len) if block_len else _auto_block_len(resid)
+    L = min(max(L, 1), N)
+    seed = int(np.random.SeedSequence(rng_seed).entropy) if rng_seed is None else int(rng_seed)
+
+    per_run = N * (len(p_hat) + 2) * 8
+    shard = max(int(shard_bytes) // per_run, 1)
+    jobs = [
+        (result.model, t, y_hat, resid, base_dev, G, result.pv0, result.du, result.t_step_s, p_hat, lower, upper,
+         L, seed, j, min(shard, int(n_boot) - i0))
+        for j, i0 in enumerate(range(0, int(n_boot), shard))
+    ]
+    if workers is not None and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=int(workers)) as pool:
+            parts = list(pool.map(_bootstrap_shard, *zip(*jobs)))
+    else:
+        parts = [_bootstrap_shard(*job) for job in jobs]
+    p_boot = np.concatenate(parts)
+
+    q = 100.0 * np.array([(1.0 - level) / 2.0, (1.0 + level) / 2.0])
+    intervals = {}
+    for name, values in _reported_params(result.model, p_boot).items():
+        finite = values[np.isfinite(values)]
+        lo, hi = np.percentile(finite, q) if finite.size else (np.nan, np.nan)
+        intervals[name] = (float(lo), float(hi))
+
+    return replace(result, intervals=intervals, ci_level=float(level), n_boot=int(len(p_boot)))
+
+
+def _auto_block_len(resid: np.ndarray) -> int:
+    # smallest lag where the residual autocorrelation falls below 1/e
+    N = len(resid)
+    x = resid - np.mean(resid)
+    nfft = 1 << int(np.ceil(np.log2(2 * N)))
+    f = np.fft.rfft(x, nfft)
+    acf = np.fft.irfft(f * np.conj(f), nfft)[:N]
+    below = np.flatnonzero(acf <= acf[0] / np.e) if acf[0] > 0 else np.array([1])
+    lag = int(below[0]) if below.size else N
+    return min(max(lag, int(np.ceil(N ** (1.0 / 3.0)))), max(N // 10, 1))
+
+
+def _bootstrap_shard(
+    model: str,
+    t: np.ndarray,
+    y_hat: np.ndarray,
+    resid: np.ndarray,
+    base_dev: np.ndarray,
+    G: np.ndarray,
+    pv0: float,
+    du: float,
+    t_step: float,
+    p_hat: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    block_len: int,
+    seed: int,
+    shard_index: int,
+    n_rep: int,
+) -> np.ndarray:
+    # module level: runs in worker processes; returns the fitted vectors (n_rep, P)
+    rng = np.random.default_rng([seed, shard_index])
+    y_boot = y_hat + _block_resample(rng, resid, block_len, n_rep)
+    pv0_boot = np.full((n_rep, 1), float(pv0))
+    if base_dev.size:
+        pv0_boot += _block_resample(rng, base_dev, min(block_len, base_dev.size), n_rep).mean(axis=1, keepdims=True)
+    model_fn = {"FOPDT": _fopdt_jacobian, "IPDT": _ipdt_jacobian}.get(model, _sopdt_jacobian)
+
+    def residuals(P, rows):
+        yy, J = model_fn(t, pv0_boot[rows], du, t_step, P)
+        return yy - y_boot[rows], J
+
+    # start from one Gauss-Newton step from the point estimate (G, shared by
+    # all replicas): a single (n_rep, N) x (N, P) product, no evaluation
+    p0 = np.clip(p_hat + (y_boot - y_hat - (pv0_boot - pv0)) @ G.T, lower, upper)
+    # the replica spread is orders of magnitude wider than these tolerances
+    p, _cost, _iters, _conv = levenberg_marquardt_batch(
+        residuals, p0, lower=lower, upper=upper, ftol=1e-8, xtol=1e-6
+    )
+    return p
+
+
+def _block_resample(rng: np.random.Generator, x: np.ndarray, block_len: int, n_rep: int) -> np.ndarray:
+    """n_rep circular moving-block resamples of x, shape (n_rep, len(x))."""
+    N = len(x)
+    starts = rng.integers(0, N, size=(n_rep, -(-N // block_len)))
+    idx = (starts[:, :, None] + np.arange(block_len)).reshape(n_rep, -1)[:, :N] % N
+    return x[idx]
@@ -12,6 +12,7 @@ from models.step_response_generator import (
     StepSpec,
     ActuatorParams,
 )
+from .helpers import state_space_filter, zoh_discretize, rate_limit, delay_signal, DelayInterpolation
 
 PVModelType = Literal["FOPDT", "IPDT", "SOPDT_UNDERDAMPED"]
 
@@ -27,14 +28,26 @@ def make_step_cv(t: np.ndarray, spec: StepSpec) -> np.ndarray:
     return cv
 
 
-def apply_deadtime(u: np.ndarray, dt_s: float, theta_s: float) -> np.ndarray:
-    n_delay = int(round(max(theta_s, 0.0) / max(dt_s, 1e-12)))
-    if n_delay <= 0:
+def apply_deadtime(
+    u: np.ndarray,
+    dt_s: float,
+    theta_s: float | np.ndarray,
+    *,
+    interpolation: DelayInterpolation = "linear",
+) -> np.ndarray:
+    """
+    Transport delay of theta_s seconds through a DelayLine.
+
+    theta_s may be fractional (sub-sample delays are interpolated instead of
+    rounded away) or, with linear interpolation, an array with one delay per
+    sample (e.g. deadtime that follows conveyor speed). Whole-sample delays
+    give exactly the shifted input, held at u[0] before the first sample.
+    """
+    dt = max(dt_s, 1e-12)
+    delay = np.maximum(np.asarray(theta_s, dtype=float), 0.0) / dt
+    if delay.ndim == 0 and float(delay) <= 0.0:
         return u.copy()
-    out = np.empty_like(u)
-    out[:n_delay] = u[0]
-    out[n_delay:] = u[:-n_delay]
-    return out
+    return delay_signal(u, delay, interpolation=interpolation)
 
 
 # ----------------------------
@@ -45,78 +58,69 @@ def actuator_block(cv_cmd: np.ndarray, dt_s: float, p: ActuatorParams) -> np.nda
     """
     Applies (in order):
       1) saturation
-      2) rate limit
-      3) first-order lag
+      2) rate limit (segmented, bit-identical to the per-sample loop)
+      3) first-order lag, y[k] = y[k-1] + a (u[k] - y[k-1]), a = dt / tau,
+         evaluated as an IIR over the whole array
     """
     # 1) saturation
     u = np.clip(cv_cmd, float(p.pv_min), float(p.pv_max))
 
     # 2) rate limiting
     if float(p.rate_limit) > 0.0:
-        r = float(p.rate_limit)
-        out = np.empty_like(u)
-        out[0] = u[0]
-        max_step = r * dt_s
-        for k in range(1, len(u)):
-            du = u[k] - out[k - 1]
-            if du > max_step:
-                du = max_step
-            elif du < -max_step:
-                du = -max_step
-            out[k] = out[k - 1] + du
-        u = out
-
-    # 3) first-order lag
+        u = rate_limit(u, float(p.rate_limit) * dt_s)
+
+    # 3) first-order lag, starting at y[0] = u[0]:
+    #    s[k] = (1 - a) s[k-1] + a u[k],  s[-1] = u[0]
     tau = float(p.tau_s)
-    if tau > 0.0:
-        out = np.empty_like(u)
-        out[0] = u[0]
+    if tau > 0.0 and len(u):
         a = dt_s / max(tau, 1e-12)
-        # stable Euler: y += a*(u - y)
-        for k in range(1, len(u)):
-            out[k] = out[k - 1] + a * (u[k] - out[k - 1])
-        u = out
+        y = state_space_filter(np.array([[1.0 - a]]), np.array([a]), u, np.array([u[0]]))[:, 0]
+        y[0] = u[0]  # exact start, as in the loop
+        u = y
 
     return u
 
 
+def _simulate_zoh(A: np.ndarray, B: np.ndarray, u: np.ndarray, dt_s: float) -> np.ndarray:
+    """
+    First state of x' = A x + B u with u held constant over each sample
+    (exact ZOH), x(0) = 0. Same timing as an explicit-Euler loop: y[k] is
+    driven by u[0..k-1]. Evaluated as one linear recurrence over the whole
+    input, so it is stable for any dt.
+    """
+    Ad, Bd = zoh_discretize(A, B, dt_s)
+    u_prev = np.empty(len(u), dtype=float)
+    if len(u):
+        u_prev[0] = 0.0
+        u_prev[1:] = u[:-1]
+    return state_space_filter(Ad, Bd[:, 0], u_prev)[:, 0]
+
+
 def simulate_fopdt(t: np.ndarray, u: np.ndarray, dt_s: float, p: FOPDTParams) -> np.ndarray:
     tau = max(float(p.tau_s), 1e-9)
     K = float(p.K)
-    y = np.zeros_like(t, dtype=float)
-    for k in range(1, len(t)):
-        ydot = (K * u[k - 1] - y[k - 1]) / tau
-        y[k] = y[k - 1] + dt_s * ydot
-    return y
+    # tau y' = K u - y
+    return _simulate_zoh(np.array([[-1.0 / tau]]), np.array([K / tau]), u[:len(t)], dt_s)
+
 
 def simulate_ipdt(t: np.ndarray, u: np.ndarray, dt_s: float, p: IPDTParams) -> np.ndarray:
     K = float(p.K)
     leak_tau = float(p.leak_tau_s)
 
-    y = np.zeros_like(t, dtype=float)
-    for k in range(1, len(t)):
-        if leak_tau > 1e-9:
-            ydot = K * u[k-1] - (y[k-1] / leak_tau)
-        else:
-            ydot = K * u[k-1]
-        y[k] = y[k-1] + dt_s * ydot
-    return y
+    # y' = K u - y / leak_tau  (pure integrator without leak)
+    a = -1.0 / leak_tau if leak_tau > 1e-9 else 0.0
+    return _simulate_zoh(np.array([[a]]), np.array([K]), u[:len(t)], dt_s)
+
 
 def simulate_sopdt_underdamped(t: np.ndarray, u: np.ndarray, dt_s: float, p: SOPDTUnderdampedParams) -> np.ndarray:
     zeta = float(p.zeta)
     wn = max(float(p.wn), 1e-6)
     K = float(p.K)
 
-    y = np.zeros_like(t, dtype=float)
-    ydot = 0.0
-
-    for k in range(1, len(t)):
-        u_k = float(u[k - 1])
-        yddot = (-2.0 * zeta * wn) * ydot - (wn * wn) * y[k - 1] + (K * wn * wn) * u_k
-        ydot = ydot + dt_s * yddot
-        y[k] = y[k - 1] + dt_s * ydot
-
-    return y
+    # state (y, y'):  y'' = -2 zeta wn y' - wn^2 y + K wn^2 u
+    A = np.array([[0.0, 1.0], [-(wn * wn), -2.0 * zeta * wn]])
+    B = np.array([0.0, K * wn * wn])
+    return _simulate_zoh(A, B, u[:len(t)], dt_s)
 
 
 def simulate_step_response(
@@ -127,10 +131,15 @@ def simulate_step_response(
     fopdt: FOPDTParams | None = None,
     ipdt: IPDTParams | None = None,
     sopdt: SOPDTUnderdampedParams | None = None,
+    theta_profile_s: np.ndarray | None = None,
+    deadtime_interpolation: DelayInterpolation = "linear",
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
     Returns:
       t, cv_cmd (export), pv, cv_eff (internal, optional for plot)
+
+    theta_profile_s: optional per-sample deadtime (len(t) values, seconds)
+    used instead of the model's constant theta_s.
     """
     dt_s = max(float(spec.dt_s), 1e-6)
     n = int(round(float(spec.duration_s) / dt_s)) + 1
@@ -145,17 +154,25 @@ def simulate_step_response(
     # Drive PV with delta input about operating point
     u = cv_eff - float(spec.cv0)
 
+    def delayed(theta_s: float) -> np.ndarray:
+        if theta_profile_s is not None:
+            theta = np.asarray(theta_profile_s, dtype=float)
+            if theta.shape != u.shape:
+                raise ValueError("theta_profile_s must have one value per sample")
+            return apply_deadtime(u, dt_s, theta, interpolation=deadtime_interpolation)
+        return apply_deadtime(u, dt_s, theta_s, interpolation=deadtime_interpolation)
+
     if model == "FOPDT":
         p = fopdt or FOPDTParams()
-        u_d = apply_deadtime(u, dt_s, float(p.theta_s))
+        u_d = delayed(float(p.theta_s))
         y = simulate_fopdt(t, u_d, dt_s, p)
     elif model == "IPDT":
         p = ipdt or IPDTParams()
-        u_d = apply_deadtime(u, dt_s, float(p.theta_s))
+        u_d = delayed(float(p.theta_s))
         y = simulate_ipdt(t, u_d, dt_s, p)
     elif model == "SOPDT_UNDERDAMPED":
         p = sopdt or SOPDTUnderdampedParams()
-        u_d = apply_deadtime(u, dt_s, float(p.theta_s))
+        u_d = delayed(float(p.theta_s))
         y = simulate_sopdt_underdamped(t, u_d, dt_s, p)
     else:
         raise ValueError(f"Unknown model: {model}")
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Optional, Sequence
+
+import numpy as np
+
+from models.step_response_tuning import (
+    AutoSelectionPolicy,
+    MultiStepReport,
+    StepIdResult,
+    StepSegment,
+)
+from .step_identification_service import (
+    PVModelType,
+    IdentifyMethod,
+    StepSeries,
+    auto_select_spans,
+    identify,
+    settle_index,
+)
+
+
+def segment_steps(
+    ts: StepSeries,
+    *,
+    threshold: Optional[float] = None,
+    min_step_fraction: float = 0.02,
+    min_gap_s: float = 0.0,
+) -> tuple[StepSegment, ...]:
+    """
+    Split a multi-step record at every CV edge.
+
+    An edge is a run of samples whose CV change exceeds `threshold` (default:
+    min_step_fraction of the CV range, raised above the CV noise estimated
+    from the median absolute sample-to-sample change). Runs closer than
+    min_gap_s count as one edge, so ramped or chattering steps stay whole.
+
+    Each segment runs from just after the previous edge to the last sample
+    before the next one, so it holds one edge with its full pre- and
+    post-step plateaus. One pass of NumPy calls: linear in the record length.
+    """
+    cv = np.asarray(ts.cv, dtype=float)
+    n = len(cv)
+    if n < 3:
+        return ()
+
+    d = np.diff(cv)
+    d = np.where(np.isfinite(d), d, 0.0)
+    ad = np.abs(d)
+
+    if threshold is None:
+        finite = cv[np.isfinite(cv)]
+        span = float(finite.max() - finite.min()) if finite.size else 0.0
+        noise = 1.4826 * float(np.median(ad))
+        threshold = max(float(min_step_fraction) * span, 6.0 * noise)
+    if threshold <= 0:
+        return ()
+
+    hits = np.flatnonzero(ad > threshold)
+    if hits.size == 0:
+        return ()
+
+    gap = max(int(round(float(min_gap_s) / max(float(ts.dt_s), 1e-12))), 1)
+    new_edge = np.empty(hits.size, dtype=bool)
+    new_edge[0] = True
+    new_edge[1:] = np.diff(hits) > gap
+    first = hits[new_edge]
+    last = hits[np.r_[new_edge[1:], True]]
+
+    # diff index k is the change from sample k to k + 1
+    step_i = first + 1
+    du = cv[last + 1] - cv[first]
+    a = np.r_[0, last[:-1] + 1]
+    b = np.r_[first[1:] + 1, n]
+
+    return tuple(
+        StepSegment(a=int(a[j]), b=int(b[j]), step_i=int(step_i[j]), du=float(du[j]))
+        for j in range(len(first))
+    )
+
+
+def identify_segments(
+    ts: StepSeries,
+    model: PVModelType,
+    *,
+    segments: Optional[Sequence[StepSegment]] = None,
+    selection_policy: Optional[AutoSelectionPolicy] = None,
+    method: IdentifyMethod = "heuristic",
+    workers: Optional[int] = None,
+) -> MultiStepReport:
+    """
+    Identify every step of a multi-step record on its own and report how the
+    model parameters drift across operating points.
+
+    segments default to segment_steps(ts). Each is cut out of the record and
+    handled like a single-step log, with its baseline starting once the PV
+    has settled from the previous step: auto_select_spans(selection_policy),
+    then identify(method). With workers > 1 segments run on a process pool. A
+    segment that cannot be identified is reported in `errors` and left out of
+    the drift statistics.
+    """
+    segs = tuple(segment_steps(ts) if segments is None else segments)
+    policy = selection_policy or AutoSelectionPolicy()
+    starts = _settled_starts(ts, segs, policy)
+    pieces = [_slice_series(ts, a, s.b) for a, s in zip(starts, segs)]
+
+    if workers is not None and workers > 1 and len(pieces) > 1:
+        with ProcessPoolExecutor(max_workers=int(workers)) as pool:
+            outs = list(pool.map(_identify_segment, pieces, repeat(model), repeat(policy), repeat(method)))
+    else:
+        outs = [_identify_segment(p, model, policy, method) for p in pieces]
+
+    results = tuple(r for r, _ in outs)
+    errors = tuple(e for _, e in outs)
+
+    op = np.array([r.pv0 if r is not None else np.nan for r in results], dtype=float)
+    names = sorted({k for r in results if r is not None for k in r.params} | ({"theta_s"} if results else set()))
+    params = {
+        name: np.array(
+            [np.nan if r is None else (r.theta_s if name == "theta_s" else r.params.get(name, np.nan)) for r in results],
+            dtype=float,
+        )
+        for name in names
+    }
+    drift = {name: _drift_stats(op, values) for name, values in params.items()}
+
+    return MultiStepReport(
+        model=model,
+        method=method,
+        segments=segs,
+        results=results,
+        errors=errors,
+        operating_point=op,
+        params=params,
+        drift=drift,
+    )
+
+
+def _settled_starts(ts: StepSeries, segs: Sequence[StepSegment], policy: AutoSelectionPolicy) -> list[int]:
+    """
+    Where each segment's usable pre-step data begins. A segment starts right
+    after the previous edge, while the PV is still answering that step: the
+    baseline must begin once it has settled (same rule as the FINAL span of
+    auto_select_spans), keeping at least min_baseline_samples.
+    """
+    pv = ts.pv
+    # per-sample noise from the median absolute difference (robust to the steps)
+    dp = np.diff(pv)
+    dp = dp[np.isfinite(dp)]
+    sigma = 1.4826 * float(np.median(np.abs(dp))) / np.sqrt(2.0) if dp.size else 0.0
+
+    starts = []
+    prev_value = float("nan")
+    for seg in segs:
+        plateau = pv[seg.a:seg.step_i]
+        n_tail = max(int(len(plateau) * policy.tail_fraction), int(policy.min_final_samples), 1)
+        tail = plateau[-n_tail:]
+        tail = tail[np.isfinite(tail)]
+        value = float(np.mean(tail)) if tail.size else float("nan")
+
+        a = seg.a
+        if np.isfinite(prev_value) and np.isfinite(value):
+            a += settle_index(plateau, prev_value, value, sigma, policy)
+            a = max(min(a, seg.step_i - int(policy.min_baseline_samples)), seg.a)
+        starts.append(a)
+        prev_value = value
+    return starts
+
+
+def _slice_series(ts: StepSeries, a: int, b: int) -> StepSeries:
+    # views, absolute time kept: results report t_step_s in record time
+    return StepSeries(
+        t=ts.t[a:b],
+        cv=ts.cv[a:b],
+        pv=ts.pv[a:b],
+        dt_s=ts.dt_s,
+        source_path=ts.source_path,
+    )
+
+
+def _identify_segment(
+    ts: StepSeries,
+    model: PVModelType,
+    policy: AutoSelectionPolicy,
+    method: IdentifyMethod,
+) -> tuple[Optional[StepIdResult], str]:
+    # module level: runs in worker processes; the overlay is not sent back
+    try:
+        sel = auto_select_spans(ts, model, policy)
+        res, _ = identify(ts, sel, model, method=method)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    return res, ""
+
+
+def _drift_stats(op: np.ndarray, values: np.ndarray) -> dict[str, float]:
+    ok = np.isfinite(values)
+    v = values[ok]
+    if v.size == 0:
+        nan = float("nan")
+        return {"mean": nan, "std": nan, "spread_pct": nan, "min": nan, "max": nan, "slope": nan}
+
+    mean = float(np.mean(v))
+    std = float(np.std(v, ddof=1)) if v.size > 1 else 0.0
+    x = op[ok]
+    fit = np.isfinite(x)
+    slope = float("nan")
+    if np.count_nonzero(fit) > 1 and np.ptp(x[fit]) > 0:
+        slope = float(np.polyfit(x[fit], v[fit], 1)[0])
+    return {
+        "mean": mean,
+        "std": std,
+        "spread_pct": 100.0 * std / abs(mean) if mean != 0 else float("nan"),
+        "min": float(np.min(v)),
+        "max": float(np.max(v)),
+        "slope": slope,
+    }
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
+from typing import Literal, Optional
+
 from models.kalman import (
     TimeSeriesData,
     SpanSelections,
     TuningResult,
+    KalmanRunConfig,
+    AutotuneBounds,
+    AutotuneResult,
 )
 from .helpers import (
     rx_from_steady_span,
     qx_dot_from_ramp_span_excel_like
 )
+from .kalman_service import run_kalman_batch_likelihood
 import numpy as np
 
+AutotuneObjective = Literal["nll", "nis"]
+
 
 def compute_tuning(ts: TimeSeriesData, spans: SpanSelections) -> TuningResult:
     """
@@ -60,3 +69,165 @@ def compute_tuning(ts: TimeSeriesData, spans: SpanSelections) -> TuningResult:
         steady_span=steady_span,
         ramp_span=ramp_span,
     )
+
+
+# ----------------------------
+# automatic tuning (innovation likelihood)
+# ----------------------------
+
+def default_autotune_bounds(ts: TimeSeriesData) -> AutotuneBounds:
+    """
+    Wide search box scaled from the signal itself:
+      s = Var(diff(x)) / 2  (≈ measurement variance for a slowly moving signal)
+      r_x     in [1e-3, 10] * s
+      q_x     in [1e-8, 1]  * s
+      q_x_dot in [1e-8, 10] * s / dt^2
+    """
+    dx = np.diff(ts.x)
+    dx = dx[np.isfinite(dx)]
+    s = float(np.var(dx)) / 2.0 if dx.size > 1 else 1.0
+    if not np.isfinite(s) or s <= 0.0:
+        s = 1.0
+    dt = ts.dt_s if np.isfinite(ts.dt_s) and ts.dt_s > 0 else 1.0
+    return AutotuneBounds(
+        r_x=(1e-3 * s, 10.0 * s),
+        q_x=(1e-8 * s, 1.0 * s),
+        q_x_dot=(1e-8 * s / dt ** 2, 10.0 * s / dt ** 2),
+    )
+
+
+def _score_candidates(
+    t_s: np.ndarray,
+    x: np.ndarray,
+    params: np.ndarray,
+    objective: AutotuneObjective,
+    window: Optional[int],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Batched filter over candidate rows (r_x, q_x, q_x_dot).
+    Returns (score, mean_nis); lower score is better.
+    """
+    cfgs = [KalmanRunConfig(r_x=float(r), q_x=float(q), q_x_dot=float(qd)) for r, q, qd in params]
+    nll, mean_nis = run_kalman_batch_likelihood(t_s, x, cfgs, window=window)
+    if objective == "nll":
+        return nll, mean_nis
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = np.log(mean_nis) ** 2
+    return np.where(np.isfinite(score), score, np.inf), mean_nis
+
+
+def autotune_kalman(
+    ts: TimeSeriesData,
+    bounds: Optional[AutotuneBounds] = None,
+    *,
+    objective: AutotuneObjective = "nll",
+    grid_points: int = 7,
+    iterations: int = 3,
+    window: Optional[int] = 4096,
+    processes: Optional[int] = None,
+) -> AutotuneResult:
+    """
+    Tune (r_x, q_x, q_x_dot) from the whole signal, no spans needed.
+
+    objective:
+      - "nll" : minimize the innovation negative log-likelihood
+      - "nis" : drive the mean normalized innovation squared to 1
+                (weakly identifiable; prefer "nll")
+
+    Search: a log-spaced grid of grid_points per free value is scored in one
+    batched filter pass. Each further iteration re-centres the grid on the
+    best candidate and spans two of the previous grid steps either side of
+    it, i.e. the half-width shrinks by (grid_points - 1) / 2 (3x at the
+    default 7 points; grid_points <= 3 does not narrow). Values with
+    lo == hi are held fixed.
+
+    window: likelihood evaluated over warmed-up overlapping windows (see
+    run_kalman_batch_likelihood); None scores the exact sequential pass.
+    processes > 1 splits each grid across a process pool.
+    """
+    if bounds is None:
+        bounds = default_autotune_bounds(ts)
+    if grid_points < 2:
+        raise ValueError("grid_points must be >= 2")
+
+    ranges = [bounds.r_x, bounds.q_x, bounds.q_x_dot]
+    lo = np.empty(3)
+    hi = np.empty(3)
+    free = np.zeros(3, dtype=bool)
+    for i, (a, b) in enumerate(ranges):
+        a, b = float(a), float(b)
+        if b < a:
+            raise ValueError("Autotune bounds require lo <= hi")
+        if a == b:
+            lo[i] = hi[i] = a
+            continue
+        if a <= 0.0:
+            raise ValueError("Autotune bounds must be > 0 for searched values")
+        lo[i], hi[i] = np.log10(a), np.log10(b)
+        free[i] = True
+
+    center = np.where(free, 0.5 * (lo + hi), lo)
+    half = np.where(free, 0.5 * (hi - lo), 0.0)
+
+    best_params = np.where(free, 10.0 ** center, lo)
+    best_score = np.inf
+    best_nis = float("nan")
+    n_eval = 0
+
+    pool = ProcessPoolExecutor(max_workers=processes) if processes and processes > 1 else None
+    try:
+        for _ in range(max(int(iterations), 1)):
+            axes = []
+            for i in range(3):
+                if free[i]:
+                    g = np.linspace(center[i] - half[i], center[i] + half[i], grid_points)
+                    axes.append(10.0 ** np.unique(np.clip(g, lo[i], hi[i])))
+                else:
+                    axes.append(np.array([lo[i]]))
+            mesh = np.meshgrid(*axes, indexing="ij")
+            params = np.column_stack([m.ravel() for m in mesh])
+
+            if pool is None:
+                score, nis = _score_candidates(ts.t, ts.x, params, objective, window)
+            else:
+                chunks = np.array_split(params, processes)
+                futures = [pool.submit(_score_candidates, ts.t, ts.x, c, objective, window) for c in chunks if len(c)]
+                parts = [f.result() for f in futures]
+                score = np.concatenate([p[0] for p in parts])
+                nis = np.concatenate([p[1] for p in parts])
+            n_eval += len(params)
+
+            i_best = int(np.argmin(score))
+            if score[i_best] < best_score:
+                best_score = float(score[i_best])
+                best_params = params[i_best]
+                best_nis = float(nis[i_best])
+
+            center = np.where(free, np.log10(best_params), lo)
+            half = half * (2.0 / (grid_points - 1))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if not np.isfinite(best_score):
+        raise ValueError("Autotune found no candidate with a valid innovation variance")
+
+    r_x, q_x, q_x_dot = (float(v) for v in best_params)
+    dt = ts.dt_s
+
+    return AutotuneResult(
+        r_x=r_x,
+        sigma_x=float(np.sqrt(r_x)),
+        q_x_dot=q_x_dot,
+        dv_count=0,
+        q_x_user=q_x,
+        q_x_consistent=0.25 * q_x_dot * (dt ** 2),
+        q_xv_consistent=0.5 * q_x_dot * dt,
+        steady_span=None,
+        ramp_span=None,
+        q_x=q_x,
+        objective=objective,
+        objective_value=best_score,
+        mean_nis=best_nis,
+        n_evaluations=n_eval,
+    )
@@ -0,0 +1,198 @@
+"""
+Literal copies of the original per-sample implementations that the fast
+paths replaced. The regression tests compare against these, so they must
+stay as they were: do not "optimize" this module.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+def procedural_kalman(t_s, x, cfg):
+    # run_procedural_kalman before the batch / observer / steady-state paths
+    n = len(x)
+    y = np.empty(n, dtype=float)
+    y_dot = np.empty(n, dtype=float)
+
+    x_pred = float(x[0])
+    x_dot_pred = 0.0
+
+    P00 = float(cfg.p00)
+    P01 = float(cfg.p01)
+    P10 = float(cfg.p01)
+    P11 = float(cfg.p11)
+
+    y[0] = x_pred
+    y_dot[0] = x_dot_pred
+
+    for k in range(1, n):
+        dt_s = float(t_s[k] - t_s[k - 1])
+        if not np.isfinite(dt_s) or dt_s <= 0.0:
+            y[k] = float(x[k])
+            y_dot[k] = 0.0
+            continue
+
+        x_pred = x_pred + (dt_s * x_dot_pred)
+
+        xcov00 = (P00 + dt_s * P10) + dt_s * (P01 + dt_s * P11)
+        xcov01 = (P01 + dt_s * P11)
+        xcov10 = (P10 + dt_s * P11)
+        xcov11 = (P11)
+
+        xcov00 = xcov00 + cfg.q_x
+        xcov11 = xcov11 + cfg.q_x_dot
+
+        y_res = float(x[k] - x_pred)
+        S = xcov00 + cfg.r_x
+
+        if S > 0.0 and np.isfinite(S):
+            K0 = xcov00 / S
+            K1 = xcov10 / S
+
+            x_pred = x_pred + (K0 * y_res)
+            x_dot_pred = x_dot_pred + (K1 * y_res)
+
+            if cfg.bleed_enable:
+                if abs(x[k] - x_pred) < cfg.bleed_thresh:
+                    x_dot_pred = x_dot_pred * cfg.bleed_factor
+
+            P00 = (1.0 - K0) * xcov00
+            P01 = (1.0 - K0) * xcov01
+            P10 = xcov10 - (K1 * xcov00)
+            P11 = xcov11 - (K1 * xcov01)
+
+            P10 = P01
+
+        y[k] = x_pred
+        y_dot[k] = x_dot_pred
+
+    return y, y_dot
+
+
+def plc_kalman(t_s, x, cfg):
+    # the structured-text AOI (plc/kalman_filter) statement by statement, one
+    # REAL per tag; dt from an integer-ms timer PRE
+    f32 = np.float32
+    n = len(x)
+    y = np.empty(n, dtype=f32)
+    y_dot = np.empty(n, dtype=f32)
+
+    x = np.asarray(x, dtype=f32)
+    x_pred = x[0]
+    x_dot_pred = f32(0.0)
+    P00, P01, P11 = f32(cfg.p00), f32(cfg.p01), f32(cfg.p11)
+    P10 = P01
+    y[0] = x_pred
+    y_dot[0] = x_dot_pred
+
+    with np.errstate(all="ignore"):
+        for k in range(1, n):
+            d = float(t_s[k]) - float(t_s[k - 1])
+            dt_ms = round(d * 1000.0) if np.isfinite(d) else 0
+            dt = f32(max(dt_ms, 0)) / f32(1000.0)
+            if not dt > 0.0:
+                y[k] = x[k]
+                y_dot[k] = 0.0
+                continue
+
+            x_pred = x_pred + dt * x_dot_pred
+            xcov00 = (P00 + dt * P10) + dt * (P01 + dt * P11)
+            xcov01 = P01 + dt * P11
+            xcov10 = P10 + dt * P11
+            xcov11 = P11
+            xcov00 = xcov00 + f32(cfg.q_x)
+            xcov11 = xcov11 + f32(cfg.q_x_dot)
+
+            y_res = x[k] - x_pred
+            S = xcov00 + f32(cfg.r_x)
+            if S > 0.0:
+                K0 = xcov00 / S
+                K1 = xcov10 / S
+                x_pred = x_pred + K0 * y_res
+                x_dot_pred = x_dot_pred + K1 * y_res
+                if cfg.bleed_enable and abs(x[k] - x_pred) < f32(cfg.bleed_thresh):
+                    x_dot_pred = x_dot_pred * f32(cfg.bleed_factor)
+                P00 = (f32(1.0) - K0) * xcov00
+                P01 = (f32(1.0) - K0) * xcov01
+                P11 = xcov11 - K1 * xcov01
+                P10 = P01
+
+            y[k] = x_pred
+            y_dot[k] = x_dot_pred
+
+    return y, y_dot
+
+
+def rate_limit_loop(u, max_step):
+    # actuator_block step 2
+    out = np.empty_like(u)
+    out[0] = u[0]
+    for k in range(1, len(u)):
+        du = u[k] - out[k - 1]
+        if du > max_step:
+            du = max_step
+        elif du < -max_step:
+            du = -max_step
+        out[k] = out[k - 1] + du
+    return out
+
+
+def lag_loop(u, dt_s, tau):
+    # actuator_block step 3
+    out = np.empty_like(u)
+    out[0] = u[0]
+    a = dt_s / max(tau, 1e-12)
+    for k in range(1, len(u)):
+        out[k] = out[k - 1] + a * (u[k] - out[k - 1])
+    return out
+
+
+def shift_deadtime(u, dt_s, theta_s):
+    # apply_deadtime: whole samples only
+    n_delay = int(round(max(theta_s, 0.0) / max(dt_s, 1e-12)))
+    if n_delay <= 0:
+        return u.copy()
+    out = np.empty_like(u)
+    out[:n_delay] = u[0]
+    out[n_delay:] = u[:-n_delay]
+    return out
+
+
+def ramp_hold_value(profile, t_ms):
+    period = profile.T_UP_MS + profile.T_HOLD_HI_MS + profile.T_DOWN_MS + profile.T_HOLD_LO_MS
+    u = t_ms % period
+
+    if u < profile.T_UP_MS:
+        frac = u / max(profile.T_UP_MS, 1)
+        return profile.X_LO + frac * (profile.X_HI - profile.X_LO)
+
+    u -= profile.T_UP_MS
+    if u < profile.T_HOLD_HI_MS:
+        return profile.X_HI
+
+    u -= profile.T_HOLD_HI_MS
+    if u < profile.T_DOWN_MS:
+        frac = u / max(profile.T_DOWN_MS, 1)
+        return profile.X_HI - frac * (profile.X_HI - profile.X_LO)
+
+    return profile.X_LO
+
+
+def deadtime_index_threshold(pv, base, step_i):
+    # auto_detect_deadtime_index before the detector options
+    a, b = base
+    dp = np.diff(pv)
+    dp_base = dp[max(a, 0):max(b - 1, 0)]
+    dp_base = dp_base[np.isfinite(dp_base)]
+    if dp_base.size < 5:
+        return None
+
+    sigma = float(np.std(dp_base, ddof=1))
+    thr = max(5.0 * sigma, 1e-12)
+
+    for k in range(max(step_i, 1), len(pv) - 1):
+        if not np.isfinite(dp[k]):
+            continue
+        if abs(dp[k]) >= thr:
+            return k + 1
+    return None
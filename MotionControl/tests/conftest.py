@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the app runs from MotionControl/ and imports models, services, components
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,46 @@
+import os
+import stat
+import sys
+
+import numpy as np
+import pytest
+
+from services.helpers.column_cache_helpers import (
+    cache_dir_for,
+    read_column_cache,
+    write_column_cache,
+)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "log.csv"
+    path.write_text("time,x\n0,1\n1,2\n")
+    return str(path)
+
+
+def test_round_trip(source):
+    arrays = {"t": np.arange(5.0), "x": np.linspace(0.0, 1.0, 5)}
+    assert write_column_cache(source, "tag", arrays, {"dt_s": 1.0})
+    cached = read_column_cache(source, "tag")
+    assert cached is not None
+    got, meta = cached
+    for name, values in arrays.items():
+        np.testing.assert_array_equal(got[name], values)
+    assert meta == {"dt_s": 1.0}
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permission bits")
+@pytest.mark.parametrize("mask", [0o022, 0o027])
+def test_cache_files_get_the_umask_mode(source, mask):
+    # a shared commissioning folder: colleagues must be able to read the cache
+    old = os.umask(mask)
+    try:
+        assert write_column_cache(source, "tag", {"t": np.arange(3.0)})
+    finally:
+        os.umask(old)
+    folder = cache_dir_for(source)
+    names = os.listdir(folder)
+    assert names and not any(n.startswith(".") for n in names)
+    for n in names:
+        assert stat.S_IMODE(os.stat(os.path.join(folder, n)).st_mode) == 0o666 & ~mask
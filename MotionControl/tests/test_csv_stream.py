@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.csv_service import load_csv
+from services.helpers import MedianSketch, stream_csv_columns
+from services.step_identification_service import load_step_csv
+
+
+def _reference_columns(path, columns):
+    # the pre-streaming loaders: whole-file read_csv, then finite filter
+    df = pd.read_csv(path)
+    cols = {c: df[c].to_numpy(dtype=float) for c in columns}
+    ok = np.ones(len(df), dtype=bool)
+    for v in cols.values():
+        ok &= np.isfinite(v)
+    return {c: v[ok] for c, v in cols.items()}
+
+
+def _median_dt(t):
+    dt = np.diff(t)
+    return float(np.median(dt[np.isfinite(dt) & (dt > 0)]))
+
+
+@pytest.fixture
+def jittered_csv(tmp_path):
+    # PC-logged timebase: nearly every dt is distinct (> 65536 of them)
+    rng = np.random.default_rng(1)
+    n = 120_000
+    t = np.cumsum(1e-3 + rng.normal(0.0, 1e-7, n))
+    x = rng.normal(size=n)
+    x[::997] = np.nan
+    x[5::1009] = np.inf
+    t[7::4999] = t[6::4999]  # repeated timestamps: dt = 0 is ignored
+    cv = np.where(np.arange(n) > n // 2, 2.0, 1.0)
+    path = tmp_path / "log.csv"
+    pd.DataFrame({"time": t, "x": x, "PV": x, "CV": cv}).to_csv(path, index=False)
+    return str(path)
+
+
+def test_sketch_is_exact_for_few_distinct_values():
+    rng = np.random.default_rng(0)
+    s = MedianSketch()
+    seen = []
+    for _ in range(20):
+        v = rng.choice([1e-3, 2e-3, 1e-3 + 1e-9], size=5001)
+        s.add(v)
+        seen.append(v)
+    assert s.exact
+    assert s.median() == np.median(np.concatenate(seen))
+
+
+@pytest.mark.parametrize("max_bins", [64, 256, 1024])
+def test_sketch_rank_error_is_bounded_after_compression(max_bins):
+    rng = np.random.default_rng(max_bins)
+    s = MedianSketch(max_bins=max_bins)
+    seen = []
+    for i in range(200):
+        # heavy repeated values mixed with continuous ones
+        v = np.r_[rng.lognormal(0.0, 1.0, 3000), np.full(int(rng.integers(0, 3000)), 1.5)]
+        s.add(v)
+        seen.append(v)
+    assert not s.exact
+    assert len(s._values) <= max_bins
+    a = np.sort(np.concatenate(seen))
+    m = s.median()
+    lo, hi = np.searchsorted(a, m, side="left"), np.searchsorted(a, m, side="right")
+    # distance (in ranks) from the returned value to the middle rank
+    err = max(0, lo - len(a) // 2, len(a) // 2 - hi) / len(a)
+    assert err <= 8.0 / max_bins
+
+
+@pytest.mark.parametrize("chunk_rows", [1000, 4096, 1 << 18])
+def test_stream_matches_whole_file_read(jittered_csv, chunk_rows):
+    arrays, sketch = stream_csv_columns(
+        jittered_csv, ["time", "x"], finite=["time", "x"], chunk_rows=chunk_rows
+    )
+    ref = _reference_columns(jittered_csv, ["time", "x"])
+    np.testing.assert_array_equal(arrays["time"], ref["time"])
+    np.testing.assert_array_equal(arrays["x"], ref["x"])
+    assert sketch.exact
+    assert sketch.median() == _median_dt(ref["time"])
+
+
+@pytest.mark.parametrize("time_unit", ["s", "ms"])
+def test_load_csv_matches_baseline(jittered_csv, time_unit):
+    ref = _reference_columns(jittered_csv, ["time", "x"])
+    t = ref["time"] / 1000.0 if time_unit == "ms" else ref["time"]
+    for use_cache in (False, True, True):  # parse, write cache, read cache
+        data = load_csv(jittered_csv, time_unit=time_unit, use_cache=use_cache)
+        np.testing.assert_array_equal(data.t, t)
+        np.testing.assert_array_equal(data.x, ref["x"])
+        assert data.dt_s == _median_dt(t)
+
+
+def test_load_step_csv_matches_baseline(jittered_csv):
+    ref = _reference_columns(jittered_csv, ["time", "PV", "CV"])
+    ts = load_step_csv(jittered_csv, use_cache=False)
+    np.testing.assert_array_equal(ts.t, ref["time"])
+    np.testing.assert_array_equal(ts.pv, ref["PV"])
+    np.testing.assert_array_equal(ts.cv, ref["CV"])
+    assert ts.dt_s == _median_dt(ref["time"])
@@ -0,0 +1,46 @@
+import io
+
+import numpy as np
+import pytest
+
+from services.helpers import format_fixed_rows, write_csv_columns
+
+
+def _reference(columns, decimals):
+    return "".join(
+        ",".join(f"{v:.{decimals}f}" for v in row) + "\n" for row in zip(*columns)
+    ).encode("ascii")
+
+
+# values on or within float error of a decimal tie, signs and zeros
+EDGE = np.array([
+    124.9298845, 0.0000005, 0.0000015, 2.5e-7, -2.5e-7, -0.0, 0.0, 0.5, 1.5,
+    2.5, -0.5, 1e15 + 0.5, 123456.0000005, 0.1234565, 9.9999995, -9.9999995,
+    1e-300, -1e-300, 999999.9999995,
+])
+
+
+@pytest.mark.parametrize("decimals", [0, 1, 3, 6, 9])
+def test_matches_fstring_formatting(decimals):
+    rng = np.random.default_rng(decimals)
+    n = 100_000
+    a = np.r_[EDGE, rng.uniform(-200.0, 200.0, n)]
+    # values one rounding step away from a tie at this precision
+    b = np.r_[EDGE, np.round(rng.normal(0.0, 1e4, n), decimals) + 0.5 * 10.0**-decimals]
+    assert format_fixed_rows([a, b], decimals) == _reference([a, b], decimals)
+
+
+def test_non_finite_and_huge_columns_fall_back():
+    a = np.array([np.nan, np.inf, -np.inf, 1.0])
+    b = np.array([1e300, -3e20, 2.0**53, 0.25])
+    assert format_fixed_rows([a, b]) == _reference([a, b], 6)
+
+
+def test_write_csv_columns_streams_the_same_bytes():
+    rng = np.random.default_rng(0)
+    t = np.arange(10_001) * 1e-3
+    x = rng.normal(size=t.size)
+    for workers in (1, 3):
+        fh = io.BytesIO()
+        write_csv_columns(fh, ["time", "x"], [t, x], chunk_rows=999, workers=workers)
+        assert fh.getvalue() == b"time,x\n" + _reference([t, x], 6)
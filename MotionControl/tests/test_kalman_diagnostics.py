@@ -0,0 +1,55 @@
+import numpy as np
+
+from models.kalman import KalmanRunConfig
+from services.kalman_service import run_kalman_diagnostics, run_procedural_kalman
+
+CFG = KalmanRunConfig(r_x=1.0, q_x=1e-6, q_x_dot=1e-6)
+
+
+def _gapped_trace(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) * 1e-3
+    t[rng.random(n) < 0.05] = np.nan
+    rep = np.flatnonzero(rng.random(n) < 0.05)
+    rep = rep[rep > 0]
+    t[rep] = t[rep - 1]
+    return t, rng.normal(size=n)
+
+
+def test_outputs_match_the_plain_run():
+    t, x = _gapped_trace()
+    y, y_dot, _ = run_kalman_diagnostics(t, x, CFG)
+    y_ref, y_dot_ref = run_procedural_kalman(t, x, CFG)
+    np.testing.assert_array_equal(y, y_ref)
+    np.testing.assert_array_equal(y_dot, y_dot_ref)
+
+
+def test_windows_cover_the_last_valid_updates():
+    t, x = _gapped_trace()
+    w = 50
+    _, _, d = run_kalman_diagnostics(t, x, CFG, window=w)
+    nu = d.normalized_innovation
+    updates = np.flatnonzero(np.isfinite(nu))
+    assert d.n_valid == len(updates)
+
+    for i in range(len(x)):
+        z = nu[updates[updates <= i][-w:]]
+        if z.size == 0:
+            assert np.isnan(d.nis_window[i])
+            continue
+        np.testing.assert_allclose(d.nis_window[i], np.mean(z * z), rtol=1e-12)
+        if z.size > 2:
+            m = z.mean()
+            white = (np.mean(z[1:] * z[:-1]) - m * m) / (np.mean(z * z) - m * m)
+            np.testing.assert_allclose(d.whiteness_window[i], white, rtol=1e-9, atol=1e-12)
+
+
+def test_consistent_filter_is_in_band():
+    rng = np.random.default_rng(1)
+    n = 20000
+    t = np.arange(n) * 1e-3
+    x = rng.normal(size=n)
+    _, _, d = run_kalman_diagnostics(t, x, CFG, window=200)
+    assert abs(d.nis_mean - 1.0) < 0.05
+    assert abs(d.whiteness) < 0.05
+    assert d.nis_in_band > 0.8
@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+
+from models.kalman import KalmanRunConfig
+from services import (
+    KalmanObserver,
+    run_kalman_batch,
+    run_kalman_channels,
+    run_procedural_kalman,
+)
+from services.helpers import LruCache
+
+from baseline_reference import plc_kalman, procedural_kalman
+
+CFGS = [
+    KalmanRunConfig(r_x=0.5, q_x=1e-3, q_x_dot=1e-2),
+    KalmanRunConfig(r_x=2.0, q_x=1e-6, q_x_dot=5.0),
+    KalmanRunConfig(r_x=1e-3, q_x=10.0, q_x_dot=1e-4, bleed_enable=True, bleed_thresh=0.05, bleed_factor=0.9),
+    KalmanRunConfig(r_x=0.0, q_x=0.0, q_x_dot=0.0),  # S = 0: updates skipped
+]
+
+
+def _trace(n=4000, seed=0, gaps=True):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) * 1e-3 + 5.0
+    if gaps:
+        # NaN, repeated and backwards timestamps: pass-through samples
+        t[rng.random(n) < 0.02] = np.nan
+        rep = np.flatnonzero(rng.random(n) < 0.02)
+        rep = rep[rep > 0]
+        t[rep] = t[rep - 1]
+        t[rng.integers(1, n, 5)] -= 0.01
+    x = 3.0 * np.sin(2.0 * np.arange(n) * 1e-3) + rng.normal(0.0, 0.2, n)
+    return t, x
+
+
+@pytest.mark.parametrize("cfg", CFGS)
+def test_procedural_kalman_matches_baseline(cfg):
+    t, x = _trace()
+    for a, b in zip(run_procedural_kalman(t, x, cfg), procedural_kalman(t, x, cfg)):
+        np.testing.assert_array_equal(a, b)
+
+
+@pytest.mark.parametrize("cfg", CFGS)
+def test_observer_chunking_matches_baseline(cfg):
+    t, x = _trace()
+    ref_y, ref_v = procedural_kalman(t, x, cfg)
+    rng = np.random.default_rng(1)
+    cuts = np.sort(rng.choice(np.arange(1, len(x)), 30, replace=False))
+    obs = KalmanObserver(cfg)
+    parts = [obs.push_many(tc, xc) for tc, xc in zip(np.split(t, cuts), np.split(x, cuts))]
+    np.testing.assert_array_equal(np.concatenate([p[0] for p in parts]), ref_y)
+    np.testing.assert_array_equal(np.concatenate([p[1] for p in parts]), ref_v)
+
+    # snapshot / restore resumes exactly
+    obs = KalmanObserver(cfg)
+    obs.push_many(t[:1000], x[:1000])
+    state = obs.snapshot()
+    first = obs.push_many(t[1000:], x[1000:])
+    obs.restore(state)
+    np.testing.assert_array_equal(obs.push_many(t[1000:], x[1000:])[0], first[0])
+    np.testing.assert_array_equal(first[0], ref_y[1000:])
+
+
+def test_batch_rows_match_baseline():
+    t, x = _trace()
+    y, y_dot = run_kalman_batch(t, x, CFGS)
+    assert y.shape == (len(CFGS), len(x))
+    for i, cfg in enumerate(CFGS):
+        ref_y, ref_v = procedural_kalman(t, x, cfg)
+        np.testing.assert_array_equal(y[i], ref_y)
+        np.testing.assert_array_equal(y_dot[i], ref_v)
+
+
+def test_channels_match_baseline():
+    t, _ = _trace()
+    chans = np.column_stack([_trace(seed=s)[1] for s in range(len(CFGS))])
+    y, y_dot = run_kalman_channels(t, chans, CFGS)
+    for c, cfg in enumerate(CFGS):
+        ref_y, ref_v = procedural_kalman(t, chans[:, c], cfg)
+        np.testing.assert_array_equal(y[:, c], ref_y)
+        np.testing.assert_array_equal(y_dot[:, c], ref_v)
+
+
+def test_empty_trace():
+    e = np.array([])
+    y, y_dot = run_kalman_batch(e, e, CFGS[:2])
+    assert y.shape == y_dot.shape == (2, 0)
+    assert all(len(a) == 0 for a in run_procedural_kalman(e, e, CFGS[0]))
+
+
+@pytest.mark.parametrize("cfg", CFGS[:3])
+def test_steady_state_matches_baseline_to_roundoff(cfg):
+    t, x = _trace(20000, gaps=False)
+    ref_y, ref_v = procedural_kalman(t, x, cfg)
+    y, y_dot = run_procedural_kalman(t, x, cfg, mode="steady_state")
+    # gains converge to tol = 1e-12; IIR evaluation order adds roundoff
+    np.testing.assert_allclose(y, ref_y, rtol=0, atol=1e-9 * np.max(np.abs(ref_y)))
+    np.testing.assert_allclose(y_dot, ref_v, rtol=0, atol=1e-9 * np.max(np.abs(ref_v)))
+
+
+@pytest.mark.parametrize("cfg", CFGS)
+def test_plc_real_matches_structured_text(cfg):
+    # 1 ms timer with jitter: dt rounds to whole milliseconds
+    t, x = _trace()
+    ref_y, ref_v = plc_kalman(t, x, cfg)
+    y, y_dot = run_procedural_kalman(t, x, cfg, precision="plc_real")
+    assert y.dtype == np.float32
+    np.testing.assert_array_equal(y, ref_y)
+    np.testing.assert_array_equal(y_dot, ref_v)
+
+
+def test_plc_real_batch_matches_scalar():
+    t, x = _trace()
+    y, y_dot = run_kalman_batch(t, x, CFGS, precision="plc_real")
+    for i, cfg in enumerate(CFGS):
+        ref_y, ref_v = plc_kalman(t, x, cfg)
+        np.testing.assert_array_equal(y[i], ref_y)
+        np.testing.assert_array_equal(y_dot[i], ref_v)
+
+
+def test_overlay_cache_keys_on_the_config():
+    # the plot overlay cache keys on (series token, config, smoothed)
+    cache = LruCache(maxsize=2)
+    cache.put((1, CFGS[0], False), "a")
+    cache.put((1, KalmanRunConfig(r_x=0.5, q_x=1e-3, q_x_dot=1e-2), True), "b")
+    assert cache.get((1, KalmanRunConfig(r_x=0.5, q_x=1e-3, q_x_dot=1e-2), False)) == "a"
+    cache.put((2, CFGS[0], False), "c")
+    assert (1, CFGS[0], True) not in cache  # least recently used went first
+    assert len(cache) == 2
@@ -0,0 +1,72 @@
+import tracemalloc
+
+import numpy as np
+
+from models.kalman import KalmanRunConfig
+from services import kalman_service
+from services.kalman_service import run_procedural_kalman, run_rts_smoother
+
+CFG = KalmanRunConfig(r_x=0.5, q_x=1e-3, q_x_dot=1e-2)
+
+
+def _trace(n, seed=0, gaps=True):
+    rng = np.random.default_rng(seed)
+    if gaps:
+        # repeated, backwards and missing timestamps exercise the pass-through
+        steps = rng.choice([1e-3, 0.0, -1e-3, np.nan], size=n, p=[0.9, 0.04, 0.03, 0.03])
+    else:
+        steps = np.full(n, 1e-3)
+    t = np.cumsum(steps)
+    x = np.sin(3.0 * np.arange(n) * 1e-3) + rng.normal(0.0, 0.1, n)
+    return t, x
+
+
+def test_forward_outputs_are_the_causal_filter():
+    t, x = _trace(5000)
+    y, y_dot, _, _ = run_rts_smoother(t, x, CFG)
+    y_ref, y_dot_ref = run_procedural_kalman(t, x, CFG)
+    np.testing.assert_array_equal(y, y_ref)
+    np.testing.assert_array_equal(y_dot, y_dot_ref)
+
+
+def test_chunking_does_not_change_the_result(monkeypatch):
+    t, x = _trace(5000)
+    ref = run_rts_smoother(t, x, CFG)
+    for chunk in (1, 7, 1000):
+        monkeypatch.setattr(kalman_service, "_RTS_CHUNK", chunk)
+        for a, b in zip(ref, run_rts_smoother(t, x, CFG)):
+            np.testing.assert_array_equal(a, b)
+
+
+def test_smoother_reduces_error_on_clean_timebase():
+    t, x = _trace(20000, gaps=False)
+    truth = np.sin(3.0 * np.arange(len(x)) * 1e-3)
+    y, _, y_s, _ = run_rts_smoother(t, x, CFG)
+    assert np.sqrt(np.mean((y_s - truth) ** 2)) < np.sqrt(np.mean((y - truth) ** 2))
+
+
+def test_short_inputs():
+    for n in (0, 1):
+        out = run_rts_smoother(np.arange(n, dtype=float), np.zeros(n), CFG)
+        assert all(len(a) == n for a in out)
+
+
+def _extra_peak_bytes(n):
+    t, x = _trace(n, gaps=False)
+    tracemalloc.start()
+    try:
+        out = run_rts_smoother(t, x, CFG)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - sum(a.nbytes for a in out)
+
+
+def test_memory_beyond_outputs_is_about_24_bytes_per_sample(monkeypatch):
+    # the (N, 3) float64 covariance store is 24 B/sample; the backward pass
+    # may only add O(chunk) scratch on top of it, so the per-sample growth of
+    # the peak (beyond the returned arrays) stays at the covariance store
+    monkeypatch.setattr(kalman_service, "_RTS_CHUNK", 512)
+    n1, n2 = 20000, 60000
+    per_sample = (_extra_peak_bytes(n2) - _extra_peak_bytes(n1)) / (n2 - n1)
+    assert per_sample < 26.0
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from models.signal_generator import RampHoldProfile
+from services.signal_generator_service import (
+    NOISE_BLOCK_SAMPLES,
+    generate_signal_series,
+    iter_signal_blocks,
+    ramp_hold_values,
+)
+
+from baseline_reference import ramp_hold_value
+
+PROFILES = [
+    RampHoldProfile(),
+    RampHoldProfile(X_LO=-3.5, X_HI=12.25, T_UP_MS=7, T_HOLD_HI_MS=0, T_DOWN_MS=13, T_HOLD_LO_MS=1),
+    RampHoldProfile(T_UP_MS=0, T_DOWN_MS=0),  # square wave: max(T, 1) guards
+]
+
+
+@pytest.mark.parametrize("profile", PROFILES)
+def test_ramp_hold_matches_baseline(profile):
+    t_ms = np.arange(0, 40000, 3, dtype=np.int64)
+    ref = np.array([ramp_hold_value(profile, int(v)) for v in t_ms])
+    np.testing.assert_array_equal(ramp_hold_values(profile, t_ms), ref)
+
+
+@pytest.mark.parametrize("block_samples", [1, 1000, NOISE_BLOCK_SAMPLES - 1, NOISE_BLOCK_SAMPLES + 7])
+def test_blocks_do_not_change_the_signal(block_samples):
+    kw = dict(dt_ms=0.5, seconds=70.0, rng_seed=7)
+    t_ref, x_ref = generate_signal_series(**kw)
+    assert len(t_ref) == 140000  # spans three noise blocks
+    if block_samples == 1:
+        kw["seconds"] = 0.05  # keep the per-sample case short
+        t_ref, x_ref = t_ref[:100], x_ref[:100]
+    blocks = list(iter_signal_blocks(block_samples=block_samples, **kw))
+    assert all(len(t) <= block_samples for t, _ in blocks)
+    np.testing.assert_array_equal(np.concatenate([t for t, _ in blocks]), t_ref)
+    np.testing.assert_array_equal(np.concatenate([x for _, x in blocks]), x_ref)
+
+
+def test_sample_times_do_not_drift():
+    t, _ = generate_signal_series(dt_ms=0.1, seconds=0.3, noise_amp=0.0, time_unit_seconds=False)
+    assert len(t) == 3000
+    np.testing.assert_array_equal(t, np.arange(3000) * 0.1)
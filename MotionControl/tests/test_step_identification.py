@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+
+from models.step_response_tuning import StepTuneSelections
+from services import StepSeries, auto_detect_deadtime_index, bootstrap_intervals, identify
+from services import step_identification_service as sis
+from services.helpers import levenberg_marquardt, levenberg_marquardt_batch
+
+from baseline_reference import deadtime_index_threshold
+
+T_STEP, THETA = 2.0, 0.45
+
+
+def _series(model, n=4000, noise=0.0, seed=0):
+    t = np.arange(n) * (20.0 / n)
+    cv = np.where(t >= T_STEP, 5.0, 1.0)
+    common = dict(pv0=10.0, du=4.0, theta=THETA, t_step=T_STEP)
+    if model == "FOPDT":
+        y = sis.simulate_fopdt_overlay(t, K=1.7, tau=1.3, **common)
+    elif model == "IPDT":
+        y = sis.simulate_ipdt_overlay(t, K=0.3, **common)
+    else:
+        y = sis.simulate_sopdt_underdamped_overlay(t, K=1.7, zeta=0.3, wn=3.0, **common)
+    y = y + np.random.default_rng(seed).normal(0.0, noise, n)
+    return StepSeries(t=t, cv=cv, pv=y, dt_s=float(t[1]))
+
+
+def _selections(ts, model):
+    n = len(ts.t)
+    sel = StepTuneSelections()
+    sel.baseline.set(0, int(n * 0.09))
+    sel.final.set(int(n * 0.8), n)
+    if model == "IPDT":
+        sel.fit.set(int(n * 0.2), n)
+    if model == "SOPDT_UNDERDAMPED":
+        sel.peak.set(int(np.argmax(ts.pv[: int(n * 0.6)])))
+    return sel
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_threshold_detector_matches_baseline(seed):
+    ts = _series("FOPDT", noise=0.05, seed=seed)
+    pv = ts.pv.copy()
+    rng = np.random.default_rng(seed)
+    pv[rng.integers(0, len(pv), 40)] = np.nan  # gaps in baseline and response
+    ts = StepSeries(t=ts.t, cv=ts.cv, pv=pv, dt_s=ts.dt_s)
+    for base, step_i in [((0, 360), 400), ((10, 200), 1), ((0, 6), 400), ((0, 3), 400)]:
+        sel = StepTuneSelections()
+        sel.baseline.set(*base)
+        sel.t_step.set(step_i)
+        assert auto_detect_deadtime_index(ts, sel) == deadtime_index_threshold(pv, base, step_i)
+
+
+@pytest.mark.parametrize(
+    "fn, p",
+    [
+        (sis._fopdt_jacobian, [2.0, 0.7, 0.3]),
+        (sis._ipdt_jacobian, [0.5, 0.4]),
+        (sis._sopdt_jacobian, [1.5, 1.2, 4.0, 0.25]),
+    ],
+)
+def test_jacobians_match_finite_differences(fn, p):
+    # grid offset from the response onset: the theta derivative jumps there
+    t = np.linspace(0.0, 10.0, 2001) + 1e-4
+    p = np.array(p)
+    _, J = fn(t, 1.0, 3.0, 1.0, p)
+    for i in range(len(p)):
+        h = 1e-6 * max(1.0, abs(p[i]))
+        dp = np.zeros_like(p)
+        dp[i] = h
+        fd = (fn(t, 1.0, 3.0, 1.0, p + dp)[0] - fn(t, 1.0, 3.0, 1.0, p - dp)[0]) / (2.0 * h)
+        np.testing.assert_allclose(J[:, i], fd, rtol=0, atol=1e-6 * max(1.0, np.max(np.abs(fd))))
+
+    # a stack of parameter rows gives the same rows as one at a time
+    P = np.stack([p, 1.1 * p])
+    Y, JJ = fn(t, 1.0, 3.0, 1.0, P)
+    for r in range(2):
+        y_r, J_r = fn(t, 1.0, 3.0, 1.0, P[r])
+        np.testing.assert_array_equal(Y[r], y_r)
+        np.testing.assert_array_equal(JJ[r], J_r)
+
+
+def test_fit_responses_match_overlays():
+    t = np.linspace(0.0, 10.0, 1001)
+    y, _ = sis._fopdt_jacobian(t, 10.0, 4.0, 2.0, np.array([1.7, 1.3, 0.45]))
+    np.testing.assert_allclose(
+        y, sis.simulate_fopdt_overlay(t, pv0=10.0, du=4.0, K=1.7, tau=1.3, theta=0.45, t_step=2.0), rtol=1e-13)
+    zeta, wn = 0.3, 3.0
+    sigma, wd = zeta * wn, wn * np.sqrt(1.0 - zeta**2)
+    y, _ = sis._sopdt_jacobian(t, 10.0, 4.0, 2.0, np.array([1.7, sigma, wd, 0.45]))
+    ref = sis.simulate_sopdt_underdamped_overlay(t, pv0=10.0, du=4.0, K=1.7, zeta=zeta, wn=wn, theta=0.45, t_step=2.0)
+    np.testing.assert_allclose(y, ref, rtol=1e-12)
+
+
+@pytest.mark.parametrize("model", ["FOPDT", "IPDT", "SOPDT_UNDERDAMPED"])
+def test_least_squares_recovers_noiseless_truth(model):
+    ts = _series(model)
+    res, _ = identify(ts, _selections(ts, model), model, method="least_squares")
+    truth = {"FOPDT": {"K": 1.7, "tau_s": 1.3}, "IPDT": {"K": 0.3}, "SOPDT_UNDERDAMPED": {"K": 1.7, "zeta": 0.3, "wn": 3.0}}
+    for name, value in truth[model].items():
+        assert res.params[name] == pytest.approx(value, rel=1e-6)
+    assert res.theta_s == pytest.approx(THETA, abs=1e-6)
+    assert res.rmse < 1e-6
+
+
+def test_batch_lm_matches_serial():
+    rng = np.random.default_rng(4)
+    t = np.linspace(0.0, 5.0, 400)
+    truth = np.column_stack([rng.uniform(0.5, 3.0, 8), rng.uniform(0.2, 2.0, 8)])
+    data = truth[:, :1] * (1.0 - np.exp(-t / truth[:, 1:])) + rng.normal(0.0, 0.01, (8, len(t)))
+
+    def residuals(p, y):
+        E = np.exp(-t / p[..., 1, None])
+        J = np.stack([1.0 - E, -p[..., 0, None] * E * t / p[..., 1, None] ** 2], axis=-1)
+        return p[..., 0, None] * (1.0 - E) - y, J
+
+    p0 = np.tile([1.0, 1.0], (8, 1))
+    lower, upper = np.array([0.0, 1e-3]), np.array([10.0, 10.0])
+    P, cost, _, ok = levenberg_marquardt_batch(
+        lambda p, rows: residuals(p, data[rows]), p0, lower=lower, upper=upper)
+    assert ok.all()
+    for r in range(8):
+        p_r, cost_r, _, ok_r = levenberg_marquardt(lambda p: residuals(p, data[r]), p0[r], lower=lower, upper=upper)
+        assert ok_r
+        np.testing.assert_allclose(P[r], p_r, rtol=1e-6)
+        assert cost[r] == pytest.approx(cost_r, rel=1e-8)
+
+
+def test_bootstrap_is_reproducible_and_worker_independent():
+    ts = _series("FOPDT", n=2000, noise=0.05)
+    sel = _selections(ts, "FOPDT")
+    res, _ = identify(ts, sel, "FOPDT", method="least_squares")
+    # small shards: several of them, so workers actually fan out
+    kw = dict(n_boot=24, rng_seed=3, shard_bytes=200_000)
+    a = bootstrap_intervals(ts, sel, res, **kw)
+    b = bootstrap_intervals(ts, sel, res, workers=2, **kw)
+    assert a.intervals == b.intervals
+    lo, hi = a.intervals["K"]
+    assert lo < res.params["K"] < hi
+
+    with pytest.raises(ValueError):
+        identify(ts, sel, "FOPDT", n_boot=10)
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from models.step_response_generator import (
+    ActuatorParams,
+    FOPDTParams,
+    IPDTParams,
+    SOPDTUnderdampedParams,
+    StepSpec,
+)
+from services import simulate_step_batch, simulate_step_response
+from services.helpers import DelayLine, rate_limit
+from services.step_response_generator_service import actuator_block, apply_deadtime
+
+from baseline_reference import lag_loop, rate_limit_loop, shift_deadtime
+
+# no saturation, rate limit or lag: the plant sees the commanded step
+PLAIN = ActuatorParams(pv0=0.0, pv_min=-1e9, pv_max=1e9, rate_limit=0.0, tau_s=0.0)
+
+
+def _rate_limit_inputs():
+    rng = np.random.default_rng(0)
+    n = 5000
+    k = np.arange(n)
+    yield "steps", np.where(k % 1000 < 500, 10.0, -3.0)
+    yield "ramp", 0.01 * k
+    yield "noise", rng.normal(0.0, 1.0, n)
+    yield "noisy step", np.where(k > 2500, 5.0, 0.0) + rng.normal(0.0, 0.02, n)
+    yield "extreme", rng.choice([1e300, -1e300, 1e-300, 0.0, 1.0], n)
+    nan = rng.normal(0.0, 1.0, n)
+    nan[rng.random(n) < 0.01] = np.nan
+    yield "nan", nan
+
+
+@pytest.mark.parametrize("max_step", [1e-3, 0.05, 1.0, 1e6])
+def test_rate_limit_matches_baseline_loop(max_step):
+    for name, u in _rate_limit_inputs():
+        np.testing.assert_array_equal(rate_limit(u, max_step), rate_limit_loop(u, max_step), err_msg=name)
+
+
+def test_actuator_matches_baseline_loops():
+    rng = np.random.default_rng(1)
+    dt = 1e-3
+    u = np.where(np.arange(20000) > 1000, 8.0, 0.0) + rng.normal(0.0, 0.1, 20000)
+    p = ActuatorParams(pv0=0.0, pv_min=-2.0, pv_max=7.5, rate_limit=20.0, tau_s=0.05)
+    ref = lag_loop(rate_limit_loop(np.clip(u, p.pv_min, p.pv_max), p.rate_limit * dt), dt, p.tau_s)
+    # the lag runs as an IIR: roundoff-level, not bitwise
+    np.testing.assert_allclose(actuator_block(u, dt, p), ref, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("theta_s", [0.0, 0.05, 0.3, 1.0])
+def test_whole_sample_deadtime_matches_shift(theta_s):
+    u = np.random.default_rng(2).normal(size=2000)
+    dt = 0.01
+    np.testing.assert_array_equal(apply_deadtime(u, dt, theta_s), shift_deadtime(u, dt, theta_s))
+
+
+def test_delay_line_chunking_matches_whole_array():
+    rng = np.random.default_rng(3)
+    u = rng.normal(size=3000)
+    delay = 4.0 + 3.0 * np.sin(np.arange(3000) * 1e-2) ** 2  # fractional, time-varying
+    whole = DelayLine(8.0).process(u, delay)
+    line = DelayLine(8.0)
+    cuts = [0, 1, 17, 500, 2048, 3000]
+    parts = [line.process(u[a:b], delay[a:b]) for a, b in zip(cuts[:-1], cuts[1:])]
+    np.testing.assert_array_equal(np.concatenate(parts), whole)
+
+
+def _step(model, dt_s, **params):
+    spec = StepSpec(dt_s=dt_s, duration_s=20.0, t_step_s=1.0, cv0=0.0, cv_step=2.0)
+    kw = {"FOPDT": "fopdt", "IPDT": "ipdt", "SOPDT_UNDERDAMPED": "sopdt"}[model]
+    cls = {"FOPDT": FOPDTParams, "IPDT": IPDTParams, "SOPDT_UNDERDAMPED": SOPDTUnderdampedParams}[model]
+    t, _, pv, _ = simulate_step_response(spec=spec, actuator=PLAIN, model=model, **{kw: cls(**params)})
+    # ZOH timing: the plant reacts from the sample after the (delayed) step
+    s = int(np.argmax(t >= spec.t_step_s)) + int(round(params.get("theta_s", 0.0) / dt_s))
+    tau = np.clip(t - t[s], 0.0, None)
+    return tau, pv, spec.cv_step - spec.cv0
+
+
+@pytest.mark.parametrize("dt_s", [1e-3, 0.02, 0.5])
+def test_zoh_plants_match_analytic_step_responses(dt_s):
+    # the old Euler loops drifted with dt (and diverged for SOPDT at 0.5 s);
+    # exact ZOH only accumulates recurrence roundoff over ~20k steps
+    tau, pv, du = _step("FOPDT", dt_s, K=1.5, tau_s=0.8, theta_s=2 * dt_s)
+    np.testing.assert_allclose(pv, 1.5 * du * (1.0 - np.exp(-tau / 0.8)), rtol=0, atol=1e-10)
+
+    tau, pv, du = _step("IPDT", dt_s, K=0.4, theta_s=dt_s)
+    np.testing.assert_allclose(pv, 0.4 * du * tau, rtol=0, atol=1e-10)
+
+    zeta, wn = 0.3, 2.0
+    tau, pv, du = _step("SOPDT_UNDERDAMPED", dt_s, K=1.2, zeta=zeta, wn=wn, theta_s=0.0)
+    wd = wn * np.sqrt(1.0 - zeta**2)
+    ref = 1.0 - np.exp(-zeta * wn * tau) / np.sqrt(1.0 - zeta**2) * np.sin(wd * tau + np.arccos(zeta))
+    np.testing.assert_allclose(pv, 1.2 * du * ref, rtol=0, atol=1e-10)
+
+
+@pytest.mark.parametrize(
+    "model, params",
+    [
+        ("FOPDT", {"K": [0.5, 1.0, 2.0], "tau_s": [0.1, 0.3, 1.0], "theta_s": [0.0, 0.07, 0.2]}),
+        ("IPDT", {"K": [0.2, 0.4, 0.8], "theta_s": [0.05, 0.1, 0.13], "leak_tau_s": [0.0, 2.0, 0.0]}),
+        ("SOPDT_UNDERDAMPED", {"K": [1.0, 1.5, 0.5], "zeta": [0.2, 0.45, 0.7], "wn": [3.0, 6.0, 9.0], "theta_s": [0.0, 0.05, 0.11]}),
+    ],
+)
+def test_batch_runs_match_single_runs(model, params):
+    spec = StepSpec(dt_s=0.01, duration_s=5.0, t_step_s=1.0, cv0=0.0, cv_step=10.0)
+    act = ActuatorParams(pv0=1.0, pv_min=-20.0, pv_max=8.0, rate_limit=50.0, tau_s=0.05)
+    res = simulate_step_batch(
+        spec=spec, model=model, actuator=act,
+        params={k: np.asarray(v, dtype=float) for k, v in params.items()},
+        keep_trajectories=True,
+    )
+    cls = {"FOPDT": FOPDTParams, "IPDT": IPDTParams, "SOPDT_UNDERDAMPED": SOPDTUnderdampedParams}[model]
+    kw = {"FOPDT": "fopdt", "IPDT": "ipdt", "SOPDT_UNDERDAMPED": "sopdt"}[model]
+    for i in range(3):
+        p = cls(**{k: v[i] for k, v in params.items()})
+        _, _, pv, _ = simulate_step_response(spec=spec, actuator=act, model=model, **{kw: p})
+        np.testing.assert_allclose(res.pv[i], pv, rtol=0, atol=1e-12 * np.max(np.abs(pv)))
@@ -0,0 +1,68 @@
+import time
+
+from components.task_executor import TaskExecutor
+
+
+class _FakeRoot:
+    """Just enough of tk.Tk for TaskExecutor: after() and the error sink."""
+
+    def __init__(self):
+        self.jobs = []
+        self.reported = []
+
+    def after(self, _ms, fn):
+        self.jobs.append(fn)
+
+    def _root(self):
+        return self
+
+    def report_callback_exception(self, exc_type, exc, tb):
+        self.reported.append(exc)
+
+    def run(self, timeout=5.0):
+        end = time.monotonic() + timeout
+        while self.jobs and time.monotonic() < end:
+            self.jobs.pop(0)()
+            time.sleep(0.001)
+
+
+def _fail():
+    raise ValueError("bad input")
+
+
+def test_failure_without_on_error_reaches_report_callback_exception():
+    root = _FakeRoot()
+    ex = TaskExecutor(root)
+    try:
+        ex.submit(_fail)
+        root.run()
+    finally:
+        ex.shutdown()
+    assert len(root.reported) == 1
+    assert isinstance(root.reported[0], ValueError)
+
+
+def test_on_error_takes_the_failure():
+    root = _FakeRoot()
+    ex = TaskExecutor(root)
+    seen = []
+    try:
+        ex.submit(_fail, on_error=seen.append)
+        root.run()
+    finally:
+        ex.shutdown()
+    assert [type(e) for e in seen] == [ValueError]
+    assert root.reported == []
+
+
+def test_latest_request_wins():
+    root = _FakeRoot()
+    ex = TaskExecutor(root)
+    got = []
+    try:
+        for i in range(5):
+            ex.submit(time.sleep, 0.01, key="preview", on_done=lambda _r, i=i: got.append(i))
+        root.run()
+    finally:
+        ex.shutdown()
+    assert got == [4]